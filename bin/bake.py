@@ -0,0 +1,223 @@
+#!python
+
+import logging
+import os
+import sys
+
+import bpy
+import typer
+from typing import Optional
+from typing_extensions import Annotated
+
+from ob_tools.utils.log_utils import setup_logger
+from ob_tools.utils.cache_utils import FileCache
+from ob_tools.operators.bake import (
+    bake_pairs, get_bake_pairs_by_name, get_bake_pairs_by_collection,
+    BAKE_SET_TYPES, BAKE_FILE_FORMATS, BAKE_HIGH_SUFFIX, BAKE_LOW_SUFFIX, BAKE_PROGRESS_FILENAME,
+    BAKE_MAX_IMAGE_SIZE, BAKE_BIT_DEPTHS,
+)
+
+def _version_callback(value: bool) -> None:
+    if value:
+        typer.echo(f"{__app_name__} v{__app_version__}")
+        raise typer.Exit()
+
+__app_name__: str = "BakeCLI"
+__app_version__: str = "0.1.0"
+_log = setup_logger("BakeCLI", logging.DEBUG)
+app = typer.Typer()
+
+
+def _get_bake_types(passes: list[str]) -> list[str]:
+    bake_types: list[str] = [bake_type.upper() for bake_type in passes]
+    for bake_type in bake_types:
+        if bake_type not in BAKE_SET_TYPES:
+            _log.error(f"Unsupported bake type {bake_type} ({', '.join(BAKE_SET_TYPES)})")
+            raise typer.Exit(code=1)
+    return bake_types
+
+
+def _log_bake_summary(results: list):
+    _log.info(f"Bake Summary:")
+    for result in results:
+        state: str = ("SKIP" if result.skipped else "OK  ") if result.success else "FAIL"
+        _log.info(f"\t* {state} {result.elapsed:8.2f}s {result.high_name} > {result.low_name}{' ' + result.error if result.error else ''}")
+
+
+def _get_cache(cache_dir: str | None, cache_max_size: float) -> FileCache | None:
+    return FileCache(cache_dir, int(cache_max_size * 1024 ** 3)) if cache_dir else None
+
+
+def _get_device(device: str) -> str:
+    device = device.upper()
+    if device not in ("CPU", "GPU"):
+        _log.error(f"Unknown device {device} (CPU, GPU)")
+        raise typer.Exit(code=1)
+    return device
+
+
+def _get_file_format(file_format: str) -> str:
+    file_format = file_format.upper()
+    if file_format not in BAKE_FILE_FORMATS:
+        _log.error(f"Unsupported file format {file_format} ({', '.join(BAKE_FILE_FORMATS)})")
+        raise typer.Exit(code=1)
+    return file_format
+
+
+def _check_image_size(width: int, height: int, tile_size: int, bit_depth: int):
+    if tile_size <= 0 and max(width, height) > BAKE_MAX_IMAGE_SIZE:
+        _log.error(f"Images larger than {BAKE_MAX_IMAGE_SIZE} need --tile-size ({width}x{height})")
+        raise typer.Exit(code=1)
+    if bit_depth not in BAKE_BIT_DEPTHS:
+        _log.error(f"Unsupported bit depth {bit_depth} ({', '.join(str(depth) for depth in BAKE_BIT_DEPTHS)})")
+        raise typer.Exit(code=1)
+
+
+def load_bake_inputs(inputs: list[str]):
+    """.blend 파일을 열거나, FBX 파일들을 빈 씬에 임포트한다. .blend는 하나만 줄 수 있다.
+    """
+    blend_paths = [path for path in inputs if path.lower().endswith(".blend")]
+    fbx_paths = [path for path in inputs if path.lower().endswith(".fbx")]
+    if len(blend_paths) + len(fbx_paths) != len(inputs) or len(blend_paths) > 1 or (blend_paths and fbx_paths):
+        _log.error(f"Inputs must be one .blend file or .fbx files ({inputs})")
+        raise typer.Exit(code=1)
+    if blend_paths:
+        _log.info(f"Open {blend_paths[0]}")
+        bpy.ops.wm.open_mainfile(filepath=blend_paths[0])
+        return
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    for path in fbx_paths:
+        _log.info(f"Import FBX ({path})")
+        result = bpy.ops.import_scene.fbx(filepath=path)
+        assert("FINISHED" in result)
+
+
+@app.command()
+def bake(
+    inputs: Annotated[list[str], typer.Option("--input", help=".blend filepath, or .fbx filepaths (repeatable)", rich_help_panel="File")],
+    output_dir: Annotated[str, typer.Option(help="Output Image Directory", rich_help_panel="File")],
+    pairs: Annotated[Optional[list[str]], typer.Option("--pair", help=f"HIGH:LOW object names (repeatable, default: all *{BAKE_HIGH_SUFFIX}/*{BAKE_LOW_SUFFIX} pairs)", rich_help_panel="Bake")]=None,
+    passes: Annotated[list[str], typer.Option("--pass", help=f"Bake Type ({', '.join(BAKE_SET_TYPES)}). Repeatable", rich_help_panel="Bake")]=["NORMAL"],
+    width: Annotated[int, typer.Option(help="Image Width", rich_help_panel="Bake")]=2048,
+    height: Annotated[int, typer.Option(help="Image Height", rich_help_panel="Bake")]=2048,
+    cage_extrusion: Annotated[float, typer.Option(help="Cage Extrusion", rich_help_panel="Bake")]=0.15,
+    max_ray_distance: Annotated[float, typer.Option(help="Max Ray Distance", rich_help_panel="Bake")]=0.3,
+    margin: Annotated[int, typer.Option(help="Margin (px)", rich_help_panel="Bake")]=16,
+    file_format: Annotated[str, typer.Option(help=f"Image File Format ({', '.join(BAKE_FILE_FORMATS)})", rich_help_panel="File")]="PNG",
+    device: Annotated[str, typer.Option(help="Cycles Device (CPU, GPU). GPU falls back to CPU if none is available", rich_help_panel="Render")]="GPU",
+    samples: Annotated[int, typer.Option(help="Cycles Samples (0: scene setting)", rich_help_panel="Render")]=0,
+    threads: Annotated[int, typer.Option(help="Render Threads (0: scene setting)", rich_help_panel="Render")]=0,
+    tile_size: Annotated[int, typer.Option(help=f"Bake in tiles of this size and stream PNG rows to disk (0: off, required above {BAKE_MAX_IMAGE_SIZE})", rich_help_panel="Bake")]=0,
+    bit_depth: Annotated[int, typer.Option(help="PNG bit depth of tiled bakes (8, 16)", rich_help_panel="Bake")]=8,
+    cache_dir: Annotated[Optional[str], typer.Option(help="Bake cache directory (disabled if not set)", rich_help_panel="Cache")]=None,
+    cache_max_size: Annotated[float, typer.Option(help="Maximum cache size (GB)", rich_help_panel="Cache")]=10.0,
+):
+    """.blend를 열거나 FBX를 임포트해서 지정한 하이폴/로우폴 쌍을 UI 없이 굽고 이미지를 저장한다."""
+    bake_types = _get_bake_types(passes)
+    device = _get_device(device)
+    file_format = _get_file_format(file_format)
+    _check_image_size(width, height, tile_size, bit_depth)
+    load_bake_inputs(inputs)
+
+    if pairs:
+        bake_objects = []
+        for pair in pairs:
+            high_name, _, low_name = pair.partition(":")
+            high, low = bpy.data.objects.get(high_name), bpy.data.objects.get(low_name)
+            if high is None or low is None:
+                _log.error(f"Objects not found ({pair})")
+                raise typer.Exit(code=1)
+            bake_objects.append((high, low))
+    else:
+        bake_objects = get_bake_pairs_by_name([obj for obj in bpy.context.scene.objects if obj.type == "MESH"])
+    if len(bake_objects) <= 0:
+        _log.error(f"No high/low pairs ({inputs})")
+        raise typer.Exit(code=1)
+
+    os.makedirs(output_dir, exist_ok=True)
+    results = bake_pairs(bake_objects, bake_types, output_dir, width, height, cage_extrusion, max_ray_distance, margin,
+                         file_format=file_format, device=device, samples=samples, threads=threads,
+                         tile_size=tile_size, bit_depth=bit_depth, cache=_get_cache(cache_dir, cache_max_size))
+    _log_bake_summary(results)
+    if not all(result.success for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def batch(
+    input_blend: Annotated[str, typer.Option(help="Input Blender Filepath", rich_help_panel="File")],
+    output_dir: Annotated[str, typer.Option(help="Output Image Directory", rich_help_panel="File")],
+    passes: Annotated[list[str], typer.Option("--pass", help=f"Bake Type ({', '.join(BAKE_SET_TYPES)}). Repeatable", rich_help_panel="Bake")]=["NORMAL"],
+    pairing: Annotated[str, typer.Option(help=f"Pair by name (*{BAKE_HIGH_SUFFIX}, *{BAKE_LOW_SUFFIX}) or by collection (name, collection)", rich_help_panel="Bake")]="name",
+    width: Annotated[int, typer.Option(help="Image Width", rich_help_panel="Bake")]=2048,
+    height: Annotated[int, typer.Option(help="Image Height", rich_help_panel="Bake")]=2048,
+    cage_extrusion: Annotated[float, typer.Option(help="Cage Extrusion", rich_help_panel="Bake")]=0.15,
+    max_ray_distance: Annotated[float, typer.Option(help="Max Ray Distance", rich_help_panel="Bake")]=0.3,
+    margin: Annotated[int, typer.Option(help="Margin (px)", rich_help_panel="Bake")]=16,
+    device: Annotated[str, typer.Option(help="Cycles Device (CPU, GPU). GPU falls back to CPU if none is available", rich_help_panel="Render")]="GPU",
+    samples: Annotated[int, typer.Option(help="Cycles Samples (0: scene setting)", rich_help_panel="Render")]=0,
+    threads: Annotated[int, typer.Option(help="Render Threads (0: scene setting)", rich_help_panel="Render")]=0,
+    tile_size: Annotated[int, typer.Option(help=f"Bake in tiles of this size and stream PNG rows to disk (0: off, required above {BAKE_MAX_IMAGE_SIZE})", rich_help_panel="Bake")]=0,
+    bit_depth: Annotated[int, typer.Option(help="PNG bit depth of tiled bakes (8, 16)", rich_help_panel="Bake")]=8,
+    cache_dir: Annotated[Optional[str], typer.Option(help="Bake cache directory (disabled if not set)", rich_help_panel="Cache")]=None,
+    cache_max_size: Annotated[float, typer.Option(help="Maximum cache size (GB)", rich_help_panel="Cache")]=10.0,
+    resume: Annotated[bool, typer.Option(help="Skip pairs already baked in a previous run", rich_help_panel="Batch")]=True,
+    progress: Annotated[Optional[str], typer.Option(help=f"Progress JSON Filepath (default: <output-dir>/{BAKE_PROGRESS_FILENAME})", rich_help_panel="Batch")]=None,
+    stop_on_error: Annotated[bool, typer.Option(help="Stop at the first failed pair", rich_help_panel="Batch")]=False,
+):
+    """.blend 파일의 하이폴/로우폴 쌍들을 모두 굽는다."""
+    bake_types = _get_bake_types(passes)
+    device = _get_device(device)
+    _check_image_size(width, height, tile_size, bit_depth)
+    _log.info(f"Open {input_blend}")
+    bpy.ops.wm.open_mainfile(filepath=input_blend)
+
+    objects = [obj for obj in bpy.context.scene.objects if obj.type == "MESH"]
+    if pairing == "name":
+        pairs = get_bake_pairs_by_name(objects)
+    elif pairing == "collection":
+        pairs = get_bake_pairs_by_collection(bpy.context.scene.collection.children_recursive)
+    else:
+        _log.error(f"Unknown pairing ({pairing})")
+        raise typer.Exit(code=1)
+    if len(pairs) <= 0:
+        _log.error(f"No high/low pairs ({input_blend})")
+        raise typer.Exit(code=1)
+    _log.info(f"Pairs: {len(pairs)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    progress_path: str = progress or os.path.join(output_dir, BAKE_PROGRESS_FILENAME)
+    if not resume and os.path.isfile(progress_path):
+        os.remove(progress_path)
+    results = bake_pairs(pairs, bake_types, output_dir, width, height, cage_extrusion, max_ray_distance, margin,
+                         progress_path=progress_path, stop_on_error=stop_on_error,
+                         device=device, samples=samples, threads=threads, tile_size=tile_size, bit_depth=bit_depth,
+                         cache=_get_cache(cache_dir, cache_max_size))
+    _log_bake_summary(results)
+    if not all(result.success for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.callback()
+def main(
+    version: Optional[bool] = typer.Option(
+        None,
+        "--version",
+        "-v",
+        help="Show the app version and exit.",
+        callback=_version_callback,
+        is_eager=True,
+    )
+) -> None:
+    return
+
+
+def _get_cli_args() -> list[str]:
+    # blender -b --python bake.py -- <args> 로 실행된 경우 "--" 뒤의 인자만 사용한다.
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
+if __name__ == "__main__":
+    app(args=_get_cli_args())
@@ -0,0 +1,5 @@
+python bake.py batch --input-blend=d:/tmp/props.blend --output-dir=d:/tmp/bakes --pass=NORMAL --pass=AO --width=2048 --height=2048
+python bake.py batch --input-blend=d:/tmp/props.blend --output-dir=d:/tmp/bakes --pairing=collection --no-resume
+python bake.py bake --input=d:/tmp/rock_high.fbx --input=d:/tmp/rock_low.fbx --output-dir=d:/tmp/bakes --pair=rock_high:rock_low --pass=NORMAL --pass=AO --device=CPU --samples=16 --threads=8
+python bake.py bake --input=d:/tmp/props.blend --output-dir=d:/tmp/bakes --pair=cliff_high:cliff_low --width=16384 --height=16384 --tile-size=2048
+python bake.py batch --input-blend=d:/tmp/props.blend --output-dir=d:/tmp/bakes --pass=NORMAL --pass=AO --cache-dir=d:/tmp/bake_cache --cache-max-size=20
@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from ob_tools.utils.log_utils import setup_logger
+
+# 워커는 stdout으로 이 접두어가 붙은 JSON 한 줄씩 상태를 보낸다.
+# Blender나 익스포터가 stdout에 찍는 다른 출력과 구분하기 위해 사용한다.
+STATUS_PREFIX: str = "@@OB_TOOLS_STATUS@@ "
+DEFAULT_MEMORY_PER_WORKER: int = 2 * 1024 ** 3
+WORKER_START_RETRIES: int = 3
+
+FarmJob = namedtuple("FarmJob", "job_id input_path output_path")
+# cached: 스케줄러가 캐시에서 바로 가져와서 워커에 보내지 않은 작업 (attempts=0, worker=None)
+FarmResult = namedtuple("FarmResult", "job_id input_path output_path success attempts elapsed error worker cached",
+                        defaults=(False,))
+_log = setup_logger("Farm", logging.DEBUG)
+
+
+def format_status(**status) -> str:
+    return STATUS_PREFIX + json.dumps(status, ensure_ascii=False)
+
+
+def emit_status(**status):
+    """워커에서 스케줄러로 상태 한 줄을 보낸다.
+    """
+    sys.stdout.write(format_status(**status) + "\n")
+    sys.stdout.flush()
+
+
+def parse_status(line: str) -> dict | None:
+    if not line.startswith(STATUS_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(STATUS_PREFIX):])
+    except json.JSONDecodeError:
+        return None
+
+
+def get_available_memory() -> int | None:
+    """사용 가능한 메모리(바이트)를 리턴한다. psutil이 없으면 /proc/meminfo를 읽고, 알 수 없으면 None을 리턴한다.
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def get_worker_count(job_count: int, memory_per_worker: int = DEFAULT_MEMORY_PER_WORKER,
+                     max_workers: int | None = None) -> int:
+    """CPU 수와 사용 가능한 메모리로 워커 수를 정한다. 작업 수보다 많이 띄우지 않는다.
+    """
+    count: int = os.cpu_count() or 1
+    available_memory = get_available_memory()
+    if available_memory is not None and memory_per_worker > 0:
+        count = min(count, available_memory // memory_per_worker)
+    if max_workers:
+        count = min(count, max_workers)
+    return max(1, min(count, job_count))
+
+
+def build_worker_command(script_path: str, worker_args: list[str], blender: str | None = None,
+                         threads: int = 0) -> list[str]:
+    """워커 프로세스 명령줄을 만든다.
+    blender가 주어지면 `blender -b --python script -- args`로, 아니면 bpy 모듈이 설치된 현재 파이썬으로 실행한다.
+    """
+    if blender:
+        command = [blender, "-b", "--factory-startup"]
+        if threads > 0:
+            command += ["-t", str(threads)]
+        return command + ["--python-exit-code", "1", "--python", script_path, "--"] + worker_args
+    return [sys.executable, script_path] + worker_args
+
+
+def _get_worker_env() -> dict:
+    # Blender 내장 파이썬에서도 ob_tools 패키지를 찾을 수 있게 패키지의 상위 디렉터리를 PYTHONPATH에 넣는다.
+    package_parent = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in (package_parent, env.get("PYTHONPATH")) if path)
+    return env
+
+
+class WorkerProcess:
+    """워커 프로세스 하나를 띄우고 stdin으로 작업을 보내고 stdout의 상태 줄을 읽는다.
+    stdout은 별도 스레드가 읽어 큐에 넣으므로 타임아웃을 걸고 기다릴 수 있다.
+    """
+
+    def __init__(self, name: str, command: list[str], env: dict):
+        self.name = name
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env,
+                                        text=True, encoding="utf-8", errors="replace", bufsize=1)
+        self.statuses: queue.Queue = queue.Queue()
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            status = parse_status(line.rstrip("\n"))
+            if status is not None:
+                self.statuses.put(status)
+            else:
+                _log.debug(f"{self.name}: {line.rstrip()}")
+        # EOF: 프로세스가 끝났음을 알린다.
+        self.statuses.put(None)
+
+    def send(self, job: FarmJob):
+        message = {"id": job.job_id, "input": job.input_path, "output": job.output_path}
+        self.process.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+        self.process.stdin.flush()
+
+    def wait_status(self, timeout: float | None = None) -> dict | None:
+        """다음 상태를 기다린다. 프로세스가 끝났거나 시간이 초과되면 None을 리턴한다.
+        """
+        try:
+            return self.statuses.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self, timeout: float = 30.0):
+        """stdin을 닫아 워커가 스스로 끝나게 하고, 시간 안에 끝나지 않으면 강제 종료한다.
+        """
+        try:
+            if self.process.stdin and not self.process.stdin.closed:
+                self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def _start_worker(name: str, command: list[str], env: dict, startup_timeout: float) -> WorkerProcess | None:
+    """워커를 띄우고 준비(ready) 상태를 받을 때까지 기다린다. 실패하면 None을 리턴한다.
+    """
+    try:
+        worker = WorkerProcess(name, command, env)
+    except OSError as e:
+        _log.error(f"{name}: Failed to start ({e})")
+        return None
+    status = worker.wait_status(startup_timeout)
+    if status is None or status.get("status") != "ready":
+        _log.error(f"{name}: Not ready (exit code: {worker.process.poll()})")
+        worker.stop(timeout=5.0)
+        return None
+    _log.info(f"{name}: Ready (pid: {worker.process.pid})")
+    return worker
+
+
+def run_farm(jobs: list[FarmJob], command: list[str], worker_count: int, max_retries: int = 2,
+             job_timeout: float | None = None, startup_timeout: float = 600.0) -> list[FarmResult]:
+    """작업들을 워커 프로세스 풀에 나눠 실행하고 결과를 작업 순서대로 리턴한다.
+
+    워커마다 스레드 하나가 큐에서 작업을 꺼내 보내고 상태를 기다린다. 실패하거나 워커가 죽거나 시간이 초과된 작업은
+    max_retries번까지 다시 큐에 넣는다. 죽은 워커는 다음 작업 때 새로 띄운다.
+    """
+    env = _get_worker_env()
+    job_queue: queue.Queue = queue.Queue()
+    for job in jobs:
+        job_queue.put((job, 0))
+    results: dict[str, FarmResult] = {}
+    lock = threading.Lock()
+    start_time: float = time.perf_counter()
+
+    def record(result: FarmResult):
+        with lock:
+            results[result.job_id] = result
+            done: int = len(results)
+            elapsed: float = time.perf_counter() - start_time
+            eta: float = elapsed / done * (len(jobs) - done)
+        state: str = "Done" if result.success else "Failed"
+        _log.info(f"[{done}/{len(jobs)}] {state} {result.input_path} ({result.elapsed:.2f}s, "
+                  f"attempts: {result.attempts}, worker: {result.worker}, eta: {eta:.0f}s)")
+
+    def work(name: str):
+        worker: WorkerProcess | None = None
+        start_failures: int = 0
+        try:
+            while True:
+                try:
+                    job, attempts = job_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if worker is None:
+                    worker = _start_worker(name, command, env, startup_timeout)
+                    if worker is None:
+                        job_queue.put((job, attempts))
+                        start_failures += 1
+                        if start_failures >= WORKER_START_RETRIES:
+                            _log.error(f"{name}: Giving up after {start_failures} failed starts")
+                            break
+                        continue
+                    start_failures = 0
+
+                job_start_time: float = time.perf_counter()
+                attempts += 1
+                try:
+                    worker.send(job)
+                except OSError:
+                    pass
+                # 이전 작업의 늦은 상태를 건너뛰는 동안에도 작업 하나의 전체 대기 시간이 job_timeout을 넘지 않게 한다.
+                deadline: float | None = job_start_time + job_timeout if job_timeout is not None else None
+                status = worker.wait_status(job_timeout)
+                while status is not None and status.get("id") != job.job_id:
+                    remaining: float | None = max(deadline - time.perf_counter(), 0.0) if deadline is not None else None
+                    status = worker.wait_status(remaining)
+                elapsed: float = time.perf_counter() - job_start_time
+
+                if status is None:
+                    error = "Worker exited" if worker.process.poll() is not None else "Timeout"
+                    if error == "Timeout":
+                        worker.process.kill()
+                    worker.stop(timeout=5.0)
+                    worker = None
+                elif status.get("status") == "ok":
+                    record(FarmResult(job.job_id, job.input_path, job.output_path, True, attempts, elapsed, None, name))
+                    continue
+                else:
+                    error = status.get("error", "Unknown error")
+
+                if attempts <= max_retries:
+                    _log.warning(f"{name}: Retry {job.input_path} ({error}, attempts: {attempts})")
+                    job_queue.put((job, attempts))
+                else:
+                    record(FarmResult(job.job_id, job.input_path, job.output_path, False, attempts, elapsed, error, name))
+        finally:
+            if worker is not None:
+                worker.stop()
+
+    _log.info(f"Start Farm (jobs: {len(jobs)}, workers: {worker_count})")
+    threads = [threading.Thread(target=work, args=(f"Worker{i + 1}",)) for i in range(worker_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 모든 워커가 시작에 실패하면 남은 작업이 생길 수 있다.
+    for job in jobs:
+        if job.job_id not in results:
+            results[job.job_id] = FarmResult(job.job_id, job.input_path, job.output_path, False, 0, 0.0,
+                                             "No available worker", None)
+    ordered = [results[job.job_id] for job in jobs]
+    succeeded: int = sum(1 for result in ordered if result.success)
+    _log.info(f"Farm Finished ({succeeded}/{len(ordered)} succeeded, {time.perf_counter() - start_time:.2f}s)")
+    return ordered
+
+
+def write_farm_report(path: str, results: list[FarmResult]):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump([result._asdict() for result in results], file, ensure_ascii=False, indent=4)
@@ -1,13 +1,27 @@
 #!python
 
 import logging
+import os
+import sys
+import time
 
 import typer
 from typing import Optional
 from typing_extensions import Annotated
 
 from ob_tools.utils.log_utils import setup_logger
-from ob_tools.bin.snow import make_snow
+from ob_tools.utils.cache_utils import FileCache
+from ob_tools.utils.profile_utils import StageProfiler
+from ob_tools.bin.snow import (
+    make_snow, make_snow_batch, run_snow_worker,
+    collect_snow_inputs, get_snow_output_path, get_snow_output_collisions,
+    get_snow_cache_key, fetch_cached_snow, store_cached_snow,
+    SNOW_OUTPUT_SUFFIX, SNOW_OUTPUT_FORMATS,
+)
+from ob_tools.bin.farm import (
+    FarmJob, FarmResult,
+    run_farm, get_worker_count, build_worker_command, write_farm_report,
+)
 
 def _version_callback(value: bool) -> None:
     if value:
@@ -20,18 +34,194 @@ _log = setup_logger("GeometryNodeCLI", logging.DEBUG)
 app = typer.Typer()
 
 
+def _get_profiler(profile: bool, profile_output: str | None) -> StageProfiler | None:
+    return StageProfiler(_log) if profile or profile_output else None
+
+
+def _emit_profile(profiler: StageProfiler | None, profile: bool, profile_output: str | None):
+    if profiler is None:
+        return
+    if profile:
+        profiler.log_summary()
+    if profile_output:
+        profiler.write_json_lines(profile_output)
+        _log.info(f"Profile written to {profile_output}")
+
+
+def _get_output_format(output_format: str) -> str:
+    output_format = "." + output_format.lstrip(".").lower()
+    if output_format not in SNOW_OUTPUT_FORMATS:
+        _log.error(f"Unsupported output format {output_format} ({', '.join(SNOW_OUTPUT_FORMATS)})")
+        raise typer.Exit(code=1)
+    return output_format
+
+
+def _check_output_collisions(input_fbx_paths: list[str], output_dir: str, output_suffix: str, output_format: str):
+    collisions = get_snow_output_collisions(input_fbx_paths, output_dir, output_suffix, output_format)
+    if collisions:
+        for output_path, paths in collisions.items():
+            _log.error(f"Inputs share the same output path {output_path} ({', '.join(paths)})")
+        raise typer.Exit(code=1)
+
+
+def _get_cache(cache_dir: str | None, cache_max_size: float) -> FileCache | None:
+    return FileCache(cache_dir, int(cache_max_size * 1024 ** 3)) if cache_dir else None
+
+
 @app.command()
 def snow(
     input_blender: Annotated[str, typer.Option(help="Input Blender Filepath", rich_help_panel="File")],
     input_fbx: Annotated[str, typer.Option(help="Input FBX Filepath", rich_help_panel="File")],
-    output_fbx: Annotated[str, typer.Option(help="Output FBX Filepath", rich_help_panel="File")],
+    output_fbx: Annotated[str, typer.Option(help="Output Filepath (.fbx, .obj, .glb, .ply)", rich_help_panel="File")],
     geometry_node: Annotated[str, typer.Option(help="Geometry Node Name", rich_help_panel="File")]="GN_Snow",
 	density: Annotated[float, typer.Option(help="Snow Density", rich_help_panel="Snow")]=10000,
     voxel_size: Annotated[float, typer.Option(help="Snow Voxel Size", rich_help_panel="Snow")]=0.01,
     decimate: Annotated[bool, typer.Option(help="Run Decimate", rich_help_panel="Decimate")]=False,
     decimate_ratio: Annotated[float, typer.Option(help="Decimate Ratio", rich_help_panel="Decimate")]=0.1,
+    lean: Annotated[bool, typer.Option(help="Start from an empty factory scene and build the emitter plane from vertex data", rich_help_panel="Snow")]=False,
+    cache_dir: Annotated[Optional[str], typer.Option(help="Output cache directory (disabled if not set)", rich_help_panel="Cache")]=None,
+    cache_max_size: Annotated[float, typer.Option(help="Maximum cache size (GB)", rich_help_panel="Cache")]=10.0,
+    cache_link: Annotated[bool, typer.Option(help="Hardlink cached outputs instead of copying", rich_help_panel="Cache")]=False,
+    profile: Annotated[bool, typer.Option(help="Log a per-stage timing/memory summary table", rich_help_panel="Profile")]=False,
+    profile_output: Annotated[Optional[str], typer.Option(help="Append per-stage records as JSON lines to this path", rich_help_panel="Profile")]=None,
+):
+    profiler = _get_profiler(profile, profile_output)
+    try:
+        make_snow(input_blender, geometry_node, input_fbx, output_fbx, density, voxel_size, decimate, decimate_ratio,
+                  cache=_get_cache(cache_dir, cache_max_size), cache_link=cache_link, profiler=profiler,
+                  lean=lean)
+    finally:
+        _emit_profile(profiler, profile, profile_output)
+
+
+@app.command("snow-batch")
+def snow_batch(
+    input_blender: Annotated[str, typer.Option(help="Input Blender Filepath", rich_help_panel="File")],
+    inputs: Annotated[list[str], typer.Option("--input", help="Input FBX directory, glob pattern or manifest (.txt/.json). Repeatable", rich_help_panel="File")],
+    output_dir: Annotated[str, typer.Option(help="Output Directory", rich_help_panel="File")],
+    output_suffix: Annotated[str, typer.Option(help="Output Filename Suffix", rich_help_panel="File")]=SNOW_OUTPUT_SUFFIX,
+    output_format: Annotated[str, typer.Option(help="Output Format (fbx, obj, glb, ply)", rich_help_panel="File")]="fbx",
+    geometry_node: Annotated[str, typer.Option(help="Geometry Node Name", rich_help_panel="File")]="GN_Snow",
+    density: Annotated[float, typer.Option(help="Snow Density", rich_help_panel="Snow")]=10000,
+    voxel_size: Annotated[float, typer.Option(help="Snow Voxel Size", rich_help_panel="Snow")]=0.01,
+    decimate: Annotated[bool, typer.Option(help="Run Decimate", rich_help_panel="Decimate")]=False,
+    decimate_ratio: Annotated[float, typer.Option(help="Decimate Ratio", rich_help_panel="Decimate")]=0.1,
+    lean: Annotated[bool, typer.Option(help="Start from an empty factory scene and build the emitter plane from vertex data", rich_help_panel="Snow")]=False,
+    stop_on_error: Annotated[bool, typer.Option(help="Stop at the first failed input", rich_help_panel="Batch")]=False,
+    cache_dir: Annotated[Optional[str], typer.Option(help="Output cache directory (disabled if not set)", rich_help_panel="Cache")]=None,
+    cache_max_size: Annotated[float, typer.Option(help="Maximum cache size (GB)", rich_help_panel="Cache")]=10.0,
+    cache_link: Annotated[bool, typer.Option(help="Hardlink cached outputs instead of copying", rich_help_panel="Cache")]=False,
+    profile: Annotated[bool, typer.Option(help="Log a per-stage timing/memory summary table", rich_help_panel="Profile")]=False,
+    profile_output: Annotated[Optional[str], typer.Option(help="Append per-stage records as JSON lines to this path", rich_help_panel="Profile")]=None,
+):
+    input_fbx_paths = collect_snow_inputs(inputs)
+    if len(input_fbx_paths) <= 0:
+        _log.error(f"No input FBX files ({inputs})")
+        raise typer.Exit(code=1)
+    output_format = _get_output_format(output_format)
+    _check_output_collisions(input_fbx_paths, output_dir, output_suffix, output_format)
+    profiler = _get_profiler(profile, profile_output)
+    results = make_snow_batch(input_blender, geometry_node, input_fbx_paths, output_dir, density, voxel_size,
+                              decimate, decimate_ratio, suffix=output_suffix,
+                              output_format=output_format, stop_on_error=stop_on_error,
+                              cache=_get_cache(cache_dir, cache_max_size), cache_link=cache_link, profiler=profiler,
+                              lean=lean)
+    _emit_profile(profiler, profile, profile_output)
+    if not all(result.success for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.command("snow-farm")
+def snow_farm(
+    input_blender: Annotated[str, typer.Option(help="Input Blender Filepath", rich_help_panel="File")],
+    inputs: Annotated[list[str], typer.Option("--input", help="Input FBX directory, glob pattern or manifest (.txt/.json). Repeatable", rich_help_panel="File")],
+    output_dir: Annotated[str, typer.Option(help="Output Directory", rich_help_panel="File")],
+    output_suffix: Annotated[str, typer.Option(help="Output Filename Suffix", rich_help_panel="File")]=SNOW_OUTPUT_SUFFIX,
+    output_format: Annotated[str, typer.Option(help="Output Format (fbx, obj, glb, ply)", rich_help_panel="File")]="fbx",
+    geometry_node: Annotated[str, typer.Option(help="Geometry Node Name", rich_help_panel="File")]="GN_Snow",
+    density: Annotated[float, typer.Option(help="Snow Density", rich_help_panel="Snow")]=10000,
+    voxel_size: Annotated[float, typer.Option(help="Snow Voxel Size", rich_help_panel="Snow")]=0.01,
+    decimate: Annotated[bool, typer.Option(help="Run Decimate", rich_help_panel="Decimate")]=False,
+    decimate_ratio: Annotated[float, typer.Option(help="Decimate Ratio", rich_help_panel="Decimate")]=0.1,
+    lean: Annotated[bool, typer.Option(help="Start from an empty factory scene and build the emitter plane from vertex data", rich_help_panel="Snow")]=False,
+    workers: Annotated[int, typer.Option(help="Worker Count (0: auto from CPU count and available memory)", rich_help_panel="Farm")]=0,
+    memory_per_worker: Annotated[float, typer.Option(help="Expected Memory per Worker (GB) for auto worker count", rich_help_panel="Farm")]=2.0,
+    retries: Annotated[int, typer.Option(help="Retries per failed input", rich_help_panel="Farm")]=2,
+    job_timeout: Annotated[float, typer.Option(help="Timeout per input in seconds (0: none)", rich_help_panel="Farm")]=0,
+    blender: Annotated[Optional[str], typer.Option(help="Blender executable for workers (default: this Python with the bpy module)", rich_help_panel="Farm")]=None,
+    blender_threads: Annotated[int, typer.Option(help="Threads per Blender worker (0: Blender default)", rich_help_panel="Farm")]=0,
+    report: Annotated[Optional[str], typer.Option(help="Write results as JSON to this path", rich_help_panel="Farm")]=None,
+    cache_dir: Annotated[Optional[str], typer.Option(help="Output cache directory (disabled if not set)", rich_help_panel="Cache")]=None,
+    cache_max_size: Annotated[float, typer.Option(help="Maximum cache size (GB)", rich_help_panel="Cache")]=10.0,
+    cache_link: Annotated[bool, typer.Option(help="Hardlink cached outputs instead of copying", rich_help_panel="Cache")]=False,
+):
+    input_fbx_paths = collect_snow_inputs(inputs)
+    if len(input_fbx_paths) <= 0:
+        _log.error(f"No input FBX files ({inputs})")
+        raise typer.Exit(code=1)
+    output_format = _get_output_format(output_format)
+    _check_output_collisions(input_fbx_paths, output_dir, output_suffix, output_format)
+    os.makedirs(output_dir, exist_ok=True)
+    all_jobs = [FarmJob(str(i), path, get_snow_output_path(path, output_dir, output_suffix, output_format))
+                for i, path in enumerate(input_fbx_paths)]
+
+    # 캐시에 있는 결과는 스케줄러에서 바로 복사하고, 나머지만 워커에 보낸다.
+    cache = _get_cache(cache_dir, cache_max_size)
+    cache_keys: dict[str, str] = {}
+    cached_results: list[FarmResult] = []
+    jobs: list[FarmJob] = []
+    for job in all_jobs:
+        if cache:
+            start_time: float = time.perf_counter()
+            cache_keys[job.job_id] = get_snow_cache_key(input_blender, geometry_node, job.input_path, density,
+                                                        voxel_size, decimate, decimate_ratio, output_format)
+            if fetch_cached_snow(cache, cache_keys[job.job_id], job.output_path, cache_link):
+                cached_results.append(FarmResult(job.job_id, job.input_path, job.output_path, True, 0,
+                                                 time.perf_counter() - start_time, None, None, True))
+                continue
+        jobs.append(job)
+    if cache:
+        _log.info(f"Cache Hits: {len(all_jobs) - len(jobs)}/{len(all_jobs)}")
+    worker_args = [
+        "snow-worker",
+        f"--input-blender={input_blender}",
+        f"--geometry-node={geometry_node}",
+        f"--density={density}",
+        f"--voxel-size={voxel_size}",
+        "--decimate" if decimate else "--no-decimate",
+        f"--decimate-ratio={decimate_ratio}",
+        "--lean" if lean else "--no-lean",
+    ]
+    command = build_worker_command(os.path.abspath(__file__), worker_args, blender, blender_threads)
+    worker_count = workers if workers > 0 else get_worker_count(len(jobs), int(memory_per_worker * 1024 ** 3))
+    results = run_farm(jobs, command, min(worker_count, len(jobs)), max_retries=retries,
+                       job_timeout=job_timeout if job_timeout > 0 else None) if jobs else []
+    for result in results:
+        if result.success:
+            store_cached_snow(cache, cache_keys.get(result.job_id), result.output_path)
+    # 캐시에서 가져온 입력도 결과에 넣어서 리포트가 모든 입력을 입력 순서대로 담게 한다.
+    results_by_id = {result.job_id: result for result in cached_results + results}
+    results = [results_by_id[job.job_id] for job in all_jobs]
+    succeeded: int = sum(1 for result in results if result.success)
+    _log.info(f"Farm Summary ({succeeded}/{len(results)} succeeded, {len(cached_results)} cached)")
+    if report:
+        write_farm_report(report, results)
+    if not all(result.success for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.command("snow-worker", hidden=True)
+def snow_worker(
+    input_blender: Annotated[str, typer.Option(help="Input Blender Filepath")],
+    geometry_node: Annotated[str, typer.Option(help="Geometry Node Name")]="GN_Snow",
+    density: Annotated[float, typer.Option(help="Snow Density")]=10000,
+    voxel_size: Annotated[float, typer.Option(help="Snow Voxel Size")]=0.01,
+    decimate: Annotated[bool, typer.Option(help="Run Decimate")]=False,
+    decimate_ratio: Annotated[float, typer.Option(help="Decimate Ratio")]=0.1,
+    lean: Annotated[bool, typer.Option(help="Start from an empty factory scene")]=False,
 ):
-    make_snow(input_blender, geometry_node, input_fbx, output_fbx, density, voxel_size, decimate, decimate_ratio)
+    """snow-farm이 띄우는 워커. stdin으로 작업을 받는다."""
+    run_snow_worker(input_blender, geometry_node, density, voxel_size, decimate, decimate_ratio, lean=lean)
 
 
 @app.callback()
@@ -48,5 +238,12 @@ def main(
     return
 
 
+def _get_cli_args() -> list[str]:
+    # blender -b --python gn.py -- <args> 로 실행된 경우 "--" 뒤의 인자만 사용한다.
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    app(args=_get_cli_args())
\ No newline at end of file
@@ -1,17 +1,26 @@
+import glob
+import json
 import math
 import logging
+import os
+import sys
+import time
+from collections import namedtuple
 
 import bpy
-from bpy.types import GeometryNodeTree, Collection
+from bpy.types import GeometryNodeTree, Collection, Object
 from mathutils import Vector, Euler
 
 from ob_tools.utils.log_utils import setup_logger
-from ob_tools.functions.context import select_objects, deselect_all
+from ob_tools.utils.cache_utils import FileCache, hash_file, make_cache_key
+from ob_tools.utils.profile_utils import StageProfiler, get_mesh_counts
+from ob_tools.bin.farm import emit_status
+from ob_tools.functions.context import deselect_all
+from ob_tools.functions.mesh import write_ply
 from ob_tools.functions.collection import (
     create_collection,
     get_all_collections,
     get_all_layer_collections,
-    get_layer_collection,
     set_active_layer_collection,
     get_collection_bound_box,
 )
@@ -21,6 +30,15 @@ TARGET_COLLECTION_NAME:str = "_TargetCollection"
 SNOW_COLLECTION_NAME:str = "_SnowCollection"
 SNOW_PLANE_NAME:str = "_SnowPlane"
 MARGIN:float = 0.1
+SNOW_OUTPUT_SUFFIX:str = "_snow"
+SNOW_OUTPUT_FORMATS: tuple[str, ...] = (".fbx", ".obj", ".glb", ".ply")
+# 배치 처리 시 파일마다 새로 생긴 데이터를 지우기 위해 추적하는 bpy.data 컬렉션 이름들.
+TRACKED_DATA_NAMES: tuple[str, ...] = (
+    "objects", "meshes", "materials", "images", "textures", "armatures", "actions",
+    "curves", "cameras", "lights", "collections",
+)
+SNOW_CACHE_VERSION: int = 2  # process_snow()의 결과가 바뀌는 수정을 하면 올려서 이전 캐시를 무효화한다.
+SnowBatchResult = namedtuple("SnowBatchResult", "input_path output_path success elapsed error cached")
 _log = setup_logger("Snow", logging.DEBUG)
 
 
@@ -42,7 +60,251 @@ def link_gn(filepath:str, geometry_node_name:str) -> GeometryNodeTree:
     return gn
 
 
-def make_snow(input_blender_path:str, geometry_node_name: str, input_fbx_path: str, output_fbx_path:str, density:float, voxel_size:float, decimate:bool, decimate_ratio:float):
+def reset_scene(lean: bool = False):
+    """씬을 초기화한다.
+    lean이 True이면 기본 씬과 UI 데이터를 읽지 않고 빈 팩토리 씬에서 시작한다.
+    """
+    if lean:
+        _log.info(f"Reset Scene (Empty Factory Settings)")
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+    else:
+        _log.info(f"Reset Scene")
+        bpy.ops.wm.read_homefile()
+
+
+def create_emitter_plane(collection: Collection, min_coord: Vector, max_coord: Vector) -> Object:
+    """바운딩 박스 위쪽 면을 덮는, 노멀이 아래(-Z)를 향하는 평면을 월드 좌표 버텍스로 바로 만든다.
+    primitive_plane_add + transform_apply로 만든 평면과 위치, 면 방향, UV는 같지만 버텍스 순서는 다를 수 있다.
+    """
+    center_x: float = (min_coord.x + max_coord.x) / 2
+    center_y: float = (min_coord.y + max_coord.y) / 2
+    half_x: float = (max_coord.x - min_coord.x) / 2
+    half_y: float = (max_coord.y - min_coord.y) / 2
+    z: float = max_coord.z
+    # Y축으로 180도 회전된 평면이므로 X가 뒤집혀 있고, 이 순서의 면은 노멀이 아래를 향한다.
+    vertices = [
+        (center_x + half_x, center_y - half_y, z),
+        (center_x - half_x, center_y - half_y, z),
+        (center_x - half_x, center_y + half_y, z),
+        (center_x + half_x, center_y + half_y, z),
+    ]
+    mesh = bpy.data.meshes.new(SNOW_PLANE_NAME + "Data")
+    mesh.from_pydata(vertices, [], [(0, 1, 2, 3)])
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", (0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 1.0))
+    mesh.update()
+
+    plane = bpy.data.objects.new(SNOW_PLANE_NAME, mesh)
+    collection.objects.link(plane)
+    deselect_all()
+    plane.select_set(True)
+    bpy.context.view_layer.objects.active = plane
+    return plane
+
+
+def process_snow(gn_snow: GeometryNodeTree, input_fbx_path: str, output_fbx_path:str, density:float, voxel_size:float, decimate:bool, decimate_ratio:float, profiler: StageProfiler | None = None, lean: bool = False):
+    """링크된 Geometry Node로 FBX 하나에 눈을 만들어 내보낸다.
+    모디파이어를 apply 하지 않고 depsgraph에서 한 번 평가한 결과만 내보낸다. 출력 형식은 확장자(.fbx, .obj, .glb, .ply)로 정한다.
+    profiler가 주어지면 단계별 시간, 메모리, 버텍스/면 수를 기록한다.
+    lean이 True이면 이미터 평면을 오퍼레이터 없이 월드 좌표 버텍스로 바로 만든다.
+    """
+    geometry_node_name: str = gn_snow.name
+    output_format: str = get_snow_output_format(output_fbx_path)
+    profiler = profiler or StageProfiler()
+    label: str = os.path.basename(input_fbx_path)
+
+    with profiler.stage("Import FBX", label) as record:
+        _log.info(f"Create a TargetCollection ({TARGET_COLLECTION_NAME})")
+        target_collection: Collection = create_collection(TARGET_COLLECTION_NAME)
+
+        _log.info(f"Active a TargetLayerCollection ({TARGET_COLLECTION_NAME})")
+        set_active_layer_collection(TARGET_COLLECTION_NAME)
+
+        _log.info(f"Import FBX ({input_fbx_path})")
+        result = bpy.ops.import_scene.fbx(filepath=input_fbx_path)
+        assert("FINISHED" in result)
+        record.update(get_mesh_counts(target_collection.objects))
+
+    _log.info(f"Target Objects:")
+    for obj in target_collection.objects:
+        _log.info(f"\t* {obj.name} (Object)")
+
+    with profiler.stage("Create Emitter Plane", label) as record:
+        _log.info(f"Create a SnowCollection ({SNOW_COLLECTION_NAME})")
+        snow_collection: Collection = create_collection(SNOW_COLLECTION_NAME)
+
+        _log.info(f"Active a SnowLayerCollection ({SNOW_COLLECTION_NAME})")
+        set_active_layer_collection(SNOW_COLLECTION_NAME)
+
+        _log.info(f"Get TargetCollection BoundingBox ({TARGET_COLLECTION_NAME})")
+        min_coord, max_coord = get_collection_bound_box(TARGET_COLLECTION_NAME)
+        min_coord -= Vector((MARGIN, MARGIN, MARGIN))
+        max_coord += Vector((MARGIN, MARGIN, MARGIN))
+        bounding_box_size = max_coord - min_coord
+
+        _log.info(f"Create a SnowEmitterPlane")
+        if lean:
+            plane = create_emitter_plane(snow_collection, min_coord, max_coord)
+        else:
+            plane_location = (min_coord + max_coord) / 2
+            plane_location.z = max_coord.z
+            plane_result = bpy.ops.mesh.primitive_plane_add(
+                size=1.0,
+                location=plane_location,
+                rotation=Euler((0,math.radians(180),0)), # Normal을 아래 방향으로 회전시켜야 눈이 위에서 아래로 떨어짐.
+                scale=Vector((1,1,1))
+            )
+            assert("FINISHED" in plane_result)
+            plane = bpy.context.active_object
+            plane.name = SNOW_PLANE_NAME
+            plane.data.name = SNOW_PLANE_NAME + "Data"
+            plane.dimensions = Vector((bounding_box_size.x, bounding_box_size.y, 1))
+            bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        record.update(get_mesh_counts([plane]))
+
+    with profiler.stage("Setup Modifiers", label):
+        _log.info(f"Apply {geometry_node_name} Modifier to SnowEmitterPlane")
+        snow_modifier = plane.modifiers.new(name=f"{geometry_node_name}_Modifier", type="NODES")
+
+        _log.info(f"Set {geometry_node_name} Input Values")
+        snow_modifier.node_group = gn_snow  # bpy.data.node_groups[geometry_node]
+        modifier_items = snow_modifier.node_group.interface.items_tree
+        density_id = modifier_items["Density"].identifier
+        voxel_size_id = modifier_items["Voxel Size"].identifier
+        target_collection_id = modifier_items["Target Collection"].identifier
+        snow_modifier[density_id] = density
+        snow_modifier[voxel_size_id] = voxel_size
+        snow_modifier[target_collection_id] = target_collection
+
+        _log.info(f"Set Desnity to {snow_modifier[density_id]}")
+        _log.info(f"Set VoxelSize to {snow_modifier[voxel_size_id]}")
+        _log.info(f"Set TargetCollection to {snow_modifier[target_collection_id].name}")
+
+        if decimate:
+            _log.info(f"Add Decimate Modifier to SnowEmitterPlane")
+            _log.info(f"Decimate Ratio: {decimate_ratio}")
+            decimate_modifier = plane.modifiers.new(name="DecimateModifier", type="DECIMATE")
+            decimate_modifier.decimate_type = "COLLAPSE"
+            decimate_modifier.ratio = decimate_ratio
+            decimate_modifier.use_symmetry = False
+            decimate_modifier.use_collapse_triangulate = False
+
+    # _log.info(f"Save Output Blend File")
+    # bpy.ops.wm.save_as_mainfile(filepath="d:/tmp/output.blend")
+
+    with profiler.stage("Evaluate Snow", label) as record:
+        _log.info(f"Evaluate SnowEmitterPlane")
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        plane_eval = plane.evaluated_get(depsgraph)
+        if output_format == ".ply":
+            # 평가된 메시를 복사하지 않고 바로 파일로 쓴다.
+            export_mesh = plane_eval.to_mesh()
+        else:
+            export_object = create_export_object(plane, plane_eval, depsgraph, snow_collection)
+            export_mesh = export_object.data
+        record.update(vertices=len(export_mesh.vertices), faces=len(export_mesh.polygons))
+
+    with profiler.stage(f"Export {output_format[1:].upper()}", label):
+        _log.info(f"Export {output_format[1:].upper()} ({output_fbx_path})")
+        if output_format == ".ply":
+            try:
+                write_ply(export_mesh, output_fbx_path, plane.matrix_world)
+            finally:
+                plane_eval.to_mesh_clear()
+        else:
+            export_snow_object(export_object, output_fbx_path)
+
+
+def get_snow_output_format(output_path: str) -> str:
+    output_format: str = os.path.splitext(output_path)[1].lower()
+    if output_format not in SNOW_OUTPUT_FORMATS:
+        raise Exception(f"Unsupported output format {output_format} ({', '.join(SNOW_OUTPUT_FORMATS)})")
+    return output_format
+
+
+def create_export_object(plane: Object, plane_eval: Object, depsgraph, collection: Collection) -> Object:
+    """평가된 이미터 평면(Geometry Node, Decimate 결과)을 모디파이어 없는 새 메시로 만들어 익스포트 전용 오브젝트에 담는다.
+    모디파이어를 하나씩 apply 하지 않으므로 평가는 한 번만 일어나고, 원본 평면은 지워서 평가 결과 메모리를 바로 해제한다.
+    새 오브젝트는 원래 평면의 이름을 이어받으므로 익스포트된 파일의 오브젝트 이름은 같다.
+    """
+    mesh = bpy.data.meshes.new_from_object(plane_eval, preserve_all_data_layers=True, depsgraph=depsgraph)
+    matrix_world = plane.matrix_world.copy()
+    plane_mesh = plane.data
+    bpy.data.objects.remove(plane)
+    bpy.data.meshes.remove(plane_mesh)
+    mesh.name = SNOW_PLANE_NAME + "Data"
+
+    export_object = bpy.data.objects.new(SNOW_PLANE_NAME, mesh)
+    export_object.matrix_world = matrix_world
+    collection.objects.link(export_object)
+    return export_object
+
+
+def export_snow_object(obj: Object, output_path: str):
+    """오브젝트 하나만 선택해서 확장자에 맞는 익스포터(.fbx, .obj, .glb)로 내보낸다.
+    """
+    deselect_all()
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    output_format: str = get_snow_output_format(output_path)
+    if output_format == ".fbx":
+        result = bpy.ops.export_scene.fbx(
+            filepath=output_path,
+            use_selection=True,
+            axis_forward="-Z", axis_up="Y", apply_unit_scale=True,
+            global_scale=1.0
+        )
+    elif output_format == ".obj":
+        result = bpy.ops.wm.obj_export(
+            filepath=output_path,
+            export_selected_objects=True,
+            forward_axis="NEGATIVE_Z", up_axis="Y",
+        )
+    elif output_format == ".glb":
+        result = bpy.ops.export_scene.gltf(filepath=output_path, export_format="GLB", use_selection=True)
+    else:
+        raise Exception(f"Unsupported output format {output_format}")
+    assert("FINISHED" in result)
+
+
+def get_snow_cache_key(input_blender_path:str, geometry_node_name: str, input_fbx_path: str, density:float, voxel_size:float, decimate:bool, decimate_ratio:float, output_format: str = ".fbx") -> str:
+    """입력 FBX와 노드 라이브러리 .blend의 내용, Geometry Node 이름, 파라미터, 출력 포맷, Blender 버전으로 캐시 키를 만든다.
+    """
+    return make_cache_key({
+        "version": SNOW_CACHE_VERSION,
+        "blender": bpy.app.version_string,
+        "input_fbx": hash_file(input_fbx_path),
+        "node_library": hash_file(input_blender_path),
+        "geometry_node": geometry_node_name,
+        "density": density,
+        "voxel_size": voxel_size,
+        # Decimate를 하지 않으면 비율은 결과에 영향이 없다.
+        "decimate_ratio": decimate_ratio if decimate else None,
+        "format": output_format,
+    })
+
+
+def fetch_cached_snow(cache: FileCache | None, key: str | None, output_fbx_path: str, link: bool = False) -> bool:
+    if cache is None or key is None:
+        return False
+    if cache.get(key, output_fbx_path, link=link):
+        _log.info(f"Cache Hit ({key[:12]}) > {output_fbx_path}")
+        return True
+    return False
+
+
+def store_cached_snow(cache: FileCache | None, key: str | None, output_fbx_path: str):
+    if cache is None or key is None or not os.path.isfile(output_fbx_path):
+        return
+    cache.put(key, output_fbx_path)
+    _log.info(f"Cache Stored ({key[:12]})")
+
+
+def make_snow(input_blender_path:str, geometry_node_name: str, input_fbx_path: str, output_fbx_path:str, density:float, voxel_size:float, decimate:bool, decimate_ratio:float, cache: FileCache | None = None, cache_link: bool = False, profiler: StageProfiler | None = None, lean: bool = False):
+    key = get_snow_cache_key(input_blender_path, geometry_node_name, input_fbx_path, density, voxel_size, decimate, decimate_ratio, get_snow_output_format(output_fbx_path)) if cache else None
+    if fetch_cached_snow(cache, key, output_fbx_path, cache_link):
+        return
+
     _log.info(f"BlenderPythonModuleVersion: {bpy.app.version}")
     _log.info(f"InputBlenderPath: {input_blender_path}")
     _log.info(f"InputFbxPath: {input_fbx_path}")
@@ -53,104 +315,172 @@ def make_snow(input_blender_path:str, geometry_node_name: str, input_fbx_path: s
     _log.info(f"SnowCollectionName: {SNOW_COLLECTION_NAME}")
     _log.info(f"BoundingBoxMargin: {MARGIN}")
 
-    _log.info(f"Reset Scene")
-    bpy.ops.wm.read_homefile()
+    profiler = profiler or StageProfiler()
+    with profiler.stage("Reset Scene"):
+        reset_scene(lean)
 
-    _log.info(f"Link GeometryNode {geometry_node_name} from {input_blender_path}")
-    gn_snow = link_gn(input_blender_path, geometry_node_name)
+    with profiler.stage("Link Geometry Node"):
+        _log.info(f"Link GeometryNode {geometry_node_name} from {input_blender_path}")
+        gn_snow = link_gn(input_blender_path, geometry_node_name)
+    if os.path.lexists(output_fbx_path):
+        os.remove(output_fbx_path)  # 캐시 항목에 하드링크된 이전 출력을 덮어쓰지 않도록 한다.
+    process_snow(gn_snow, input_fbx_path, output_fbx_path, density, voxel_size, decimate, decimate_ratio, profiler, lean)
+    store_cached_snow(cache, key, output_fbx_path)
 
-    _log.info(f"Create a TargetCollection ({TARGET_COLLECTION_NAME})")
-    target_collection: Collection = create_collection(TARGET_COLLECTION_NAME)
 
-    _log.info(f"Active a TargetLayerCollection ({TARGET_COLLECTION_NAME})")
-    set_active_layer_collection(TARGET_COLLECTION_NAME)
+def collect_snow_inputs(inputs: list[str]) -> list[str]:
+    """디렉터리, glob 패턴, 매니페스트 파일(.txt: 줄마다 경로, .json: 경로 리스트)로 주어진 입력 FBX 경로들을 모은다.
+    매니페스트 안의 상대 경로는 매니페스트 파일 위치를 기준으로 한다. 중복은 제거하고 순서는 유지한다.
+    """
+    results: list[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths = sorted(glob.glob(os.path.join(item, "*.fbx")))
+        elif os.path.isfile(item) and os.path.splitext(item)[1].lower() in (".txt", ".json"):
+            with open(item, "r", encoding="utf-8") as file:
+                if item.lower().endswith(".json"):
+                    entries = json.load(file)
+                else:
+                    entries = [line.strip() for line in file if line.strip() and not line.lstrip().startswith("#")]
+            base_dir = os.path.dirname(os.path.abspath(item))
+            paths = [entry if os.path.isabs(entry) else os.path.join(base_dir, entry) for entry in entries]
+        else:
+            paths = sorted(glob.glob(item))
+        if len(paths) <= 0:
+            _log.warning(f"No inputs found ({item})")
+        results.extend(os.path.abspath(path) for path in paths)
+    return list(dict.fromkeys(results))
 
-    _log.info(f"Import FBX ({input_fbx_path})")
-    result = bpy.ops.import_scene.fbx(filepath=input_fbx_path)
-    assert("FINISHED" in result)
 
-    _log.info(f"Target Objects:")
-    for obj in target_collection.objects:
-        _log.info(f"\t* {obj.name} (Object)")
+def get_snow_output_path(input_fbx_path: str, output_dir: str, suffix: str = SNOW_OUTPUT_SUFFIX, output_format: str = ".fbx") -> str:
+    name: str = os.path.splitext(os.path.basename(input_fbx_path))[0]
+    return os.path.join(output_dir, f"{name}{suffix}{output_format}")
 
-    _log.info(f"Create a SnowCollection ({SNOW_COLLECTION_NAME})")
-    snow_collection: Collection = create_collection(SNOW_COLLECTION_NAME)
-    snow_layer_collection: LayerCollection = get_layer_collection(SNOW_COLLECTION_NAME)
-
-    _log.info(f"Active a SnowLayerCollection ({SNOW_COLLECTION_NAME})")
-    set_active_layer_collection(SNOW_COLLECTION_NAME)
-
-    _log.info(f"Get TargetCollection BoundingBox ({TARGET_COLLECTION_NAME})")
-    min_coord, max_coord = get_collection_bound_box(TARGET_COLLECTION_NAME)
-    min_coord -= Vector((MARGIN, MARGIN, MARGIN))
-    max_coord += Vector((MARGIN, MARGIN, MARGIN))
-    bounding_box_size = max_coord - min_coord
-
-    _log.info(f"Create a SnowEmitterPlane")
-    plane_location = (min_coord + max_coord) / 2
-    plane_location.z = max_coord.z
-    plane_result = bpy.ops.mesh.primitive_plane_add(
-        size=1.0,
-        location=plane_location,
-        rotation=Euler((0,math.radians(180),0)), # Normal을 아래 방향으로 회전시켜야 눈이 위에서 아래로 떨어짐.
-        scale=Vector((1,1,1))
-    )
-    assert("FINISHED" in plane_result)
-    plane = bpy.context.active_object
-    plane.name = SNOW_PLANE_NAME
-    plane.data.name = SNOW_PLANE_NAME + "Data"
-    plane.dimensions = Vector((bounding_box_size.x, bounding_box_size.y, 1))
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-
-    _log.info(f"Apply {geometry_node_name} Modifier to SnowEmitterPlane")
-    snow_modifier = plane.modifiers.new(name=f"{geometry_node_name}_Modifier", type="NODES")
-
-    _log.info(f"Set {geometry_node_name} Input Values")
-    snow_modifier.node_group = gn_snow  # bpy.data.node_groups[geometry_node]
-    modifier_items = snow_modifier.node_group.interface.items_tree
-    density_id = modifier_items["Density"].identifier
-    voxel_size_id = modifier_items["Voxel Size"].identifier
-    target_collection_id = modifier_items["Target Collection"].identifier
-    snow_modifier[density_id] = density
-    snow_modifier[voxel_size_id] = voxel_size
-    snow_modifier[target_collection_id] = target_collection
-
-    _log.info(f"Set Desnity to {snow_modifier[density_id]}")
-    _log.info(f"Set VoxelSize to {snow_modifier[voxel_size_id]}")
-    _log.info(f"Set TargetCollection to {snow_modifier[target_collection_id].name}")
-
-    if decimate:
-        _log.info(f"Add Decimate Modifier to SnowEmitterPlane")
-        _log.info(f"Decimate Ratio: {decimate_ratio}")
-        decimate_modifier = plane.modifiers.new(name="DecimateModifier", type="DECIMATE")
-        decimate_modifier.decimate_type = "COLLAPSE"
-        decimate_modifier.ratio = decimate_ratio
-        decimate_modifier.use_symmetry = False
-        decimate_modifier.use_collapse_triangulate = False
-
-    _log.info(f"Hide Unused LayerCollections")
-    layer_collections = [lc for lc in get_all_layer_collections() if lc not in [snow_layer_collection]]
-    for lc in layer_collections:
-        lc.hide_viewport = True
-        lc.exclude = True
 
-    # _log.info(f"Save Output Blend File")
-    # bpy.ops.wm.save_as_mainfile(filepath="d:/tmp/output.blend")
+def get_snow_output_collisions(input_fbx_paths: list[str], output_dir: str, suffix: str = SNOW_OUTPUT_SUFFIX, output_format: str = ".fbx") -> dict[str, list[str]]:
+    """같은 출력 경로가 되는 입력들(다른 디렉터리의 같은 파일 이름)을 {출력 경로: [입력 경로, ...]} 으로 리턴한다.
+    """
+    inputs_by_output: dict[str, list[str]] = {}
+    for input_fbx_path in input_fbx_paths:
+        output_path = get_snow_output_path(input_fbx_path, output_dir, suffix, output_format)
+        inputs_by_output.setdefault(os.path.normcase(output_path), []).append(input_fbx_path)
+    return {output_path: paths for output_path, paths in inputs_by_output.items() if len(paths) > 1}
 
-    _log.info(f"Apply Snow Modifier")
-    bpy.ops.object.modifier_apply(modifier=snow_modifier.name)
-    if decimate:
-        _log.info(f"Apply Decimate Modifier")
-        bpy.ops.object.modifier_apply(modifier=decimate_modifier.name)
 
-    _log.info(f"Select Final Objects")
-    deselect_all()
-    select_objects(snow_collection.objects)
-
-    _log.info(f"Export FBX")
-    bpy.ops.export_scene.fbx(
-        filepath=output_fbx_path,
-        use_selection=True,
-        axis_forward="-Z", axis_up="Y", apply_unit_scale=True,
-        global_scale=1.0
-    )
+def _get_tracked_ids() -> set:
+    return {id_data for name in TRACKED_DATA_NAMES for id_data in getattr(bpy.data, name)}
+
+
+def _get_layer_collection_states() -> dict[str, tuple[bool, bool]]:
+    return {lc.name: (lc.exclude, lc.hide_viewport) for lc in get_all_layer_collections()}
+
+
+def clear_snow_scene(tracked_ids: set, layer_collection_states: dict[str, tuple[bool, bool]]):
+    """process_snow()가 만든 데이터(임포트된 오브젝트, Target/Snow 컬렉션 등)만 지우고
+    숨겨졌던 레이어 컬렉션들을 원래 상태로 되돌린다. 링크된 Geometry Node와 기본 씬은 유지된다.
+    """
+    new_ids = [id_data for id_data in _get_tracked_ids() if id_data not in tracked_ids]
+    bpy.data.batch_remove(new_ids)
+    for lc in get_all_layer_collections():
+        if lc.name in layer_collection_states:
+            lc.exclude, lc.hide_viewport = layer_collection_states[lc.name]
+
+
+def make_snow_batch(input_blender_path:str, geometry_node_name: str, input_fbx_paths: list[str], output_dir:str, density:float, voxel_size:float, decimate:bool, decimate_ratio:float, suffix: str = SNOW_OUTPUT_SUFFIX, output_format: str = ".fbx", stop_on_error: bool = False, cache: FileCache | None = None, cache_link: bool = False, profiler: StageProfiler | None = None, lean: bool = False) -> list[SnowBatchResult]:
+    """한 프로세스에서 여러 FBX에 눈을 만든다.
+    씬 초기화와 Geometry Node 링크는 한 번만 하고, 파일마다 process_snow()가 만든 데이터만 지운 뒤 다음 파일을 처리한다.
+    cache가 주어지면 캐시에 있는 결과는 복사만 하고, 캐시에 없는 파일이 처음 나올 때 씬을 준비한다.
+    """
+    _log.info(f"BlenderPythonModuleVersion: {bpy.app.version}")
+    _log.info(f"InputBlenderPath: {input_blender_path}")
+    _log.info(f"InputCount: {len(input_fbx_paths)}")
+    _log.info(f"OutputDir: {output_dir}")
+
+    # 나중에 처리한 입력이 앞의 결과를 덮어쓰지 않도록 출력 경로가 겹치면 시작하지 않는다.
+    collisions = get_snow_output_collisions(input_fbx_paths, output_dir, suffix, output_format)
+    if collisions:
+        raise Exception(f"Inputs share the same output path ({collisions})")
+
+    batch_start_time: float = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    profiler = profiler or StageProfiler()
+
+    gn_snow: GeometryNodeTree | None = None
+    tracked_ids: set = set()
+    layer_collection_states: dict[str, tuple[bool, bool]] = {}
+    results: list[SnowBatchResult] = []
+    for i, input_fbx_path in enumerate(input_fbx_paths):
+        output_fbx_path = get_snow_output_path(input_fbx_path, output_dir, suffix, output_format)
+        _log.info(f"[{i + 1}/{len(input_fbx_paths)}] {input_fbx_path} > {output_fbx_path}")
+        start_time: float = time.perf_counter()
+        error: str | None = None
+        cached: bool = False
+        try:
+            key = get_snow_cache_key(input_blender_path, geometry_node_name, input_fbx_path, density, voxel_size, decimate, decimate_ratio, output_format) if cache else None
+            cached = fetch_cached_snow(cache, key, output_fbx_path, cache_link)
+            if not cached:
+                if gn_snow is None:
+                    with profiler.stage("Reset Scene"):
+                        reset_scene(lean)
+                    with profiler.stage("Link Geometry Node"):
+                        _log.info(f"Link GeometryNode {geometry_node_name} from {input_blender_path}")
+                        gn_snow = link_gn(input_blender_path, geometry_node_name)
+                    tracked_ids = _get_tracked_ids()
+                    layer_collection_states = _get_layer_collection_states()
+                if os.path.lexists(output_fbx_path):
+                    os.remove(output_fbx_path)
+                try:
+                    process_snow(gn_snow, input_fbx_path, output_fbx_path, density, voxel_size, decimate, decimate_ratio, profiler, lean)
+                finally:
+                    with profiler.stage("Clear Scene", os.path.basename(input_fbx_path)):
+                        clear_snow_scene(tracked_ids, layer_collection_states)
+                store_cached_snow(cache, key, output_fbx_path)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            _log.error(f"Failed ({input_fbx_path}): {error}")
+        result = SnowBatchResult(input_fbx_path, output_fbx_path, error is None, time.perf_counter() - start_time, error, cached)
+        results.append(result)
+        _log.info(f"[{i + 1}/{len(input_fbx_paths)}] {'Done' if result.success else 'Failed'}{' (cached)' if cached else ''} ({result.elapsed:.2f}s)")
+        if error and stop_on_error:
+            break
+
+    _log.info(f"Batch Summary:")
+    for result in results:
+        state: str = ("HIT " if result.cached else "OK  ") if result.success else "FAIL"
+        _log.info(f"\t* {state} {result.elapsed:8.2f}s {os.path.basename(result.input_path)}")
+    succeeded: int = sum(1 for result in results if result.success)
+    _log.info(f"Batch Finished ({succeeded}/{len(results)} succeeded, {time.perf_counter() - batch_start_time:.2f}s)")
+    return results
+
+
+def run_snow_worker(input_blender_path:str, geometry_node_name: str, density:float, voxel_size:float, decimate:bool, decimate_ratio:float, stream=None, lean: bool = False):
+    """스케줄러(bin/farm.py)가 띄우는 워커 루프.
+    Geometry Node를 한 번 링크한 뒤 stdin으로 받은 작업(JSON 한 줄: id, input, output)을 처리하고 상태를 stdout으로 보낸다.
+    stdin이 닫히면 끝난다.
+    """
+    stream = stream or sys.stdin
+    reset_scene(lean)
+    _log.info(f"Link GeometryNode {geometry_node_name} from {input_blender_path}")
+    gn_snow = link_gn(input_blender_path, geometry_node_name)
+    tracked_ids = _get_tracked_ids()
+    layer_collection_states = _get_layer_collection_states()
+    emit_status(status="ready", pid=os.getpid())
+
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        job: dict = json.loads(line)
+        start_time: float = time.perf_counter()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(job["output"])), exist_ok=True)
+            if os.path.lexists(job["output"]):
+                os.remove(job["output"])
+            process_snow(gn_snow, job["input"], job["output"], density, voxel_size, decimate, decimate_ratio, lean=lean)
+            emit_status(id=job["id"], status="ok", elapsed=time.perf_counter() - start_time)
+        except Exception as e:
+            _log.error(f"Failed ({job['input']}): {type(e).__name__}: {e}")
+            emit_status(id=job["id"], status="error", error=f"{type(e).__name__}: {e}",
+                        elapsed=time.perf_counter() - start_time)
+        finally:
+            clear_snow_scene(tracked_ids, layer_collection_states)
@@ -1,2 +1,3 @@
 python gn.py snow --input-blender=d:/tmp/GN_Snow.blend --input-fbx=d:/tmp/input.fbx --output-fbx=d:/tmp/output.fbx --geometry-node=GN_Snow --density=5000 --voxel-size=0.02 --decimate --decimate-ratio=0.1
-python gn.py snow --input-blender=d:/tmp/GN_Snow.blend --input-fbx=d:/tmp/monkey.fbx --output-fbx=d:/tmp/monkey_output.fbx --geometry-node=GN_Snow --density=500000 --voxel-size=0.01
\ No newline at end of file
+python gn.py snow --input-blender=d:/tmp/GN_Snow.blend --input-fbx=d:/tmp/monkey.fbx --output-fbx=d:/tmp/monkey_output.fbx --geometry-node=GN_Snow --density=500000 --voxel-size=0.01
+python gn.py snow-batch --input-blender=d:/tmp/GN_Snow.blend --input=d:/tmp/inputs --output-dir=d:/tmp/outputs --geometry-node=GN_Snow --density=5000 --voxel-size=0.02
\ No newline at end of file
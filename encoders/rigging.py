@@ -1,4 +1,30 @@
-from json import JSONEncoder
+import io
+import json
+import struct
+import textwrap
+import zlib
+from json import JSONDecoder, JSONDecodeError, JSONEncoder
+
+import numpy as np
+
+from ..functions.vertex_group import VertexGroupWeights, get_vertex_group_weights, get_group_slice
+
+# OBW(OB Weights) 바이너리 포맷
+#   Header: magic, version, flags, vertex_count, group_count, entry_count
+#   Strings: object_name, object_type, data_name, group names... (uint16 길이 + utf-8)
+#   Arrays: offsets(uint64 x group_count+1), indices(uint32 x entry_count), weights(float16|float32 x entry_count)
+# 배열들은 8바이트 경계에 정렬되어 있어 numpy.frombuffer 또는 mmap으로 복사 없이 읽을 수 있다.
+# OBW_FLAG_ZLIB이 설정된 경우 Header 이후의 내용 전체가 zlib으로 압축되어 있다.
+# OBW_FLAG_POSITIONS가 설정된 경우 weights 뒤에 버텍스 좌표 positions(float32 x vertex_count x 3)가 이어진다.
+OBW_MAGIC: bytes = b"OBW\x00"
+OBW_VERSION: int = 1
+OBW_FLAG_HALF: int = 1 << 0
+OBW_FLAG_ZLIB: int = 1 << 1
+OBW_FLAG_POSITIONS: int = 1 << 2
+_OBW_HEADER = struct.Struct("<4sHHIIQ")
+_OBW_STRING_LENGTH = struct.Struct("<H")
+_OBW_ALIGNMENT: int = 8
+_JSON_INDENT: str = " " * 4
 
 
 class ObjectVertexGroupEncoder(JSONEncoder):
@@ -17,22 +43,230 @@ class ObjectVertexGroupEncoder(JSONEncoder):
             return result
         result["vertex_groups"] = []
 
-        for vertex_group in obj.vertex_groups:
+        # 버텍스마다 소속 그룹을 한 번만 순회하여 모든 그룹의 웨이트를 모은다.
+        weights = get_vertex_group_weights(obj)
+        for group_index, name in enumerate(weights.names):
+            indices, values = get_group_slice(weights, group_index)
             vg_dict: dict = {
-                "name": vertex_group.name,
-                "data": None
+                "name": name,
+                "data": [{"index": i, "weight": w} for i, w in zip(indices.tolist(), values.tolist())]
             }
-            vg_data: list = []
-            for vertex in obj.data.vertices:
-                try:
-                    i = vertex.index
-                    weight = vertex_group.weight(i)
-                    vg_data.append({
-                        "index": i,
-                        "weight": weight
-                    })
-                except RuntimeError:
-                    continue
-            vg_dict["data"] = vg_data
             result["vertex_groups"].append(vg_dict)
         return result
+
+
+def _pad(size: int) -> bytes:
+    return b"\x00" * (-size % _OBW_ALIGNMENT)
+
+
+def write_vertex_group_binary(file, info: dict, weights: VertexGroupWeights, half: bool = False,
+                              compress: bool = False, positions: np.ndarray | None = None) -> None:
+    """VertexGroup 웨이트를 OBW 바이너리 포맷으로 파일에 쓴다.
+
+    info에는 object_name, object_type, data_name, vertex_count가 담겨 있어야 한다.
+    half가 True이면 웨이트를 float16으로 저장하고, compress가 True이면 Header 이후를 zlib으로 압축한다.
+    positions가 주어지면 위치 기반 로드를 위해 버텍스 좌표를 함께 저장한다.
+    """
+    weight_dtype: str = "<f2" if half else "<f4"
+    flags: int = (OBW_FLAG_HALF if half else 0) | (OBW_FLAG_ZLIB if compress else 0) \
+        | (OBW_FLAG_POSITIONS if positions is not None else 0)
+    file.write(_OBW_HEADER.pack(OBW_MAGIC, OBW_VERSION, flags,
+                                info["vertex_count"], len(weights.names), len(weights.indices)))
+
+    # 정렬 위치는 Header를 포함한 파일의 시작을 기준으로 계산한다.
+    body = io.BytesIO() if compress else file
+    position: int = _OBW_HEADER.size
+    chunks: list[bytes] = []
+    for string in [info["object_name"], info["object_type"], info["data_name"], *weights.names]:
+        encoded: bytes = string.encode("utf-8")
+        chunks.append(_OBW_STRING_LENGTH.pack(len(encoded)))
+        chunks.append(encoded)
+    position += sum(len(chunk) for chunk in chunks)
+    chunks.append(_pad(position))
+    body.write(b"".join(chunks))
+
+    arrays: list[np.ndarray] = [np.asarray(weights.offsets, dtype="<u8"),
+                                np.asarray(weights.indices, dtype="<u4"),
+                                np.asarray(weights.weights, dtype=weight_dtype)]
+    if positions is not None:
+        assert (len(positions) == info["vertex_count"])
+        arrays.append(np.asarray(positions, dtype="<f4"))
+    for array in arrays:
+        data: bytes = array.tobytes()
+        body.write(data)
+        body.write(_pad(len(data)))
+
+    if compress:
+        file.write(zlib.compress(body.getbuffer()))
+
+
+def read_vertex_group_binary(buffer) -> tuple[dict, VertexGroupWeights]:
+    """OBW 바이너리 버퍼(bytes, mmap 등)를 읽어 (info, VertexGroupWeights)를 리턴한다.
+    버텍스 좌표가 저장되어 있으면 info["vertex_positions"]에 (N, 3) 배열로 담기고, 없으면 None이다.
+
+    배열들은 numpy.frombuffer로 만들어지므로 압축되지 않은 파일은 버퍼를 복사하지 않는다.
+    """
+    magic, version, flags, vertex_count, group_count, entry_count = _OBW_HEADER.unpack_from(buffer, 0)
+    if magic != OBW_MAGIC:
+        raise Exception(f"Invalid OBW file (magic: {magic})")
+    if version > OBW_VERSION:
+        raise Exception(f"Unsupported OBW version ({version})")
+    if flags & OBW_FLAG_ZLIB:
+        buffer = bytes(buffer[:_OBW_HEADER.size]) + zlib.decompress(buffer[_OBW_HEADER.size:])
+
+    position: int = _OBW_HEADER.size
+    strings: list[str] = []
+    for _ in range(3 + group_count):
+        (length,) = _OBW_STRING_LENGTH.unpack_from(buffer, position)
+        position += _OBW_STRING_LENGTH.size
+        strings.append(bytes(buffer[position:position + length]).decode("utf-8"))
+        position += length
+    position += -position % _OBW_ALIGNMENT
+
+    arrays: list[np.ndarray] = []
+    weight_dtype: str = "<f2" if flags & OBW_FLAG_HALF else "<f4"
+    for dtype, count in (("<u8", group_count + 1), ("<u4", entry_count), (weight_dtype, entry_count)):
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=position)
+        arrays.append(array)
+        position += array.nbytes
+        position += -position % _OBW_ALIGNMENT
+
+    positions: np.ndarray | None = None
+    if flags & OBW_FLAG_POSITIONS:
+        positions = np.frombuffer(buffer, dtype="<f4", count=vertex_count * 3, offset=position).reshape(-1, 3)
+
+    info: dict = {
+        "object_name": strings[0],
+        "object_type": strings[1],
+        "data_name": strings[2],
+        "vertex_count": vertex_count,
+        "vertex_positions": positions,
+    }
+    return info, VertexGroupWeights(strings[3:], *arrays)
+
+
+def write_vertex_group_json(file, info: dict, weights: VertexGroupWeights | None,
+                            positions: np.ndarray | None = None) -> None:
+    """VertexGroup 웨이트를 그룹 단위로 json 파일에 스트리밍하여 쓴다.
+
+    한 번에 한 그룹의 json 문자열만 만들기 때문에 메모리 사용량은 가장 큰 그룹의 크기로 제한된다.
+    positions가 없으면 결과는 ObjectVertexGroupEncoder로 json.dump(indent=4) 했을 때와 바이트 단위로 동일하다.
+    positions가 주어지면 vertex_groups 앞에 vertex_positions 항목으로 버텍스 좌표를 쓴다.
+    weights가 None이면 (MeshObject가 아닌 경우) vertex_groups 항목을 쓰지 않는다.
+    """
+    keys: list[str] = ["object_name", "object_type", "data_name"]
+    file.write("{\n")
+    for key in keys:
+        separator: str = "," if key != keys[-1] or weights is not None else ""
+        file.write(f"{_JSON_INDENT}{json.dumps(key)}: {json.dumps(info[key], ensure_ascii=False)}{separator}\n")
+
+    if weights is not None and positions is not None:
+        # 읽는 쪽에서 그룹을 적용하기 전에 좌표가 필요하므로 vertex_groups보다 먼저 쓴다.
+        file.write(f'{_JSON_INDENT}"vertex_positions": [')
+        for i, co in enumerate(np.asarray(positions, dtype=np.float32).tolist()):
+            file.write(f"{',' if i > 0 else ''}\n{_JSON_INDENT * 2}{json.dumps(co)}")
+        file.write(f"\n{_JSON_INDENT}],\n" if len(positions) > 0 else "],\n")
+
+    if weights is not None:
+        file.write(f'{_JSON_INDENT}"vertex_groups": [')
+        for group_index, name in enumerate(weights.names):
+            indices, values = get_group_slice(weights, group_index)
+            vg_dict: dict = {
+                "name": name,
+                "data": [{"index": i, "weight": w} for i, w in zip(indices.tolist(), values.tolist())]
+            }
+            file.write(",\n" if group_index > 0 else "\n")
+            file.write(textwrap.indent(json.dumps(vg_dict, ensure_ascii=False, indent=4), _JSON_INDENT * 2))
+        file.write(f"\n{_JSON_INDENT}]\n" if len(weights.names) > 0 else "]\n")
+    file.write("}")
+
+
+class _JsonStreamReader:
+    """파일을 조금씩 읽으면서 json 값을 하나씩 디코딩하는 리더.
+    """
+
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size: int = chunk_size
+        self.buffer: str = ""
+        self.position: int = 0
+        self.eof: bool = False
+        self.decoder = JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        chunk: str = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛰고 다음 문자를 리턴한다. 파일의 끝이면 빈 문자열을 리턴한다.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer) or not self._fill(self.chunk_size):
+                return self.buffer[self.position:self.position + 1]
+
+    def expect(self, chars: str) -> str:
+        char: str = self.peek()
+        if char == "" or char not in chars:
+            raise JSONDecodeError(f"Expecting one of {chars!r}", self.buffer, self.position)
+        self.position += 1
+        return char
+
+    def decode(self):
+        """다음 json 값 하나를 디코딩한다.
+
+        값이 버퍼에서 잘려 있으면 읽는 크기를 두 배씩 늘려가며 다시 시도하므로 전체 비용은 값의 크기에 비례한다.
+        """
+        self.peek()
+        size: int = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # 숫자처럼 버퍼 끝에서 끝난 값은 뒤가 잘렸을 수 있으므로 더 읽어서 확인한다.
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except JSONDecodeError:
+                if self.eof:
+                    raise
+            size = max(size, len(self.buffer) - self.position)
+            self._fill(size)
+
+
+def iter_vertex_group_json(file, chunk_size: int = 1 << 20, header: dict | None = None):
+    """json 웨이트 파일을 조금씩 읽으면서 VertexGroup을 (이름, 인덱스 리스트, 웨이트 리스트)로 하나씩 리턴한다.
+
+    메모리에는 한 번에 한 그룹만 올라가므로 파일 전체를 json.load 할 필요가 없다.
+    header가 주어지면 vertex_groups 이외의 최상위 항목들(object_name, vertex_positions 등)을 읽는 대로 담는다.
+    """
+    reader = _JsonStreamReader(file, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.decode()
+        reader.expect(":")
+        if key == "vertex_groups":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    vg_data: dict = reader.decode()
+                    indices = [vtx_data["index"] for vtx_data in vg_data["data"]]
+                    weights = [vtx_data["weight"] for vtx_data in vg_data["data"]]
+                    yield vg_data["name"], indices, weights
+                    if reader.expect(",]") == "]":
+                        break
+        elif header is not None:
+            header[key] = reader.decode()
+        else:
+            reader.decode()
+        if reader.expect(",}") == "}":
+            break
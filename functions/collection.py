@@ -1,7 +1,10 @@
 import bpy
+import numpy as np
 from bpy.types import Collection, LayerCollection
 from mathutils import Vector
 
+from .mesh import get_vertex_positions
+
 
 def create_collection(name: str) -> Collection:
     """컬렉션을 생성한다.
@@ -63,18 +66,41 @@ def set_active_layer_collection(name: str):
     bpy.context.view_layer.active_layer_collection = layer_collection
 
 
-def get_collection_bound_box(name:str) -> tuple[Vector, Vector]:
+def _get_empty_bound_box() -> tuple[Vector, Vector]:
+    return (Vector((float("inf"), float("inf"), float("inf"))),
+            Vector((-float("inf"), -float("inf"), -float("inf"))))
+
+
+def get_collection_bound_box(name:str, tight: bool = False) -> tuple[Vector, Vector]:
+    """컬렉션에 있는 MeshObject들의 월드 좌표 바운딩 박스 (최소, 최대) 좌표를 리턴한다.
+
+    기본은 오브젝트마다 bound_box 8개 꼭지점과 matrix_world를 배열로 쌓아 한 번에 변환하고 최소/최대를 구한다.
+    tight가 True이면 모디파이어가 적용된(evaluated) 메시의 버텍스 좌표를 foreach_get으로 읽어 더 정확한 박스를 구한다.
+    MeshObject가 없으면 (inf, -inf) 좌표를 리턴한다.
+    """
     collection = bpy.data.collections.get(name)
     if not collection:
         raise Exception(f"Not found Collection {name}")
 
-    min_coord = Vector((float("inf"), float("inf"), float("inf")))
-    max_coord = Vector((-float("inf"), -float("inf"), -float("inf")))
-
-    for obj in collection.objects:
-        if obj.type == "MESH":
-            world_vertices = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-            for vert in world_vertices:
-                min_coord = Vector((min(min_coord.x, vert.x), min(min_coord.y, vert.y), min(min_coord.z, vert.z)))
-                max_coord = Vector((max(max_coord.x, vert.x), max(max_coord.y, vert.y), max(max_coord.z, vert.z)))
-    return (min_coord, max_coord)
+    mesh_objects = [obj for obj in collection.objects if obj.type == "MESH"]
+    if len(mesh_objects) == 0:
+        return _get_empty_bound_box()
+
+    if tight:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        minimums: list[np.ndarray] = []
+        maximums: list[np.ndarray] = []
+        for obj in mesh_objects:
+            positions = get_vertex_positions(obj.evaluated_get(depsgraph))
+            if len(positions) > 0:
+                minimums.append(positions.min(axis=0))
+                maximums.append(positions.max(axis=0))
+        if len(minimums) == 0:
+            return _get_empty_bound_box()
+        return (Vector(np.min(minimums, axis=0).tolist()), Vector(np.max(maximums, axis=0).tolist()))
+
+    corners = np.array([obj.bound_box for obj in mesh_objects], dtype=np.float64)  # (N, 8, 3)
+    matrices = np.array([obj.matrix_world for obj in mesh_objects], dtype=np.float64)  # (N, 4, 4)
+    world_corners = np.einsum("nij,nkj->nki", matrices[:, :3, :3], corners) + matrices[:, np.newaxis, :3, 3]
+    world_corners = world_corners.reshape(-1, 3)
+    return (Vector(world_corners.min(axis=0).tolist()), Vector(world_corners.max(axis=0).tolist()))
@@ -1,6 +1,7 @@
 import random
 
 import bpy
+import numpy as np
 from bpy.types import Object, Material, Image, ShaderNodeTree, ShaderNode
 
 
@@ -185,6 +186,16 @@ def export_image(image: Image, filepath: str, file_format: str = "PNG") -> None:
     image.save_render(filepath)
 
 
+def get_image_pixels(image: Image) -> np.ndarray:
+    """이미지 픽셀을 foreach_get으로 한 번에 읽어 (height, width, channels) float32 배열로 리턴한다.
+    블렌더 이미지는 아래쪽 줄부터 저장되어 있으므로 첫 번째 줄이 이미지의 아래쪽이다.
+    """
+    width, height = image.size
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, image.channels)
+
+
 def file_format_to_ext(file_format: str) -> str:
     """이미지 파일포맷 Enum을 파일 확장자로 변환해준다.
     예) JPEG => jpg
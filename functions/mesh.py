@@ -1,7 +1,11 @@
+import hashlib
+
 import bmesh
 import bpy
+import numpy as np
 from bmesh.types import BMesh, BMVert, BMEdge, BMFace
-from bpy.types import Object
+from bpy.types import Object, Mesh
+from mathutils import Matrix
 
 from .context import is_object_mode
 
@@ -36,3 +40,121 @@ def remove_vertex_group(mesh_object: Object, vertex_group_name: str):
     vg = vgs.get(vertex_group_name)
     if vg:
         vgs.remove(vg)
+
+
+def get_vertex_positions(mesh_object: Object, world_space: bool = True) -> np.ndarray:
+    """MeshObject의 버텍스 좌표들을 foreach_get으로 한 번에 읽어 (N, 3) float32 배열로 리턴한다.
+    """
+    vertices = mesh_object.data.vertices
+    positions = np.empty(len(vertices) * 3, dtype=np.float32)
+    vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3)
+    if world_space:
+        matrix = np.array(mesh_object.matrix_world, dtype=np.float32)
+        positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+    return positions
+
+
+def get_evaluated_vertex_positions(mesh_object: Object, depsgraph, world_space: bool = True) -> np.ndarray:
+    """모디파이어(Mirror, Solidify, Array 등)가 적용된 평가 메시의 버텍스 좌표들을 (N, 3) float32 배열로 리턴한다.
+    """
+    obj = mesh_object.evaluated_get(depsgraph)
+    mesh = obj.to_mesh()
+    try:
+        positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", positions)
+    finally:
+        obj.to_mesh_clear()
+    positions = positions.reshape(-1, 3)
+    if world_space:
+        matrix = np.array(mesh_object.matrix_world, dtype=np.float32)
+        positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+    return positions
+
+
+def write_ply(mesh: Mesh, filepath: str, matrix: Matrix | None = None):
+    """주어진 메시(snow에서는 모디파이어가 적용된 평가 메시)의 버텍스 좌표와 면을 바이너리(little endian) PLY로 바로 쓴다.
+    foreach_get으로 읽은 버퍼를 그대로 기록하므로 익스포트용 오브젝트를 만들거나 익스포터 오퍼레이터를 거치지 않는다.
+    면은 삼각형으로 나누지 않고 메시의 면 그대로 쓴다.
+    matrix가 주어지면 좌표를 변환해서 쓴다. 축 변환은 하지 않는다(Z-up).
+    """
+    vertex_count: int = len(mesh.vertices)
+    positions = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3)
+    if matrix is not None:
+        matrix = np.array(matrix, dtype=np.float32)
+        positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+
+    face_count: int = len(mesh.polygons)
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    if face_count > 0 and loop_totals.max() > 255:
+        raise Exception(f"Faces with more than 255 vertices cannot be written to PLY ({mesh.name})")
+
+    # 면마다 [uchar 개수][int32 인덱스 * 개수]인 가변 길이 레코드를 한 버퍼에 채운다.
+    # 루프는 면 순서대로 연속해 있으므로 각 루프의 면 안 순번으로 기록 위치를 계산한다.
+    record_sizes = 1 + 4 * loop_totals.astype(np.int64)
+    record_offsets = np.zeros(face_count, dtype=np.int64)
+    np.cumsum(record_sizes[:-1], out=record_offsets[1:])
+    face_buffer = np.empty(int(record_sizes.sum()), dtype=np.uint8)
+    face_buffer[record_offsets] = loop_totals
+    loop_starts = np.repeat(record_offsets - 4 * np.cumsum(np.concatenate(([0], loop_totals[:-1]))), loop_totals)
+    loop_offsets = loop_starts + 1 + 4 * np.arange(len(loop_vertices), dtype=np.int64)
+    face_buffer[loop_offsets[:, None] + np.arange(4)] = loop_vertices.astype("<i4").view(np.uint8).reshape(-1, 4)
+
+    header: str = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        f"element vertex {vertex_count}\n"
+        "property float x\n"
+        "property float y\n"
+        "property float z\n"
+        f"element face {face_count}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    )
+    with open(filepath, "wb") as file:
+        file.write(header.encode("ascii"))
+        file.write(positions.astype("<f4").tobytes())
+        file.write(face_buffer.tobytes())
+
+
+def get_mesh_hash(mesh_object: Object, depsgraph=None) -> str:
+    """MeshObject의 버텍스 좌표, 루프 버텍스 인덱스, 면 크기, 면 스무스 여부, 코너 노멀, 활성 UV, 월드 행렬을
+    foreach_get으로 읽어 SHA-256 해시를 리턴한다. 코너 노멀로 샤프 엣지, 오토 스무스, 커스텀 노멀의 변경도 반영된다.
+    depsgraph가 주어지면 모디파이어가 적용된 평가 결과로 계산한다.
+    """
+    obj = mesh_object.evaluated_get(depsgraph) if depsgraph else mesh_object
+    mesh = obj.to_mesh()
+    try:
+        buffers: list[np.ndarray] = []
+        for collection, attribute, size, dtype in (
+                (mesh.vertices, "co", 3, np.float32),
+                (mesh.loops, "vertex_index", 1, np.int32),
+                (mesh.polygons, "loop_total", 1, np.int32),
+                (mesh.polygons, "use_smooth", 1, np.bool_),
+                # Blender 4.1부터 코너 노멀은 mesh.corner_normals에 있다. 그 이전에는 루프의 normal로 읽는다.
+                (mesh.corner_normals, "vector", 3, np.float32) if hasattr(mesh, "corner_normals") else
+                (mesh.loops, "normal", 3, np.float32),
+        ):
+            buffer = np.empty(len(collection) * size, dtype=dtype)
+            collection.foreach_get(attribute, buffer)
+            buffers.append(buffer)
+        uv_layer = mesh.uv_layers.active
+        if uv_layer:
+            uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            uv_layer.data.foreach_get("uv", uvs)
+            buffers.append(uvs)
+        buffers.append(np.array(mesh_object.matrix_world, dtype=np.float32))
+    finally:
+        obj.to_mesh_clear()
+
+    digest = hashlib.sha256()
+    for buffer in buffers:
+        # 버퍼 경계가 섞이지 않게 길이도 함께 넣는다.
+        digest.update(len(buffer).to_bytes(8, "little"))
+        digest.update(buffer.tobytes())
+    return digest.hexdigest()
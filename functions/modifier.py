@@ -1,4 +1,5 @@
 import bpy
+import numpy as np
 from bpy.types import Object, Modifier, LatticeModifier
 
 
@@ -30,6 +31,76 @@ def remove_modifier(obj: Object, modifier_name: str) -> bool:
         return False
 
 
+def apply_modifier_batch(objects: list[Object], modifier_name: str) -> list[Object]:
+    """여러 MeshObject의 특정 모디파이어를 오퍼레이터 호출 없이 한 번에 적용apply 시킨다.
+
+    대상 모디파이어만 켠 상태로 depsgraph를 한 번 평가한 뒤, 평가된 메시의 버텍스 좌표를 foreach_get/foreach_set으로
+    원본 메시에 기록하고 모디파이어를 제거한다. Lattice처럼 토폴로지를 바꾸지 않는 변형 모디파이어에만 사용할 수 있다.
+    ShapeKey가 있거나 여러 오브젝트가 공유하는 메시, 뷰레이어에 없는 오브젝트, 뷰포트에서 꺼진 모디파이어,
+    버텍스 수가 바뀌는 경우는 건드리지 않고 리턴 목록에 담는다. 이들은 apply_modifier()로 처리해야 한다.
+    """
+    view_layer_objects = bpy.context.view_layer.objects
+    targets: list[tuple[Object, Modifier]] = []
+    skipped: list[Object] = []
+    for obj in objects:
+        modifier = obj.modifiers.get(modifier_name)
+        if modifier is None:
+            continue
+        if obj.type != "MESH" or obj.data.shape_keys or obj.data.users > 1 or obj.name not in view_layer_objects:
+            skipped.append(obj)
+            continue
+        # modifier_apply도 꺼진 모디파이어는 적용하지 않으므로, 여기서 강제로 켜서 적용하지 않는다.
+        if not modifier.show_viewport:
+            skipped.append(obj)
+            continue
+        targets.append((obj, modifier))
+    if len(targets) == 0:
+        return skipped
+
+    # 대상 모디파이어만 켜서 modifier_apply와 같이 원본 메시에 해당 모디파이어 하나만 적용된 결과를 얻는다.
+    saved_states: list[tuple[Modifier, bool]] = []
+    for obj, modifier in targets:
+        for other in obj.modifiers:
+            saved_states.append((other, other.show_viewport))
+            other.show_viewport = other == modifier
+
+    results: list[tuple[Object, Modifier, np.ndarray]] = []
+    try:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for obj, modifier in targets:
+            obj_eval = obj.evaluated_get(depsgraph)
+            mesh_eval = obj_eval.to_mesh()
+            count: int = len(mesh_eval.vertices)
+            if count != len(obj.data.vertices):
+                skipped.append(obj)
+            else:
+                positions = np.empty(count * 3, dtype=np.float32)
+                mesh_eval.vertices.foreach_get("co", positions)
+                results.append((obj, modifier, positions))
+            obj_eval.to_mesh_clear()
+    finally:
+        for modifier, show_viewport in saved_states:
+            modifier.show_viewport = show_viewport
+
+    for obj, modifier, positions in results:
+        obj.data.vertices.foreach_set("co", positions)
+        obj.data.update()
+        obj.modifiers.remove(modifier)
+    return skipped
+
+
+def remove_modifier_batch(objects: list[Object], modifier_name: str) -> int:
+    """여러 오브젝트의 특정 모디파이어를 오퍼레이터 호출 없이 제거remove 한다. 제거한 수를 리턴한다.
+    """
+    count: int = 0
+    for obj in objects:
+        modifier = obj.modifiers.get(modifier_name)
+        if modifier:
+            obj.modifiers.remove(modifier)
+            count += 1
+    return count
+
+
 def has_modifier(obj: Object, modifier_name: str) -> bool:
     return True if modifier_name in obj.modifiers else False
 
@@ -1,7 +1,16 @@
+import glob
+import hashlib
 import json
 import os
+import re
+import time
+from collections import namedtuple
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import bpy
+import numpy as np
+from bpy.app.handlers import persistent
 from bpy.types import (
     Object, Mesh,
     Armature, ArmatureModifier,
@@ -9,9 +18,35 @@ from bpy.types import (
     ShapeKey
 )
 
-from ..encoders.rigging import ObjectVertexGroupEncoder
+from ..encoders.rigging import (
+    write_vertex_group_json, iter_vertex_group_json,
+    write_vertex_group_binary, read_vertex_group_binary,
+)
+from .mesh import get_vertex_positions
+from .vertex_group import (
+    VertexGroupWeights, VertexGroupSummary,
+    get_vertex_group_stats,
+    get_vertex_group_weights, get_group_slice, build_vertex_group_weights,
+    add_vertex_group_weights,
+    transfer_vertex_group_weights,
+    get_vertex_group_assignments, limit_normalize_assignments,
+)
 from ..utils.file import makedir
 
+WEIGHT_BINARY_EXT: str = ".obw"
+WEIGHT_JSON_EXT: str = ".json"
+VertexGroupLoadStats = namedtuple("VertexGroupLoadStats", "group_count entry_count add_calls elapsed")
+VertexGroupFileStats = namedtuple("VertexGroupFileStats", "object_name path size elapsed")
+VertexGroupSnapshotStats = namedtuple("VertexGroupSnapshotStats", "manifest_path written reused elapsed")
+VertexGroupCleanStats = namedtuple("VertexGroupCleanStats", "changed_vertex_count removed_entry_count elapsed")
+SNAPSHOT_MANIFEST_EXT: str = ".snapshot.json"
+SNAPSHOT_BLOB_DIRNAME: str = "blobs"
+SNAPSHOT_TIMESTAMP_PATTERN: str = r"\d{8}-\d{6}-\d{6}"  # save_vertex_group_snapshot()의 "%Y%m%d-%H%M%S-%f"
+
+# Armature 오브젝트 이름 <-> Armature 모디파이어로 연결된 MeshObject 이름 역색인.
+# ID 참조는 Undo/파일 로드 후 무효해질 수 있으므로 이름만 보관하고, depsgraph 갱신 시 무효화하여 다음 조회 때 다시 만든다.
+_armature_index: dict | None = None
+
 
 def get_armature_modifier(obj: Object) -> ArmatureModifier | None:
     for modifier in obj.modifiers:
@@ -30,6 +65,7 @@ def has_armature_modifier(obj: Object) -> bool:
 def create_armature_modifier(obj: Object, modifier_name: str, armature: Armature = None) -> ArmatureModifier:
     modifier: ArmatureModifier = obj.modifiers.new(name=modifier_name, type="ARMATURE")
     modifier.object = armature
+    invalidate_armature_index()
     return modifier
 
 
@@ -39,9 +75,126 @@ def remove_armature_modifiers(obj: Object) -> int:
         if modifier.type == "ARMATURE":
             obj.modifiers.remove(modifier)
             count += 1
+    if count > 0:
+        invalidate_armature_index()
     return count
 
 
+def _build_armature_index() -> dict:
+    """모든 오브젝트를 한 번 순회하여 Armature <-> MeshObject 역색인을 만든다.
+    """
+    armature_names: list[str] = []
+    mesh_to_armature: dict[str, str] = {}
+    armature_to_meshes: dict[str, list[str]] = {}
+    for obj in bpy.data.objects:
+        if obj.type == "ARMATURE":
+            armature_names.append(obj.name)
+        elif obj.type == "MESH":
+            modifier = get_armature_modifier(obj)
+            if modifier and modifier.object:
+                mesh_to_armature[obj.name] = modifier.object.name
+                armature_to_meshes.setdefault(modifier.object.name, []).append(obj.name)
+    return {
+        "armatures": armature_names,
+        "mesh_to_armature": mesh_to_armature,
+        "armature_to_meshes": armature_to_meshes,
+        "object_count": len(bpy.data.objects),
+    }
+
+
+def get_armature_index() -> dict:
+    """Armature 역색인을 리턴한다. 무효화된 상태이면 다시 만든다.
+    """
+    global _armature_index
+    if _armature_index is None:
+        _armature_index = _build_armature_index()
+    return _armature_index
+
+
+def invalidate_armature_index() -> None:
+    global _armature_index
+    _armature_index = None
+
+
+def _get_objects_by_names(names) -> list[Object]:
+    objects = bpy.data.objects
+    return [obj for obj in (objects.get(name) for name in names) if obj is not None]
+
+
+def get_armature_objects() -> list[Object]:
+    """씬 파일의 모든 Armature 오브젝트를 리턴한다.
+    """
+    return _get_objects_by_names(get_armature_index()["armatures"])
+
+
+def get_armature_users(armature_object: Object) -> list[Object]:
+    """Armature 모디파이어로 해당 Armature 오브젝트를 사용하는 MeshObject들을 리턴한다.
+    """
+    return _get_objects_by_names(get_armature_index()["armature_to_meshes"].get(armature_object.name, []))
+
+
+def get_mesh_armature(obj: Object) -> Object | None:
+    """MeshObject의 Armature 모디파이어에 지정된 Armature 오브젝트를 리턴한다. 없으면 None을 리턴한다.
+    """
+    name: str | None = get_armature_index()["mesh_to_armature"].get(obj.name)
+    return bpy.data.objects.get(name) if name else None
+
+
+def _is_armature_index_stale(index: dict, obj: Object) -> bool:
+    """갱신된 오브젝트가 역색인과 다른가? (이름 변경, Armature 모디파이어 추가/삭제/대상 변경)
+    """
+    if obj.type == "ARMATURE":
+        return obj.name not in index["armatures"]
+    if obj.type == "MESH":
+        modifier = get_armature_modifier(obj)
+        armature_name: str | None = modifier.object.name if modifier and modifier.object else None
+        return index["mesh_to_armature"].get(obj.name) != armature_name
+    return False
+
+
+@persistent
+def _on_armature_index_depsgraph_update(scene, depsgraph):
+    if _armature_index is None:
+        return
+    # 오브젝트가 추가/삭제되었으면 다시 만든다.
+    if _armature_index["object_count"] != len(bpy.data.objects):
+        invalidate_armature_index()
+        return
+    # 오브젝트 이동만 있는 갱신(트랜스폼 편집, 애니메이션 재생)과 오브젝트가 아닌 ID(메쉬 데이터, 씬, 머티리얼 등)의
+    # 갱신은 역색인과 무관하므로 무시하고, 이름이나 Armature 모디파이어가 바뀐 오브젝트가 있을 때만 무효화한다.
+    for update in depsgraph.updates:
+        if not isinstance(update.id, Object) or (update.is_updated_transform and not update.is_updated_geometry):
+            continue
+        if _is_armature_index_stale(_armature_index, update.id.original):
+            invalidate_armature_index()
+            return
+
+
+@persistent
+def _on_armature_index_reset(*args):
+    invalidate_armature_index()
+
+
+def register_armature_index_handlers() -> None:
+    handlers = bpy.app.handlers
+    if _on_armature_index_depsgraph_update not in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.append(_on_armature_index_depsgraph_update)
+    for handler_list in (handlers.load_post, handlers.undo_post, handlers.redo_post):
+        if _on_armature_index_reset not in handler_list:
+            handler_list.append(_on_armature_index_reset)
+    invalidate_armature_index()
+
+
+def unregister_armature_index_handlers() -> None:
+    handlers = bpy.app.handlers
+    if _on_armature_index_depsgraph_update in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.remove(_on_armature_index_depsgraph_update)
+    for handler_list in (handlers.load_post, handlers.undo_post, handlers.redo_post):
+        if _on_armature_index_reset in handler_list:
+            handler_list.remove(_on_armature_index_reset)
+    invalidate_armature_index()
+
+
 def has_vertex_groups(obj: Object) -> bool:
     return True if len(obj.vertex_groups) > 0 else False
 
@@ -120,58 +273,519 @@ def attach_rigmesh(obj: Object, modifier_name: str, armature: Armature) -> None:
     obj.parent = armature
 
 
-def print_vertex_groups(obj: Object):
+def format_vertex_group_stats(summary: VertexGroupSummary, verbose: bool = False) -> list[str]:
+    """VertexGroup 통계를 콘솔 출력용 문자열 줄들로 만든다.
+    verbose가 True이면 예전처럼 그룹마다 버텍스별 웨이트도 한 줄씩 포함한다.
+    """
+    lines: list[str] = [
+        f"{summary.object_name} (MeshObject, vertices: {summary.vertex_count}, "
+        f"assigned: {summary.assigned_vertex_count}, unnormalized: {summary.unnormalized_vertex_count}, "
+        f"max influences: {summary.max_influences})"
+    ]
+    for group_index, stats in enumerate(summary.groups):
+        histogram: str = " ".join(str(count) for count in stats.histogram.tolist())
+        lines.append(f"\t{stats.name} (VertexGroup, count: {stats.count}, min: {stats.min:.4f}, "
+                     f"max: {stats.max:.4f}, mean: {stats.mean:.4f}, histogram: [{histogram}])")
+        if verbose:
+            indices, weights = get_group_slice(summary.weights, group_index)
+            for index, weight in zip(indices.tolist(), weights.tolist()):
+                lines.append(f"\t\tVertex {index} (weight: {weight})")
+    return lines
+
+
+def print_vertex_groups(obj: Object, verbose: bool = False, bins: int = 10):
+    """MeshObject의 VertexGroup 통계를 콘솔에 출력한다.
+    verbose가 True이면 버텍스별 웨이트도 출력한다.
+    """
     if obj.type != "MESH":
         return
-    print(f"{obj.name} (MeshObject)")
-    for vertex_group in obj.vertex_groups:
-        print(f"\t{vertex_group.name} (VertexGroup)")
-        for vertex in obj.data.vertices:
-            try:
-                weight = vertex_group.weight(vertex.index)
-                print(f"\t\tVertex {vertex.index} (weight: {weight})")
-            except RuntimeError:
-                continue
+    print("\n".join(format_vertex_group_stats(get_vertex_group_stats(obj, bins=bins), verbose=verbose)))
 
 
 def clear_vertex_groups(obj: Object):
     obj.vertex_groups.clear()
 
 
-def save_object_vertex_groups(obj: Object, path: str = None) -> bool:
-    """주어진 MeshObject의 VertexGroup들을 json 파일로 저장한다.
+def is_binary_weight_path(path: str) -> bool:
+    """파일 확장자로 웨이트 파일이 OBW 바이너리 포맷인지 판단한다.
+    """
+    return os.path.splitext(path)[1].lower() == WEIGHT_BINARY_EXT
+
+
+def _get_vertex_group_info(obj: Object) -> dict:
+    return {
+        "object_name": obj.name,
+        "object_type": obj.type,
+        "data_name": obj.data.name,
+        "vertex_count": len(obj.data.vertices) if obj.type == "MESH" else 0,
+    }
+
+
+def _write_vertex_group_file(path: str, info: dict, weights: VertexGroupWeights | None,
+                             half: bool = False, compress: bool = False,
+                             positions: np.ndarray | None = None) -> None:
+    """웨이트 스냅샷을 파일로 쓴다. bpy에 접근하지 않으므로 다른 스레드에서 실행해도 된다.
+    """
+    makedir(path)  # 디렉토리가 없으면 파일이 생성되지 않으므로 미리 준비해둔다.
+    if is_binary_weight_path(path):
+        if weights is None:
+            weights = VertexGroupWeights([], np.zeros(1, dtype=np.uint64),
+                                         np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.float32))
+        with open(path, "wb") as file:
+            write_vertex_group_binary(file, info, weights, half=half, compress=compress, positions=positions)
+    else:
+        with open(path, "w", encoding="utf-8") as file:
+            write_vertex_group_json(file, info, weights, positions=positions)
+
+
+def save_object_vertex_groups(obj: Object, path: str = None, half: bool = False,
+                              include_positions: bool = False) -> bool:
+    """주어진 MeshObject의 VertexGroup들을 파일로 저장한다.
+
+    확장자가 .obw이면 OBW 바이너리 포맷으로, 그 외에는 json으로 저장한다.
+    json은 그룹 단위로 스트리밍하여 쓰므로 전체 데이터를 Dictionary로 만들지 않는다.
+    half는 OBW 포맷에서 웨이트를 float16으로 저장할지 여부이다.
+    include_positions가 True이면 위치 기반 로드를 위해 월드 좌표계의 버텍스 좌표를 함께 저장한다.
     """
     if obj is None:
         return False
     try:
-        makedir(path)  # 디렉토리가 없으면 파일이 생성되지 않으므로 미리 준비해둔다.
-        with open(path, "w", encoding="utf-8") as file:
-            json.dump(obj, file, cls=ObjectVertexGroupEncoder, ensure_ascii=False, sort_keys=False, indent=4)
+        weights = get_vertex_group_weights(obj) if obj.type == "MESH" else None
+        positions = get_vertex_positions(obj) if include_positions and obj.type == "MESH" else None
+        _write_vertex_group_file(path, _get_vertex_group_info(obj), weights, half=half, positions=positions)
     except:
         return False
     return True
 
 
-def load_object_vertex_groups(path: str, obj: Object) -> bool:
-    """VertexGroup들을 저장한 json파일로 주어진 MeshObject의 VertexGroup들을 생성한다. (로드한다)
+def _read_json_vertex_groups(path: str, header: dict | None = None):
+    """json 웨이트 파일을 조금씩 읽으면서 VertexGroup들을 (이름, 인덱스 리스트, 웨이트 리스트)로 하나씩 리턴한다.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        yield from iter_vertex_group_json(file, header=header)
+
+
+def _check_json_vertex_groups(path: str) -> int:
+    """json 웨이트 파일을 끝까지 한 번 읽어서 깨진 곳이 없는지 확인한다. 읽은 그룹은 보관하지 않는다.
+    그룹 수를 리턴하고, 파일이 올바르지 않으면 예외를 발생시킨다.
+    """
+    count: int = 0
+    for name, indices, weights in _read_json_vertex_groups(path):
+        if len(indices) != len(weights):
+            raise Exception(f"Index and weight counts differ ({name}, {path})")
+        count += 1
+    return count
+
+
+def _read_binary_vertex_group_weights(path: str, header: dict | None = None) -> VertexGroupWeights:
+    """OBW 웨이트 파일 전체를 읽어 VertexGroupWeights로 리턴한다.
     """
+    with open(path, "rb") as file:
+        info, weights = read_vertex_group_binary(file.read())
+    if header is not None:
+        header.update(info)
+    return weights
+
+
+def _read_binary_vertex_groups(path: str, header: dict | None = None):
+    """OBW 웨이트 파일의 VertexGroup들을 (이름, 인덱스 배열, 웨이트 배열)로 하나씩 리턴한다.
+    """
+    yield from _iter_vertex_group_weights(_read_binary_vertex_group_weights(path, header))
+
+
+def _read_vertex_groups(path: str, header: dict | None = None):
+    if is_binary_weight_path(path):
+        return _read_binary_vertex_groups(path, header)
+    return _read_json_vertex_groups(path, header)
+
+
+def _transfer_vertex_groups_by_position(path: str, obj: Object, neighbors: int = 1) -> VertexGroupWeights:
+    """저장된 버텍스 좌표와 MeshObject의 버텍스 좌표를 비교하여 위치 기준으로 옮긴 웨이트를 리턴한다.
+    파일에 버텍스 좌표가 없으면 예외를 발생시킨다.
+    """
+    header: dict = {}
+    source: VertexGroupWeights = build_vertex_group_weights(_read_vertex_groups(path, header))
+    source_positions = header.get("vertex_positions")
+    if source_positions is None:
+        raise Exception(f"The weight file has no vertex positions ({path})")
+    source_positions = np.asarray(source_positions, dtype=np.float32).reshape(-1, 3)
+    return transfer_vertex_group_weights(source, source_positions, get_vertex_positions(obj), neighbors)
+
+
+def _iter_vertex_group_weights(weights: VertexGroupWeights):
+    """VertexGroupWeights의 그룹들을 (이름, 인덱스 배열, float32 웨이트 배열)로 하나씩 리턴한다.
+    """
+    for group_index, name in enumerate(weights.names):
+        indices, values = get_group_slice(weights, group_index)
+        yield name, indices, values.astype(np.float32, copy=False)
+
+
+def _apply_vertex_groups(obj: Object, vertex_groups, batched: bool = True,
+                         weight_decimals: int | None = None) -> tuple[int, int, int]:
+    """(이름, 인덱스, 웨이트)들로 MeshObject의 VertexGroup들을 새로 만든다.
+    (그룹 수, 항목 수, add() 호출 횟수)를 리턴한다.
+    """
+    group_count: int = 0
+    entry_count: int = 0
+    add_calls: int = 0
+
+    # 모든 VertexGroup들을 제거한다.
+    obj.vertex_groups.clear()
+
+    for name, indices, weights in vertex_groups:
+        # 새 VertexGroup을 만든다.
+        vg = obj.vertex_groups.new(name=name)
+        group_count += 1
+        entry_count += len(indices)
+
+        if batched:
+            add_calls += add_vertex_group_weights(vg, indices, weights, weight_decimals)
+        else:
+            for index, weight in zip(indices, weights):
+                if weight > 0:
+                    vg.add([int(index)], float(weight), "REPLACE")
+                    add_calls += 1
+    return group_count, entry_count, add_calls
+
+
+def load_object_vertex_groups(path: str, obj: Object, batched: bool = True,
+                              weight_decimals: int | None = None, match_by: str = "INDEX",
+                              neighbors: int = 1) -> VertexGroupLoadStats | None:
+    """VertexGroup들을 저장한 파일로 주어진 MeshObject의 VertexGroup들을 생성한다. (로드한다)
+
+    확장자가 .obw이면 OBW 바이너리 포맷으로, 그 외에는 json으로 읽는다.
+    batched가 True이면 웨이트 값이 같은 버텍스들을 묶어 VertexGroup.add()를 호출하고,
+    False이면 예전처럼 버텍스마다 호출한다. weight_decimals가 주어지면 웨이트를 양자화하여 묶는다.
+    match_by가 "POSITION"이면 버텍스 인덱스 대신 저장된 버텍스 좌표에서 가장 가까운 neighbors개의
+    버텍스 웨이트를 보간하여 준다. 토폴로지가 바뀐 메쉬에도 로드할 수 있다.
+    실패시 None을, 성공시 그룹 수, 항목 수, add() 호출 횟수, 소요 시간을 담은 통계를 리턴한다.
+    """
+    func_id: str = load_object_vertex_groups.__name__
     if not os.path.exists(path):
-        return False
+        return None
+
+    start_time: float = time.perf_counter()
+    # 파일이 중간에 깨져 있어도 기존 VertexGroup들이 지워지지 않도록, 기존 그룹을 지우기 전에 파일을 모두 확인한다.
+    if match_by == "POSITION":
+        vertex_groups = _iter_vertex_group_weights(_transfer_vertex_groups_by_position(path, obj, neighbors))
+    elif is_binary_weight_path(path):
+        vertex_groups = _iter_vertex_group_weights(_read_binary_vertex_group_weights(path))
+    else:
+        # json은 한 그룹씩만 메모리에 올리도록, 먼저 끝까지 읽어 확인만 하고 다시 읽으면서 적용한다.
+        _check_json_vertex_groups(path)
+        vertex_groups = _read_json_vertex_groups(path)
+    counts = _apply_vertex_groups(obj, vertex_groups, batched, weight_decimals)
+    stats = VertexGroupLoadStats(*counts, time.perf_counter() - start_time)
+    print(f"{func_id}: {obj.name} (groups={stats.group_count}, entries={stats.entry_count}, "
+          f"add_calls={stats.add_calls}, batched={batched}, match_by={match_by}, elapsed={stats.elapsed:.3f}s)")
+    return stats
 
-    with open(path, "r") as file:
-        root = json.load(file)
 
-        # 모든 VertexGroup들을 제거한다.
-        obj.vertex_groups.clear()
+def _format_throughput(size: int, elapsed: float) -> str:
+    megabytes: float = size / (1024 * 1024)
+    return f"{megabytes:.2f}MB, {elapsed:.3f}s, {megabytes / max(elapsed, 1e-6):.1f}MB/s"
 
-        for vg_data in root["vertex_groups"]:
-            # 새 VertexGroup을 만든다.
-            vg = obj.vertex_groups.new(name=vg_data["name"])
 
-            for vtx_data in vg_data["data"]:
-                if vtx_data["weight"] > 0:
-                    vg.add([vtx_data["index"]], vtx_data["weight"], "REPLACE")
-    return True
+def get_batch_weight_path(directory: str, obj: Object, ext: str) -> str:
+    """일괄 저장/로드시 사용되는 오브젝트별 웨이트 파일 경로를 리턴한다.
+    """
+    return os.path.join(directory, f"{bpy.path.clean_name(obj.name)}{ext}")
+
+
+def get_batch_weight_path_collisions(objects: list[Object]) -> dict[str, list[str]]:
+    """일괄 저장/로드시 같은 파일 이름이 되는 오브젝트들을 {파일 이름: [오브젝트 이름, ...]} 으로 리턴한다.
+    bpy.path.clean_name()은 특수 문자를 _로 바꾸므로 "Body.L"과 "Body_L"은 같은 파일을 가리킨다.
+    """
+    names_by_filename: dict[str, list[str]] = {}
+    for obj in objects:
+        names_by_filename.setdefault(bpy.path.clean_name(obj.name), []).append(obj.name)
+    return {filename: names for filename, names in names_by_filename.items() if len(names) > 1}
+
+
+def _write_vertex_group_file_timed(object_name: str, path: str, info: dict, weights: VertexGroupWeights | None,
+                                   positions: np.ndarray | None, half: bool, compress: bool) -> VertexGroupFileStats:
+    start_time: float = time.perf_counter()
+    _write_vertex_group_file(path, info, weights, half=half, compress=compress, positions=positions)
+    return VertexGroupFileStats(object_name, path, os.path.getsize(path), time.perf_counter() - start_time)
+
+
+def save_vertex_groups_batch(objects: list[Object], directory: str, binary: bool = True, half: bool = False,
+                             compress: bool = False, include_positions: bool = False,
+                             max_workers: int | None = None) -> list[VertexGroupFileStats]:
+    """여러 MeshObject의 VertexGroup들을 디렉토리에 오브젝트별 파일로 저장한다.
+
+    bpy는 thread-safe하지 않으므로 웨이트 스냅샷은 메인 스레드에서 만들고,
+    인코딩, 압축, 파일 쓰기는 스레드 풀에서 병렬로 실행한다.
+    """
+    func_id: str = save_vertex_groups_batch.__name__
+    # 두 스레드가 같은 파일에 쓰지 않도록, 파일 이름이 겹치는 오브젝트가 있으면 아무것도 쓰지 않는다.
+    collisions = get_batch_weight_path_collisions(objects)
+    if collisions:
+        raise Exception(f"Objects share the same weight filename ({collisions})")
+    start_time: float = time.perf_counter()
+    ext: str = WEIGHT_BINARY_EXT if binary else WEIGHT_JSON_EXT
+
+    snapshots: list[tuple] = []
+    for obj in objects:
+        weights = get_vertex_group_weights(obj) if obj.type == "MESH" else None
+        positions = get_vertex_positions(obj) if include_positions and obj.type == "MESH" else None
+        snapshots.append((obj.name, get_batch_weight_path(directory, obj, ext), _get_vertex_group_info(obj),
+                          weights, positions))
+    snapshot_elapsed: float = time.perf_counter() - start_time
+    print(f"{func_id}: Snapshot {len(snapshots)} objects ({snapshot_elapsed:.3f}s)")
+
+    results: list[VertexGroupFileStats] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_write_vertex_group_file_timed, *snapshot, half, compress) for snapshot in snapshots]
+        for future in as_completed(futures):
+            result: VertexGroupFileStats = future.result()
+            print(f"{func_id}: Saved {result.path} ({_format_throughput(result.size, result.elapsed)})")
+            results.append(result)
+
+    total_size: int = sum(result.size for result in results)
+    print(f"{func_id}: Total {len(results)} files ({_format_throughput(total_size, time.perf_counter() - start_time)})")
+    return results
+
+
+def _parse_vertex_group_file(path: str) -> tuple[VertexGroupWeights, int, float]:
+    """웨이트 파일 전체를 파싱하여 (VertexGroupWeights, 파일 크기, 소요 시간)을 리턴한다. bpy에 접근하지 않는다.
+    json도 그룹마다 바로 numpy 배열로 바꿔 CSR로 묶으므로 파이썬 리스트로 파일 전체를 들고 있지 않는다.
+    """
+    start_time: float = time.perf_counter()
+    if is_binary_weight_path(path):
+        weights = _read_binary_vertex_group_weights(path)
+    else:
+        weights = build_vertex_group_weights(_read_json_vertex_groups(path))
+    return weights, os.path.getsize(path), time.perf_counter() - start_time
+
+
+def load_vertex_groups_batch(objects: list[Object], directory: str, batched: bool = True,
+                             weight_decimals: int | None = None,
+                             max_workers: int | None = None) -> list[VertexGroupFileStats]:
+    """디렉토리에 오브젝트별로 저장된 웨이트 파일들을 여러 MeshObject에 로드한다.
+
+    오브젝트마다 .obw 파일을 먼저 찾고 없으면 .json 파일을 찾는다.
+    파일 파싱은 스레드 풀에서 병렬로 실행하고, 파싱이 끝난 순서대로 메인 스레드에서 VertexGroup에 적용한다.
+    """
+    func_id: str = load_vertex_groups_batch.__name__
+    start_time: float = time.perf_counter()
+
+    # 파일 이름이 겹치는 오브젝트들은 어느 오브젝트의 파일인지 알 수 없으므로 건너뛴다.
+    collisions = get_batch_weight_path_collisions(objects)
+    jobs: list[tuple[Object, str]] = []
+    for obj in objects:
+        if bpy.path.clean_name(obj.name) in collisions:
+            print(f"{func_id}: Skip {obj.name} (weight filename is shared with "
+                  f"{collisions[bpy.path.clean_name(obj.name)]})")
+            continue
+        paths = [get_batch_weight_path(directory, obj, ext) for ext in (WEIGHT_BINARY_EXT, WEIGHT_JSON_EXT)]
+        path: str | None = next((path for path in paths if os.path.exists(path)), None)
+        if path:
+            jobs.append((obj, path))
+        else:
+            print(f"{func_id}: Skip {obj.name} (no weight file in {directory})")
+
+    results: list[VertexGroupFileStats] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_job = {executor.submit(_parse_vertex_group_file, path): (obj, path) for obj, path in jobs}
+        for future in as_completed(future_to_job):
+            obj, path = future_to_job[future]
+            # 파일 하나가 깨져 있어도 나머지 오브젝트들은 계속 로드한다.
+            try:
+                weights, size, parse_elapsed = future.result()
+            except Exception as e:
+                print(f"{func_id}: Failed to parse {path} > {obj.name} ({e})")
+                continue
+            apply_start_time: float = time.perf_counter()
+            _apply_vertex_groups(obj, _iter_vertex_group_weights(weights), batched, weight_decimals)
+            apply_elapsed: float = time.perf_counter() - apply_start_time
+            result = VertexGroupFileStats(obj.name, path, size, parse_elapsed + apply_elapsed)
+            print(f"{func_id}: Loaded {path} > {obj.name} ({_format_throughput(size, result.elapsed)}, "
+                  f"parse={parse_elapsed:.3f}s, apply={apply_elapsed:.3f}s)")
+            results.append(result)
+
+    total_size: int = sum(result.size for result in results)
+    print(f"{func_id}: Total {len(results)} files ({_format_throughput(total_size, time.perf_counter() - start_time)})")
+    return results
+
+
+def _hash_vertex_group(indices: np.ndarray, weights: np.ndarray) -> str:
+    """VertexGroup 내용(인덱스, 웨이트)의 해시를 리턴한다. 그룹 이름은 포함하지 않는다.
+    """
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(indices, dtype="<u4").tobytes())
+    digest.update(np.ascontiguousarray(weights, dtype="<f4").tobytes())
+    return digest.hexdigest()
+
+
+def _get_snapshot_blob_path(directory: str, content_hash: str) -> str:
+    return os.path.join(directory, SNAPSHOT_BLOB_DIRNAME, f"{content_hash}{WEIGHT_BINARY_EXT}")
+
+
+def get_vertex_group_snapshots(directory: str, obj: Object | None = None) -> list[str]:
+    """디렉토리에 저장된 스냅샷 매니페스트 경로들을 오래된 순서대로 리턴한다.
+    obj가 주어지면 해당 오브젝트의 스냅샷만 리턴한다.
+    """
+    paths: list[str] = sorted(glob.glob(os.path.join(glob.escape(directory), f"*{SNAPSHOT_MANIFEST_EXT}")))
+    if obj is None:
+        return paths
+
+    # "Body"의 스냅샷을 찾을 때 "Body_L_<타임스탬프>"가 섞이지 않도록 <이름>_<타임스탬프> 형식만 허용하고,
+    # clean_name()이 같은 다른 오브젝트("Body.L", "Body_L")와 구분하기 위해 매니페스트의 object_name도 확인한다.
+    pattern = re.compile(f"{re.escape(bpy.path.clean_name(obj.name))}_{SNAPSHOT_TIMESTAMP_PATTERN}"
+                         f"{re.escape(SNAPSHOT_MANIFEST_EXT)}")
+    snapshots: list[str] = []
+    for path in paths:
+        if not pattern.fullmatch(os.path.basename(path)):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                object_name = json.load(file).get("object_name")
+        except (OSError, ValueError):
+            continue
+        if object_name == obj.name:
+            snapshots.append(path)
+    return snapshots
+
+
+def save_vertex_group_snapshot(obj: Object, directory: str) -> VertexGroupSnapshotStats:
+    """MeshObject의 VertexGroup들을 증분 스냅샷으로 저장한다.
+
+    그룹마다 내용 해시를 구해 blobs/<해시>.obw 로 저장하는데, 같은 디렉토리에 이미 같은 해시의 blob이 있으면
+    (이전 스냅샷 이후로 바뀌지 않았으면) 다시 쓰지 않는다.
+    전체 상태는 그룹 이름과 해시 목록을 담은 매니페스트 파일로 다시 조립할 수 있다.
+    """
+    func_id: str = save_vertex_group_snapshot.__name__
+    start_time: float = time.perf_counter()
+    os.makedirs(directory, exist_ok=True)
+    weights: VertexGroupWeights = get_vertex_group_weights(obj)
+    info: dict = _get_vertex_group_info(obj)
+
+    written: int = 0
+    reused: int = 0
+    groups: list[dict] = []
+    for group_index, name in enumerate(weights.names):
+        indices, values = get_group_slice(weights, group_index)
+        content_hash: str = _hash_vertex_group(indices, values)
+        blob_path: str = _get_snapshot_blob_path(directory, content_hash)
+        if os.path.exists(blob_path):
+            reused += 1
+        else:
+            # 저장 도중 중단되어도 깨진 blob이 남지 않도록 임시 파일에 쓴 뒤 이름을 바꾼다.
+            temp_path: str = f"{blob_path}.tmp"
+            makedir(temp_path)
+            with open(temp_path, "wb") as file:
+                blob = build_vertex_group_weights([(content_hash, indices, values)])
+                write_vertex_group_binary(file, info, blob, compress=True)
+            os.replace(temp_path, blob_path)
+            written += 1
+        groups.append({"name": name, "hash": content_hash, "count": len(indices)})
+
+    manifest: dict = {
+        "object_name": info["object_name"],
+        "object_type": info["object_type"],
+        "data_name": info["data_name"],
+        "vertex_count": info["vertex_count"],
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "vertex_groups": groups,
+    }
+    timestamp: str = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    manifest_path: str = os.path.join(directory, f"{bpy.path.clean_name(obj.name)}_{timestamp}{SNAPSHOT_MANIFEST_EXT}")
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, sort_keys=False, indent=4)
+
+    stats = VertexGroupSnapshotStats(manifest_path, written, reused, time.perf_counter() - start_time)
+    print(f"{func_id}: {obj.name} > {manifest_path} (written={written}, reused={reused}, "
+          f"elapsed={stats.elapsed:.3f}s)")
+    return stats
+
+
+def _read_vertex_group_snapshot(manifest_path: str, manifest: dict):
+    """매니페스트가 가리키는 blob들을 읽어 VertexGroup들을 (이름, 인덱스 배열, 웨이트 배열)로 하나씩 리턴한다.
+    """
+    directory: str = os.path.dirname(manifest_path)
+    for group in manifest["vertex_groups"]:
+        for _, indices, weights in _read_binary_vertex_groups(_get_snapshot_blob_path(directory, group["hash"])):
+            yield group["name"], indices, weights
+
+
+def load_vertex_group_snapshot(manifest_path: str, obj: Object, batched: bool = True) -> VertexGroupLoadStats | None:
+    """스냅샷 매니페스트로 MeshObject의 VertexGroup들을 복원한다.
+    매니페스트가 가리키는 blob 중 하나라도 없으면 기존 VertexGroup들을 건드리지 않고 None을 리턴한다.
+    """
+    func_id: str = load_vertex_group_snapshot.__name__
+    if not os.path.exists(manifest_path):
+        return None
+
+    start_time: float = time.perf_counter()
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        manifest: dict = json.load(file)
+    directory: str = os.path.dirname(manifest_path)
+    missing: list[str] = [group["name"] for group in manifest["vertex_groups"]
+                          if not os.path.exists(_get_snapshot_blob_path(directory, group["hash"]))]
+    if missing:
+        print(f"{func_id}: Missing blobs for {missing} ({manifest_path})")
+        return None
+
+    # blob이 깨져 있어도 기존 VertexGroup들이 지워지지 않도록, 먼저 전부 읽은 뒤에 적용한다.
+    vertex_groups: list = list(_read_vertex_group_snapshot(manifest_path, manifest))
+    counts = _apply_vertex_groups(obj, vertex_groups, batched)
+    stats = VertexGroupLoadStats(*counts, time.perf_counter() - start_time)
+    print(f"{func_id}: {manifest_path} > {obj.name} (groups={stats.group_count}, entries={stats.entry_count}, "
+          f"add_calls={stats.add_calls}, elapsed={stats.elapsed:.3f}s)")
+    return stats
+
+
+def get_deform_group_mask(obj: Object) -> np.ndarray | None:
+    """MeshObject의 VertexGroup 중 연결된 Armature의 변형(use_deform) 본과 이름이 같은 그룹을 True로 표시한 배열을 리턴한다.
+    Armature 모디파이어가 없거나 Armature가 지정되지 않았으면 None을 리턴한다.
+    """
+    modifier = get_armature_modifier(obj)
+    if modifier is None or modifier.object is None:
+        return None
+    deform_names: set[str] = {bone.name for bone in modifier.object.data.bones if bone.use_deform}
+    return np.array([group.name in deform_names for group in obj.vertex_groups], dtype=bool)
+
+
+def clean_vertex_group_weights(obj: Object, max_influences: int = 4, prune_threshold: float = 0.0,
+                               normalize: bool = True, deform_only: bool = True,
+                               tolerance: float = 1e-6) -> VertexGroupCleanStats:
+    """MeshObject의 웨이트에 버텍스당 최대 영향 그룹 수 제한, 작은 웨이트 제거, 정규화를 적용한다.
+
+    모든 할당 정보를 배열로 한 번에 읽어 계산한 뒤, 그룹마다 제거할 버텍스는 remove() 한 번으로,
+    값이 바뀐 버텍스는 같은 값끼리 묶은 add() 호출로 되돌려 쓴다.
+    deform_only가 True이면 Armature의 변형 본 그룹만 대상으로 한다(Armature가 없으면 모든 그룹).
+    """
+    func_id: str = clean_vertex_group_weights.__name__
+    start_time: float = time.perf_counter()
+    vertex_indices, group_indices, weights = get_vertex_group_assignments(obj)
+    group_mask = get_deform_group_mask(obj) if deform_only else None
+    keep, new_weights = limit_normalize_assignments(vertex_indices, group_indices, weights,
+                                                    max_influences=max_influences,
+                                                    prune_threshold=prune_threshold,
+                                                    normalize=normalize, group_mask=group_mask)
+    removed = ~keep
+    modified = keep & (np.abs(new_weights - weights) > tolerance)
+
+    # 바뀐 항목만 그룹 순으로 모아 그룹마다 한 번씩 처리한다.
+    changed_positions = np.flatnonzero(removed | modified)
+    changed_positions = changed_positions[np.argsort(group_indices[changed_positions], kind="stable")]
+    changed_groups, starts = np.unique(group_indices[changed_positions], return_index=True)
+    for group_index, positions in zip(changed_groups.tolist(), np.split(changed_positions, starts[1:])):
+        vertex_group = obj.vertex_groups[group_index]
+        removed_positions = positions[removed[positions]]
+        if len(removed_positions) > 0:
+            vertex_group.remove(vertex_indices[removed_positions].tolist())
+        modified_positions = positions[modified[positions]]
+        if len(modified_positions) > 0:
+            add_vertex_group_weights(vertex_group, vertex_indices[modified_positions], new_weights[modified_positions])
+
+    changed_vertex_count: int = len(np.unique(vertex_indices[changed_positions]))
+    stats = VertexGroupCleanStats(changed_vertex_count, int(np.count_nonzero(removed)),
+                                  time.perf_counter() - start_time)
+    print(f"{func_id}: {obj.name} (changed_vertices={stats.changed_vertex_count}, "
+          f"removed_entries={stats.removed_entry_count}, elapsed={stats.elapsed:.3f}s)")
+    return stats
 
 
 def create_bone_collection(armature: Armature, name: str) -> BoneCollection:
@@ -253,7 +867,7 @@ def get_selected_armatures() -> list[Armature]:
     """선택된 오브젝트와 연관된 Armature들을 리턴한다.
     """
     selected_armature = [obj.data for obj in bpy.context.selected_objects if obj.type == "ARMATURE"]
-    selected_meshes_armature = [get_armature_modifier(obj).object.data for obj in bpy.context.selected_objects if
-                                obj.type == "MESH"
-                                if has_armature_modifier(obj)]
+    selected_meshes_armature = [armature_object.data for armature_object in
+                                (get_mesh_armature(obj) for obj in bpy.context.selected_objects if obj.type == "MESH")
+                                if armature_object]
     return list(set(selected_armature) | set(selected_meshes_armature))
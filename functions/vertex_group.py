@@ -0,0 +1,241 @@
+from collections import namedtuple
+
+import numpy as np
+from bpy.types import Object
+from mathutils.kdtree import KDTree
+
+# CSR(Compressed Sparse Row) 형태의 VertexGroup 웨이트 묶음.
+# i번째 그룹의 데이터는 indices[offsets[i]:offsets[i + 1]], weights[offsets[i]:offsets[i + 1]] 이다.
+VertexGroupWeights = namedtuple("VertexGroupWeights", "names offsets indices weights")
+
+# 그룹별 통계. histogram은 [0, 1] 구간을 bins개로 나눈 웨이트 개수 배열이다.
+VertexGroupStats = namedtuple("VertexGroupStats", "name count min max mean histogram")
+
+# 오브젝트 전체 통계. unnormalized_vertex_count는 웨이트 합이 1이 아닌 (할당된) 버텍스 수이다.
+VertexGroupSummary = namedtuple(
+    "VertexGroupSummary",
+    "object_name vertex_count assigned_vertex_count unnormalized_vertex_count max_influences groups weights"
+)
+
+
+def get_vertex_group_assignments(obj: Object) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MeshObject의 모든 버텍스-그룹 할당 정보를 (버텍스 인덱스, 그룹 인덱스, 웨이트) 배열로 리턴한다.
+
+    버텍스마다 소속된 groups만 한 번씩 순회하므로 비용은 O(버텍스 수 x 그룹 수)가 아닌 O(전체 할당 수)이다.
+    결과는 버텍스 인덱스 오름차순으로 정렬되어 있다.
+    """
+    group_count: int = len(obj.vertex_groups)
+    vertex_indices: list[int] = []
+    group_indices: list[int] = []
+    weights: list[float] = []
+    for vertex in obj.data.vertices:
+        i = vertex.index
+        for element in vertex.groups:
+            # 제거된 그룹을 가리키는 할당 정보가 남아있는 경우가 있으므로 걸러낸다.
+            if element.group < group_count:
+                vertex_indices.append(i)
+                group_indices.append(element.group)
+                weights.append(element.weight)
+    return (
+        np.array(vertex_indices, dtype=np.uint32),
+        np.array(group_indices, dtype=np.uint32),
+        np.array(weights, dtype=np.float32),
+    )
+
+
+def to_vertex_group_weights(names: list[str], vertex_indices: np.ndarray, group_indices: np.ndarray,
+                            weights: np.ndarray) -> VertexGroupWeights:
+    """(버텍스 인덱스, 그룹 인덱스, 웨이트) 할당 배열들을 그룹 순서대로 CSR 형태로 묶는다.
+
+    할당 배열이 버텍스 인덱스 오름차순이면 각 그룹 내부도 버텍스 인덱스 오름차순이 된다.
+    """
+    # 버텍스 순서를 유지한 채(stable) 그룹 인덱스로 정렬한다.
+    order = np.argsort(group_indices, kind="stable")
+    counts = np.bincount(group_indices, minlength=len(names))
+    offsets = np.zeros(len(names) + 1, dtype=np.uint64)
+    np.cumsum(counts, out=offsets[1:])
+    return VertexGroupWeights(names, offsets, vertex_indices[order], weights[order])
+
+
+def get_vertex_group_weights(obj: Object) -> VertexGroupWeights:
+    """MeshObject의 VertexGroup 웨이트들을 그룹 순서(obj.vertex_groups)대로 CSR 형태로 묶어 리턴한다.
+
+    각 그룹 내부는 버텍스 인덱스 오름차순이다.
+    """
+    names: list[str] = [vertex_group.name for vertex_group in obj.vertex_groups]
+    return to_vertex_group_weights(names, *get_vertex_group_assignments(obj))
+
+
+def build_vertex_group_weights(vertex_groups) -> VertexGroupWeights:
+    """(이름, 인덱스, 웨이트)들을 CSR 형태의 VertexGroupWeights로 묶는다.
+    """
+    names: list[str] = []
+    indices: list[np.ndarray] = []
+    weights: list[np.ndarray] = []
+    for name, group_indices, group_weights in vertex_groups:
+        names.append(name)
+        indices.append(np.asarray(group_indices, dtype=np.uint32))
+        weights.append(np.asarray(group_weights, dtype=np.float32))
+    offsets = np.zeros(len(names) + 1, dtype=np.uint64)
+    np.cumsum([len(group_indices) for group_indices in indices], out=offsets[1:])
+    return VertexGroupWeights(
+        names,
+        offsets,
+        np.concatenate(indices) if indices else np.zeros(0, dtype=np.uint32),
+        np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32),
+    )
+
+
+def get_group_slice(weights: VertexGroupWeights, group_index: int) -> tuple[np.ndarray, np.ndarray]:
+    """CSR 묶음에서 특정 그룹의 (버텍스 인덱스, 웨이트) 배열을 리턴한다.
+    """
+    start, end = int(weights.offsets[group_index]), int(weights.offsets[group_index + 1])
+    return weights.indices[start:end], weights.weights[start:end]
+
+
+def add_vertex_group_weights(vertex_group, indices: np.ndarray, weights: np.ndarray,
+                             decimals: int | None = None) -> int:
+    """웨이트 값이 같은 버텍스들을 묶어 VertexGroup.add()를 값마다 한 번씩 호출한다.
+
+    decimals가 주어지면 웨이트를 해당 소수점 자리로 양자화한 뒤 묶는다.
+    웨이트가 0 이하인 항목은 추가하지 않는다. add() 호출 횟수를 리턴한다.
+    """
+    indices = np.asarray(indices, dtype=np.uint32)
+    weights = np.asarray(weights, dtype=np.float32)
+    if decimals is not None:
+        weights = np.round(weights, decimals)
+    mask = weights > 0
+    indices, weights = indices[mask], weights[mask]
+    if len(indices) == 0:
+        return 0
+
+    values, inverse = np.unique(weights, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    splits = np.cumsum(np.bincount(inverse, minlength=len(values)))[:-1]
+    for value, bucket in zip(values.tolist(), np.split(indices[order], splits)):
+        vertex_group.add(bucket.tolist(), value, "REPLACE")
+    return len(values)
+
+
+def transfer_vertex_group_weights(source: VertexGroupWeights, source_positions: np.ndarray,
+                                  target_positions: np.ndarray, neighbors: int = 1) -> VertexGroupWeights:
+    """버텍스 인덱스가 아닌 위치를 기준으로 웨이트를 옮긴다.
+
+    원본 좌표들로 KDTree를 만든 뒤 대상 버텍스마다 가장 가까운 neighbors개의 원본 버텍스를 찾고,
+    거리의 역수로 가중 평균한 웨이트를 준다. KDTree 생성과 검색 모두 O(n log n)이다.
+    """
+    source_count: int = len(source_positions)
+    target_count: int = len(target_positions)
+    neighbors = max(1, min(neighbors, source_count))
+    if source_count == 0 or target_count == 0:
+        return build_vertex_group_weights((name, [], []) for name in source.names)
+
+    kd = KDTree(source_count)
+    for i, co in enumerate(source_positions.tolist()):
+        kd.insert(co, i)
+    kd.balance()
+
+    nearest = np.empty((target_count, neighbors), dtype=np.int64)
+    distances = np.empty((target_count, neighbors), dtype=np.float64)
+    if neighbors == 1:
+        for i, co in enumerate(target_positions.tolist()):
+            _, nearest[i, 0], distances[i, 0] = kd.find(co)
+    else:
+        for i, co in enumerate(target_positions.tolist()):
+            for j, (_, index, distance) in enumerate(kd.find_n(co, neighbors)):
+                nearest[i, j], distances[i, j] = index, distance
+
+    # 거리의 역수로 가중치를 만든다. 위치가 일치하는 원본이 있으면 그 원본만 사용된다.
+    blend = 1.0 / np.maximum(distances, 1e-8)
+    blend /= blend.sum(axis=1, keepdims=True)
+
+    vertex_groups: list[tuple] = []
+    dense = np.zeros(source_count, dtype=np.float32)
+    for group_index, name in enumerate(source.names):
+        indices, weights = get_group_slice(source, group_index)
+        dense[:] = 0.0
+        dense[indices] = weights
+        target_weights = (dense[nearest] * blend).sum(axis=1).astype(np.float32)
+        target_indices = np.flatnonzero(target_weights > 0)
+        vertex_groups.append((name, target_indices, target_weights[target_indices]))
+    return build_vertex_group_weights(vertex_groups)
+
+
+def get_vertex_group_stats(obj: Object, bins: int = 10, tolerance: float = 1e-4) -> VertexGroupSummary:
+    """MeshObject의 VertexGroup 정보를 한 번의 순회로 모아 통계를 리턴한다.
+
+    그룹별 할당 수, 최소/최대/평균 웨이트, 웨이트 히스토그램과 함께
+    웨이트 합이 1에서 tolerance 이상 벗어난 버텍스 수, 버텍스당 최대 영향 그룹 수를 구한다.
+    원본 데이터(VertexGroupWeights)도 함께 담아 리턴하므로 버텍스 단위 출력에 재사용할 수 있다.
+    """
+    names: list[str] = [vertex_group.name for vertex_group in obj.vertex_groups]
+    vertex_count: int = len(obj.data.vertices)
+    vertex_indices, group_indices, weights = get_vertex_group_assignments(obj)
+    csr: VertexGroupWeights = to_vertex_group_weights(names, vertex_indices, group_indices, weights)
+
+    groups: list[VertexGroupStats] = []
+    for group_index, name in enumerate(names):
+        _, values = get_group_slice(csr, group_index)
+        histogram, _ = np.histogram(values, bins=bins, range=(0.0, 1.0))
+        if len(values) > 0:
+            groups.append(VertexGroupStats(name, len(values), float(values.min()), float(values.max()),
+                                           float(values.mean()), histogram))
+        else:
+            groups.append(VertexGroupStats(name, 0, 0.0, 0.0, 0.0, histogram))
+
+    influences = np.bincount(vertex_indices, minlength=vertex_count)
+    weight_sums = np.bincount(vertex_indices, weights=weights, minlength=vertex_count)
+    assigned = influences > 0
+    unnormalized = assigned & (np.abs(weight_sums - 1.0) > tolerance)
+    return VertexGroupSummary(
+        obj.name,
+        vertex_count,
+        int(assigned.sum()),
+        int(unnormalized.sum()),
+        int(influences.max()) if vertex_count > 0 else 0,
+        groups,
+        csr,
+    )
+
+
+def limit_normalize_assignments(vertex_indices: np.ndarray, group_indices: np.ndarray, weights: np.ndarray,
+                                max_influences: int = 4, prune_threshold: float = 0.0, normalize: bool = True,
+                                group_mask: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """할당 배열에 버텍스당 최대 영향 그룹 수 제한, 작은 웨이트 제거, 정규화를 한 번에 적용한다.
+
+    버텍스마다 웨이트가 큰 순서로 max_influences개(0이면 제한 없음)만 남기고, prune_threshold보다 작은 웨이트는
+    제거한다. 단 버텍스에서 가장 큰 웨이트는 항상 남긴다. normalize가 True이면 남은 웨이트의 합이 1이 되게 한다.
+    group_mask(그룹 인덱스별 bool 배열)가 주어지면 True인 그룹의 할당에만 적용하고 나머지는 그대로 둔다.
+    (남길지 여부 마스크, 새 웨이트) 배열을 입력과 같은 순서로 리턴한다.
+    """
+    count: int = len(vertex_indices)
+    keep = np.ones(count, dtype=bool)
+    new_weights = np.asarray(weights, dtype=np.float32).copy()
+    target = np.ones(count, dtype=bool) if group_mask is None else np.asarray(group_mask, dtype=bool)[group_indices]
+    target_positions = np.flatnonzero(target)
+    if len(target_positions) == 0:
+        return keep, new_weights
+
+    # 버텍스 인덱스 오름차순, 같은 버텍스 안에서는 웨이트 내림차순으로 정렬하여 버텍스 내 순위를 구한다.
+    target_vertices = vertex_indices[target_positions]
+    target_weights = new_weights[target_positions]
+    order = np.lexsort((-target_weights, target_vertices))
+    sorted_vertices = target_vertices[order]
+    starts = np.flatnonzero(np.r_[True, sorted_vertices[1:] != sorted_vertices[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(sorted_vertices)])
+    ranks = np.arange(len(sorted_vertices)) - np.repeat(starts, run_lengths)
+
+    sorted_keep = target_weights[order] >= prune_threshold
+    if max_influences > 0:
+        sorted_keep &= ranks < max_influences
+    sorted_keep |= ranks == 0
+    keep[target_positions[order]] = sorted_keep
+
+    if normalize:
+        kept_positions = target_positions[keep[target_positions]]
+        kept_vertices = vertex_indices[kept_positions]
+        sums = np.bincount(kept_vertices, weights=new_weights[kept_positions])
+        divisors = sums[kept_vertices]
+        valid = divisors > 0
+        new_weights[kept_positions[valid]] = (new_weights[kept_positions[valid]] / divisors[valid]).astype(np.float32)
+    return keep, new_weights
@@ -8,9 +8,10 @@ from ..functions.context import (
 from ..functions.rigging import (
     set_bone_collections_visible,
     set_all_bone_collections_visible,
-    has_armature_modifier,
-    get_armature_modifier,
+    get_mesh_armature,
     get_selected_armatures,
+    register_armature_index_handlers,
+    unregister_armature_index_handlers,
 )
 
 RIGIFY_BONE_COLLECTIONS: list[str] = [
@@ -73,9 +74,9 @@ class ToggleWeightPaintMode(Operator):
         """선택된 오브젝트 중에서 하나의 MeshObject 그리고 연관된 하나의 Armature가 있어야 한다.
         """
         mesh_objects = [obj for obj in bpy.context.selected_objects if obj.type == "MESH"]
-        armatures = [get_armature_modifier(obj).object.data for obj in mesh_objects if has_armature_modifier(obj) if
-                     get_armature_modifier(obj).object]
-        return True if len(mesh_objects) == 1 and len(armatures) == 1 else False
+        if len(mesh_objects) != 1:
+            return False
+        return True if get_mesh_armature(mesh_objects[0]) else False
 
     def execute(self, context):
         if bpy.context.mode == "PAINT_WEIGHT":
@@ -88,7 +89,7 @@ class ToggleWeightPaintMode(Operator):
             set_active_object(mesh_object)
 
             # Armature의 BoneCollection을 ObjectMode에 맞게 설정한다.
-            armature = get_armature_modifier(mesh_object).object.data
+            armature = get_mesh_armature(mesh_object).data
             set_all_bone_collections_visible(armature, False)
             set_bone_collections_visible(armature,
                                          list(set(RIGIFY_BONE_COLLECTIONS) - set(RIGIFY_UNUSED_BONE_COLLECTIONS)), True)
@@ -96,9 +97,7 @@ class ToggleWeightPaintMode(Operator):
             mesh_objects = [obj for obj in bpy.context.selected_objects if obj.type == "MESH"]
             assert (len(mesh_objects) == 1)
             mesh_object = mesh_objects[0]
-            armature_objects = [get_armature_modifier(obj).object for obj in mesh_objects if has_armature_modifier(obj)
-                                if get_armature_modifier(obj).object]
-            armature_object = armature_objects[0]
+            armature_object = get_mesh_armature(mesh_object)
 
             # Armature의 BoneCollection을 PaintWeightMode 맞게 설정한다.
             armature = armature_object.data
@@ -157,3 +156,11 @@ class ToggleBoneCollectionVisible(Operator):
                 case _:
                     pass
         return {"FINISHED"}
+
+
+def register():
+    register_armature_index_handlers()
+
+
+def unregister():
+    unregister_armature_index_handlers()
@@ -1,44 +1,98 @@
+import json
 import os
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import bpy
-from bpy.props import EnumProperty, IntProperty, FloatProperty, StringProperty
-from bpy.types import Object, Operator, Image
+import numpy as np
+from bpy.props import BoolProperty, EnumProperty, IntProperty, FloatProperty, StringProperty
+from bpy.types import Object, Operator, Image, Material, Collection
 
 from ..functions.context import (
     is_object_mode, get_selected_objects_by_type,
     set_active_object, select_objects, deselect_all,
 )
 from ..functions.material import export_image
+from ..functions.mesh import get_mesh_hash
 from ..functions.material import file_format_to_ext
 from ..functions.material import get_material, create_material, assign_material
-from ..functions.material import get_materials_from_mesh_object
+from ..functions.material import get_materials_from_mesh_object, add_blank_material_slot
 from ..functions.material import get_or_create_shader_node, set_active_shader_node
-from ..functions.material import has_image, get_image, create_image
+from ..functions.material import has_image, get_image, create_image, get_image_pixels
+from ..utils.cache_utils import FileCache, make_cache_key
+from ..utils.image_utils import PngWriter, float_to_uint, write_png
 from ..utils.text_utils import get_image_size_symbol, float_to_symbol, baketype_to_symbol
 
 
-def quick_bake(
-        bake_type: str,
-        high_object: Object,
-        low_object: Object,
-        width: int = 2048,
-        height: int = 2048,
-        cage_extrusion: float = 0.15,
-        max_ray_distance: float = 0.3,
-        margin: int = 16
-) -> Image:
-    """베이크 한다.
+BAKE_SET_TYPES: tuple[str, ...] = (
+    "NORMAL", "AO", "POSITION", "ROUGHNESS", "EMIT", "DIFFUSE", "GLOSSY", "TRANSMISSION", "SHADOW", "UV", "COMBINED",
+)
+BAKE_HIGH_SUFFIX: str = "_high"
+BAKE_LOW_SUFFIX: str = "_low"
+BAKE_PROGRESS_FILENAME: str = "bake_progress.json"
+BAKE_FILE_FORMATS: tuple[str, ...] = ("PNG", "JPEG", "TARGA", "TIFF", "WEBP")
+CYCLES_GPU_BACKENDS: tuple[str, ...] = ("OPTIX", "CUDA", "HIP", "ONEAPI", "METAL")
+BAKE_TILE_UV_LAYER_NAME: str = "_BakeTileUV"
+BAKE_TILE_IMAGE_NAME: str = "_BakeTile"
+BAKE_MAX_IMAGE_SIZE: int = 8192  # 타일 없이 한 장의 이미지 블럭으로 구울 수 있는 최대 크기
+BAKE_BIT_DEPTHS: tuple[int, ...] = (8, 16)
+BAKE_CACHE_DIRNAME: str = "ob_tools_bake_cache"
+BAKE_CACHE_MAX_SIZE: int = 4 * 1024 ** 3
+# 캐시 키는 하이폴/로우폴 메시와 파라미터만 보므로 재질이나 주변 오브젝트에 영향을 받지 않는 타입만 캐시한다.
+# AO는 씬의 다른 오브젝트와 월드 설정에 따라 결과가 달라지므로 캐시하지 않는다.
+BAKE_CACHE_TYPES: tuple[str, ...] = ("NORMAL", "POSITION", "UV")
+BAKE_CACHE_VERSION: int = 1  # 베이크 결과가 바뀌는 수정을 하면 올려서 이전 캐시를 무효화한다.
+BakePairResult = namedtuple("BakePairResult", "high_name low_name success elapsed error files skipped")
+
+
+def enable_cycles_gpu() -> bool:
+    """Cycles 환경설정에서 사용할 수 있는 GPU 백엔드를 찾아 GPU 장치를 모두 켠다. GPU가 없으면 False를 리턴한다.
+    UI에서는 사용자가 미리 설정해두지만 백그라운드(-b) 실행에서는 직접 켜야 한다.
+    """
+    func_id: str = enable_cycles_gpu.__name__
+    preferences = bpy.context.preferences.addons["cycles"].preferences
+    for compute_device_type in CYCLES_GPU_BACKENDS:
+        try:
+            preferences.compute_device_type = compute_device_type
+        except TypeError:
+            continue  # 이 플랫폼/빌드에서 지원하지 않는 백엔드.
+        preferences.get_devices()
+        devices = [device for device in preferences.devices if device.type == compute_device_type]
+        if len(devices) > 0:
+            for device in devices:
+                device.use = True
+            print(f"{func_id}: {compute_device_type} ({', '.join(device.name for device in devices)})")
+            return True
+    preferences.compute_device_type = "NONE"
+    return False
+
+
+def setup_bake_render(bake_type: str, device: str = "GPU", samples: int = 0, threads: int = 0):
+    """베이크용 렌더러를 설정한다.
+    samples가 0이면 씬의 샘플 수를, threads가 0이면 씬의 스레드 설정을 그대로 사용한다.
     """
-    func_id: str = quick_bake.__name__
     render = bpy.context.scene.render
-    bake = bpy.context.scene.render.bake
     cycles = bpy.context.scene.cycles
-
-    # 베이크용 렌더러 설정
     render.use_bake_multires = False
     render.engine = "CYCLES"
-    cycles.device = "GPU"
+    if device == "GPU" and bpy.app.background and not enable_cycles_gpu():
+        print(f"{setup_bake_render.__name__}: No GPU available, falling back to CPU")
+        device = "CPU"
+    cycles.device = device
     cycles.bake_type = bake_type
+    if samples > 0:
+        cycles.samples = samples
+    if threads > 0:
+        render.threads_mode = "FIXED"
+        render.threads = threads
+
+
+def setup_bake_objects(high_object: Object, low_object: Object) -> Material:
+    """하이폴/로우폴을 선택, 활성화하고 로우폴의 베이크용 재질을 준비해서 리턴한다.
+    """
+    func_id: str = setup_bake_objects.__name__
 
     # 베이크하기 위해 Source, Target(Active) 오브젝트를 선택하고 활성화한다.
     deselect_all()
@@ -70,14 +124,33 @@ def quick_bake(
         material = get_material(material_name) or create_material(material_name)  # TODO: PrincipleBSDF 노드로 생성하기
         print(f"{func_id}: Assign Material to Object ({material.name} > {low_object.name})")
         assign_material(low_object, material)
+    return material
+
+
+def get_bake_image_name(low_object: Object, bake_type: str, width: int, height: int, cage_extrusion: float,
+                        max_ray_distance: float) -> str:
+    return f"T_{low_object.name}_{baketype_to_symbol(bake_type.capitalize())}_{get_image_size_symbol(width, height)}_R{float_to_symbol(max_ray_distance)}_C{float_to_symbol(cage_extrusion)}"
+
+
+def get_bake_texture_node_name(low_object: Object, bake_type: str) -> str:
+    return f"TN_{low_object.name}_{bake_type.capitalize()}"
+
+
+def setup_bake_image(material: Material, low_object: Object, bake_type: str, width: int, height: int,
+                     cage_extrusion: float, max_ray_distance: float, image: Image | None = None) -> Image:
+    """베이크 타겟이 될 이미지와 텍스쳐 노드를 준비하고 텍스쳐 노드를 Active 해둔다.
+    image가 주어지면 새로 만들지 않고 그 이미지를 타겟으로 사용한다.
+    """
+    func_id: str = setup_bake_image.__name__
 
     # 베이크 타겟이 될 이미지 블럭을 만든다. (이미 있다면 제거하고 새로 만든다)
-    image_name: str = f"T_{low_object.name}_{baketype_to_symbol(bake_type.capitalize())}_{get_image_size_symbol(width, height)}_R{float_to_symbol(max_ray_distance)}_C{float_to_symbol(cage_extrusion)}"
-    print(f"{func_id}: Get or Create a Image ({image_name})")
-    image: Image = get_image(image_name) if has_image(image_name) else create_image(image_name, width, height)
+    if image is None:
+        image_name: str = get_bake_image_name(low_object, bake_type, width, height, cage_extrusion, max_ray_distance)
+        print(f"{func_id}: Get or Create a Image ({image_name})")
+        image = get_image(image_name) if has_image(image_name) else create_image(image_name, width, height)
 
     # 재질의 노드 트리에 텍스쳐 노드를 생성한다.
-    texture_node_name: str = f"TN_{low_object.name}_{bake_type.capitalize()}"
+    texture_node_name: str = get_bake_texture_node_name(low_object, bake_type)
     print(f"{func_id}: Get or Create a TextureNode ({material.name} > node_tree > {texture_node_name})")
     texture_node = get_or_create_shader_node(material.name, texture_node_name, "ShaderNodeTexImage")
 
@@ -92,10 +165,11 @@ def quick_bake(
     # 베이크 타겟이 될 Image가 지정된 TextureNode를 Active 해둔다. 그래야 이 이미지로 Bake된다.
     print(f"{func_id}: Set Active ShaderNode ({material.name} > node_tree > {texture_node.name})")
     set_active_shader_node(material.name, texture_node.name)
+    return image
 
-    # 베이크 시작.
-    print(
-        f"{func_id}: Start a Bake (type={bake_type}, width={width}, height={height}, object={low_object.name}, material={material.name}, textue_node={texture_node.name}, image={image.name})")
+
+def run_bake(bake_type: str, width: int, height: int, cage_extrusion: float, max_ray_distance: float, margin: int,
+             uv_layer: str = ""):
     # bpy.ops.object.bake(type='COMBINED', pass_filter=set(), filepath="", width=512, height=512, margin=16,
     #                     margin_type='EXTEND', use_selected_to_active=False, max_ray_distance=0, cage_extrusion=0,
     #                     cage_object="", normal_space='TANGENT', normal_r='POS_X', normal_g='POS_Y',
@@ -117,12 +191,539 @@ def quick_bake(
                         use_cage=False,
                         use_split_materials=False,
                         use_automatic_name=False,
-                        save_mode="INTERNAL"
+                        save_mode="INTERNAL",
+                        uv_layer=uv_layer
                         )
 
+
+def check_bake_image_size(width: int, height: int, tile_size: int = 0):
+    """타일 없이 굽는데 이미지가 BAKE_MAX_IMAGE_SIZE보다 크면 예외를 발생시킨다.
+    """
+    if tile_size <= 0 and max(width, height) > BAKE_MAX_IMAGE_SIZE:
+        raise Exception(f"Images larger than {BAKE_MAX_IMAGE_SIZE} need a tile size ({width}x{height})")
+
+
+def get_bake_cache() -> FileCache:
+    """UI에서 사용하는 기본 베이크 캐시. 임시 디렉터리에 두고 BAKE_CACHE_MAX_SIZE를 넘으면 오래된 항목부터 지운다.
+    """
+    return FileCache(os.path.join(tempfile.gettempdir(), BAKE_CACHE_DIRNAME), BAKE_CACHE_MAX_SIZE)
+
+
+def get_bake_geometry_hash(high_object: Object, low_object: Object) -> str:
+    """하이폴, 로우폴의 평가된 메시와 행렬로 해시를 만든다. 베이크 타입마다 다시 계산하지 않도록 따로 구한다.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    return make_cache_key({
+        "high": get_mesh_hash(high_object, depsgraph),
+        "low": get_mesh_hash(low_object, depsgraph),
+    })
+
+
+def get_bake_cache_key(geometry_hash: str, bake_type: str, width: int, height: int, cage_extrusion: float,
+                       max_ray_distance: float, margin: int, samples: int = 0, tile_size: int = 0,
+                       bit_depth: int = 8) -> str:
+    return make_cache_key({
+        "version": BAKE_CACHE_VERSION,
+        "blender": bpy.app.version_string,
+        "geometry": geometry_hash,
+        "bake_type": bake_type,
+        "width": width,
+        "height": height,
+        "cage_extrusion": cage_extrusion,
+        "max_ray_distance": max_ray_distance,
+        "margin": margin,
+        "samples": samples if samples > 0 else bpy.context.scene.cycles.samples,
+        "tile_size": tile_size,
+        "bit_depth": bit_depth,
+    })
+
+
+def fetch_cached_bake(cache: FileCache | None, key: str | None, image: Image) -> bool:
+    """캐시에 있는 픽셀(.npy)을 이미지에 채운다. 항목이 없거나 크기가 맞지 않으면 False를 리턴한다.
+    """
+    if cache is None or key is None:
+        return False
+    entry_path: str | None = cache.get_path(key, ".npy")
+    if entry_path is None:
+        return False
+    pixels: np.ndarray = np.load(entry_path)
+    width, height = image.size
+    if pixels.shape != (height, width, image.channels):
+        return False
+    if pixels.dtype == np.uint8:
+        pixels = pixels.astype(np.float32) / 255
+    image.pixels.foreach_set(pixels.ravel())
+    image.update()
+    print(f"{fetch_cached_bake.__name__}: Cache Hit ({key[:12]} > {image.name})")
+    return True
+
+
+def store_cached_bake(cache: FileCache | None, key: str | None, image: Image):
+    """이미지 픽셀을 .npy로 캐시에 넣는다. 8비트 이미지는 8비트로 저장해서 크기를 줄인다.
+    """
+    if cache is None or key is None:
+        return
+    pixels: np.ndarray = get_image_pixels(image)
+    if not image.is_float:
+        pixels = float_to_uint(pixels, 8)
+    temp_path: str = os.path.join(tempfile.gettempdir(), f"{key}.{os.getpid()}.npy")
+    try:
+        np.save(temp_path, pixels)
+        cache.put(key, temp_path)
+    finally:
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+    print(f"{store_cached_bake.__name__}: Cache Stored ({key[:12]})")
+
+
+def write_cached_bake(cache: FileCache | None, key: str | None, filepath: str, width: int, height: int) -> bool:
+    """캐시에 있는 픽셀(.npy)을 블렌더 이미지를 거치지 않고 PNG 파일로 바로 쓴다.
+    항목이 없거나 크기가 맞지 않으면 False를 리턴한다.
+    """
+    if cache is None or key is None:
+        return False
+    entry_path: str | None = cache.get_path(key, ".npy")
+    if entry_path is None:
+        return False
+    pixels: np.ndarray = np.load(entry_path)
+    if pixels.shape[:2] != (height, width):
+        return False
+    _write_bake_png(filepath, pixels)
+    print(f"{write_cached_bake.__name__}: Cache Hit ({key[:12]} > {filepath})")
+    return True
+
+
+def quick_bake(
+        bake_type: str,
+        high_object: Object,
+        low_object: Object,
+        width: int = 2048,
+        height: int = 2048,
+        cage_extrusion: float = 0.15,
+        max_ray_distance: float = 0.3,
+        margin: int = 16,
+        device: str = "GPU",
+        samples: int = 0,
+        threads: int = 0,
+        cache: FileCache | None = None,
+        png_filepath: str | None = None,
+) -> Image | None:
+    """베이크 한다.
+    cache가 주어지면 메시와 파라미터가 같은 이전 결과를 굽지 않고 불러온다.
+    png_filepath도 주어지면 캐시 적중시 이미지 블럭을 만들지 않고 PNG 파일로 바로 쓴 뒤 None을 리턴한다.
+    """
+    func_id: str = quick_bake.__name__
+    check_bake_image_size(width, height)
+    key: str | None = None
+    if cache and bake_type in BAKE_CACHE_TYPES:
+        key = get_bake_cache_key(get_bake_geometry_hash(high_object, low_object), bake_type, width, height,
+                                 cage_extrusion, max_ray_distance, margin, samples)
+        if png_filepath and write_cached_bake(cache, key, png_filepath, width, height):
+            return None
+    setup_bake_render(bake_type, device, samples, threads)
+    material: Material = setup_bake_objects(high_object, low_object)
+    image: Image = setup_bake_image(material, low_object, bake_type, width, height, cage_extrusion, max_ray_distance)
+    if fetch_cached_bake(cache, key, image):
+        return image
+
+    # 베이크 시작.
+    print(
+        f"{func_id}: Start a Bake (type={bake_type}, width={width}, height={height}, object={low_object.name}, material={material.name}, image={image.name})")
+    run_bake(bake_type, width, height, cage_extrusion, max_ray_distance, margin)
+    store_cached_bake(cache, key, image)
     return image
 
 
+def get_bake_filepath(directory: str, image_name: str, file_format: str) -> str:
+    # 경로를 정규화하고 POSIX 형태로 마무리.
+    return os.path.normpath(os.path.join(directory, f"{image_name}.{file_format_to_ext(file_format)}")).replace("\\", "/")
+
+
+def _write_bake_png(filepath: str, pixels: np.ndarray):
+    # 블렌더 이미지는 아래쪽 줄부터 저장되어 있으므로 뒤집어서 쓴다.
+    write_png(filepath, pixels[::-1])
+
+
+def get_tile_ranges(size: int, tile_size: int) -> list[tuple[int, int]]:
+    """size 픽셀을 tile_size 단위로 나눈 [시작, 끝) 구간 목록을 리턴한다. 마지막 구간은 더 작을 수 있다.
+    """
+    return [(start, min(start + tile_size, size)) for start in range(0, size, tile_size)]
+
+
+def bake_tiled(
+        material: Material,
+        low_object: Object,
+        bake_type: str,
+        filepath: str,
+        width: int,
+        height: int,
+        tile_size: int = 2048,
+        cage_extrusion: float = 0.15,
+        max_ray_distance: float = 0.3,
+        margin: int = 16,
+        bit_depth: int = 8,
+):
+    """UV 공간을 타일로 나눠 차례로 굽고, 결과를 한 장의 PNG로 줄 단위로 이어 쓴다.
+
+    타일마다 원래 UV를 확대/이동한 임시 UV 레이어를 만들어 해당 구간이 0~1에 오게 하고 타일 크기의 이미지에 굽는다.
+    가로 한 줄의 타일들을 모으면 PNG에 써서 비우므로 메모리는 전체 이미지가 아닌 (가로 크기 x 타일 높이)에 비례한다.
+    PNG 쓰기는 백그라운드 스레드에서 하고 그동안 다음 줄의 타일을 굽는다.
+    setup_bake_render(), setup_bake_objects()가 먼저 호출되어 있어야 한다.
+    마진은 타일 안의 UV 섬 기준으로 채워지므로 타일 경계 근처에서는 한 번에 구운 결과와 조금 다를 수 있다.
+    """
+    func_id: str = bake_tiled.__name__
+    mesh = low_object.data
+    source_uv_layer = mesh.uv_layers.active
+    if source_uv_layer is None:
+        raise Exception(f"The low-poly object has no UV map ({low_object.name})")
+    source_uv_name: str = source_uv_layer.name
+    source_uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    source_uv_layer.data.foreach_get("uv", source_uvs)
+    source_uvs = source_uvs.reshape(-1, 2)
+
+    tile_uv_layer = mesh.uv_layers.new(name=BAKE_TILE_UV_LAYER_NAME, do_init=False)
+    if tile_uv_layer is None:
+        raise Exception(f"Cannot add a temporary UV map ({low_object.name})")
+    # 같은 이름의 UV 맵이 이미 있으면 new()가 이름 뒤에 번호를 붙이므로 실제로 만들어진 이름을 사용한다.
+    tile_uv_name: str = tile_uv_layer.name
+    mesh.uv_layers.active = mesh.uv_layers[source_uv_name]
+    x_ranges = get_tile_ranges(width, tile_size)
+    # PNG는 위쪽 줄부터 쓰므로 V가 큰(위쪽) 타일 줄부터 굽는다.
+    y_ranges = get_tile_ranges(height, tile_size)[::-1]
+    tile_count: int = len(x_ranges) * len(y_ranges)
+    tile_images: dict[tuple[int, int], Image] = {}
+    channels: int = 4
+    try:
+        # 예외가 나도 쓰는 중인 줄이 끝난 뒤에 파일이 닫히도록 writer를 바깥에 둔다.
+        with PngWriter(filepath, width, height, channels, bit_depth) as writer, \
+                ThreadPoolExecutor(max_workers=1) as executor:
+            write: Future | None = None
+            for row, (y0, y1) in enumerate(y_ranges):
+                band = np.empty((y1 - y0, width, channels), dtype=np.uint8 if bit_depth == 8 else np.uint16)
+                for column, (x0, x1) in enumerate(x_ranges):
+                    tile_width, tile_height = x1 - x0, y1 - y0
+                    print(f"{func_id}: [{row * len(x_ranges) + column + 1}/{tile_count}] Bake Tile (x={x0}~{x1}, y={y0}~{y1})")
+                    tile_uvs = (source_uvs - (x0 / width, y0 / height)) * (width / tile_width, height / tile_height)
+                    mesh.uv_layers[tile_uv_name].data.foreach_set("uv", tile_uvs.ravel())
+
+                    # 끝 타일은 크기가 다를 수 있으므로 크기별로 타일 이미지를 만들어 재사용한다.
+                    tile_image = tile_images.get((tile_width, tile_height))
+                    if tile_image is None:
+                        tile_image = bpy.data.images.new(f"{BAKE_TILE_IMAGE_NAME}_{tile_width}x{tile_height}",
+                                                         tile_width, tile_height, float_buffer=bit_depth > 8)
+                        tile_images[(tile_width, tile_height)] = tile_image
+                    setup_bake_image(material, low_object, bake_type, tile_width, tile_height, cage_extrusion,
+                                     max_ray_distance, image=tile_image)
+                    run_bake(bake_type, tile_width, tile_height, cage_extrusion, max_ray_distance, margin,
+                             uv_layer=tile_uv_name)
+                    band[:, x0:x1] = float_to_uint(get_image_pixels(tile_image), bit_depth)
+
+                if write is not None:
+                    write.result()
+                # 블렌더 이미지는 아래쪽 줄부터 저장되어 있으므로 뒤집어서 쓴다.
+                write = executor.submit(writer.write_rows, band[::-1])
+            if write is not None:
+                write.result()
+    finally:
+        mesh.uv_layers.remove(mesh.uv_layers[tile_uv_name])
+        mesh.uv_layers.active = mesh.uv_layers[source_uv_name]
+        for tile_image in tile_images.values():
+            bpy.data.images.remove(tile_image)
+    print(f"{func_id}: Saved ({filepath}, {width}x{height}, {tile_count} tiles)")
+
+
+def quick_bake_tiled(
+        bake_type: str,
+        high_object: Object,
+        low_object: Object,
+        filepath: str,
+        width: int = 8192,
+        height: int = 8192,
+        tile_size: int = 2048,
+        cage_extrusion: float = 0.15,
+        max_ray_distance: float = 0.3,
+        margin: int = 16,
+        bit_depth: int = 8,
+        device: str = "GPU",
+        samples: int = 0,
+        threads: int = 0,
+        cache: FileCache | None = None,
+):
+    """전체 크기의 이미지 블럭을 만들지 않고 타일 단위로 구워 PNG 파일로 바로 저장한다.
+    cache가 주어지면 메시와 파라미터가 같은 이전 결과 파일을 굽지 않고 복사한다.
+    """
+    setup_bake_render(bake_type, device, samples, threads)
+    material: Material = setup_bake_objects(high_object, low_object)
+    key: str | None = None
+    if cache and bake_type in BAKE_CACHE_TYPES:
+        key = get_bake_cache_key(get_bake_geometry_hash(high_object, low_object), bake_type, width, height,
+                                 cage_extrusion, max_ray_distance, margin, samples, tile_size, bit_depth)
+        if cache.get(key, filepath):
+            print(f"{quick_bake_tiled.__name__}: Cache Hit ({key[:12]} > {filepath})")
+            return
+    bake_tiled(material, low_object, bake_type, filepath, width, height, tile_size, cage_extrusion, max_ray_distance,
+               margin, bit_depth)
+    if key:
+        cache.put(key, filepath)
+
+
+def quick_bake_set(
+        bake_types: list[str],
+        high_object: Object,
+        low_object: Object,
+        width: int = 2048,
+        height: int = 2048,
+        cage_extrusion: float = 0.15,
+        max_ray_distance: float = 0.3,
+        margin: int = 16,
+        directory: str | None = None,
+        file_format: str = "PNG",
+        device: str = "GPU",
+        samples: int = 0,
+        threads: int = 0,
+        tile_size: int = 0,
+        cache: FileCache | None = None,
+        bit_depth: int = 8,
+) -> list[tuple[Image | None, str | None]]:
+    """여러 베이크 타입을 한 번에 굽는다. (이미지, 저장된 파일 경로) 목록을 리턴한다.
+
+    렌더러 설정, 오브젝트 선택, 재질 준비는 한 번만 하고 타입마다 이미지만 바꿔 연달아 굽는다.
+    선택과 씬을 바꾸지 않으므로 Cycles가 베이크 사이에 다시 동기화할 것이 줄어든다.
+    directory가 주어지면 PNG는 픽셀을 복사해 백그라운드 스레드에서 저장하고 그동안 다음 타입을 굽는다.
+    PNG는 뷰 변환 없이 픽셀 값 그대로 저장된다. 다른 포맷은 export_image()로 바로 저장한다.
+    tile_size가 0보다 크면 bake_tiled()로 타일 단위로 구워 bit_depth 비트 PNG로 바로 저장하고, 이미지 자리에는 None이 들어간다.
+    타일 없이는 BAKE_MAX_IMAGE_SIZE보다 큰 이미지를 굽지 않는다.
+    cache가 주어지면 BAKE_CACHE_TYPES에 대해 메시와 파라미터가 같은 이전 결과(픽셀 또는 타일 베이크 PNG)를 굽지 않고 불러온다.
+    PNG로 저장할 때 캐시에 적중하면 이미지 블럭을 만들지 않고 파일로 바로 쓰며, 이미지 자리에는 None이 들어간다.
+    """
+    func_id: str = quick_bake_set.__name__
+    for bake_type in bake_types:
+        if bake_type not in BAKE_SET_TYPES:
+            raise Exception(f"Unsupported bake type ({bake_type})")
+    if tile_size > 0 and (not directory or file_format != "PNG"):
+        raise Exception("Tiled bakes are saved directly and need a directory and the PNG file format")
+    if bit_depth not in BAKE_BIT_DEPTHS:
+        raise Exception(f"Invalid bit depth ({bit_depth})")
+    check_bake_image_size(width, height, tile_size)
+
+    setup_bake_render(bake_types[0], device, samples, threads)
+    material: Material = setup_bake_objects(high_object, low_object)
+    use_cache: bool = cache is not None and any(bake_type in BAKE_CACHE_TYPES for bake_type in bake_types)
+    geometry_hash: str | None = get_bake_geometry_hash(high_object, low_object) if use_cache else None
+    results: list[tuple[Image | None, str | None]] = []
+    writes: list[Future] = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for i, bake_type in enumerate(bake_types):
+            key: str | None = None
+            if use_cache and bake_type in BAKE_CACHE_TYPES:
+                key = get_bake_cache_key(geometry_hash, bake_type, width, height, cage_extrusion, max_ray_distance,
+                                         margin, samples, tile_size, bit_depth if tile_size > 0 else 8)
+            if tile_size > 0:
+                bpy.context.scene.cycles.bake_type = bake_type
+                image_name: str = get_bake_image_name(low_object, bake_type, width, height, cage_extrusion,
+                                                      max_ray_distance)
+                filepath: str = get_bake_filepath(directory, image_name, file_format)
+                if key and cache.get(key, filepath):
+                    print(f"{func_id}: [{i + 1}/{len(bake_types)}] Cache Hit ({key[:12]} > {filepath})")
+                else:
+                    print(f"{func_id}: [{i + 1}/{len(bake_types)}] Start a Tiled Bake (type={bake_type}, tile={tile_size})")
+                    bake_tiled(material, low_object, bake_type, filepath, width, height, tile_size, cage_extrusion,
+                               max_ray_distance, margin, bit_depth)
+                    if key:
+                        cache.put(key, filepath)
+                results.append((None, filepath))
+                continue
+
+            if key and directory and file_format == "PNG":
+                image_name: str = get_bake_image_name(low_object, bake_type, width, height, cage_extrusion,
+                                                      max_ray_distance)
+                filepath: str = get_bake_filepath(directory, image_name, file_format)
+                if write_cached_bake(cache, key, filepath, width, height):
+                    results.append((None, filepath))
+                    continue
+
+            image: Image = setup_bake_image(material, low_object, bake_type, width, height, cage_extrusion,
+                                            max_ray_distance)
+            if not fetch_cached_bake(cache, key, image):
+                bpy.context.scene.cycles.bake_type = bake_type
+                print(f"{func_id}: [{i + 1}/{len(bake_types)}] Start a Bake (type={bake_type}, image={image.name})")
+                run_bake(bake_type, width, height, cage_extrusion, max_ray_distance, margin)
+                if not image.has_data:
+                    raise Exception(f"Image was not generated ({image.name})")
+                store_cached_bake(cache, key, image)
+
+            filepath: str | None = get_bake_filepath(directory, image.name, file_format) if directory else None
+            if filepath and file_format == "PNG":
+                print(f"{func_id}: Save an image file in background ({filepath})")
+                writes.append(executor.submit(_write_bake_png, filepath, get_image_pixels(image)))
+            elif filepath:
+                print(f"{func_id}: Save an image file ({filepath})")
+                export_image(image, filepath, file_format)
+            results.append((image, filepath))
+        # 저장 중 발생한 예외를 전달한다.
+        for write in writes:
+            write.result()
+    return results
+
+
+def get_bake_pairs_by_name(objects: list[Object], high_suffix: str = BAKE_HIGH_SUFFIX,
+                           low_suffix: str = BAKE_LOW_SUFFIX) -> list[tuple[Object, Object]]:
+    """이름 규칙(Foo_high, Foo_low)으로 (하이폴, 로우폴) 쌍을 만든다. 대소문자는 구분하지 않는다.
+    짝이 없는 오브젝트는 건너뛴다. 로우폴 이름 순서로 정렬해서 리턴한다.
+    """
+    func_id: str = get_bake_pairs_by_name.__name__
+    highs: dict[str, Object] = {}
+    lows: dict[str, Object] = {}
+    for obj in objects:
+        if obj.type != "MESH":
+            continue
+        name: str = obj.name.lower()
+        if name.endswith(high_suffix.lower()):
+            highs[name[:-len(high_suffix)]] = obj
+        elif name.endswith(low_suffix.lower()):
+            lows[name[:-len(low_suffix)]] = obj
+    for base in sorted(set(highs) ^ set(lows)):
+        print(f"{func_id}: Unpaired Object ({(highs.get(base) or lows.get(base)).name})")
+    return [(highs[base], lows[base]) for base in sorted(set(highs) & set(lows), key=lambda base: lows[base].name)]
+
+
+def get_bake_pairs_by_collection(collections: list[Collection]) -> list[tuple[Object, Object]]:
+    """메쉬 오브젝트가 정확히 두 개 들어있는 컬렉션마다 (하이폴, 로우폴) 쌍을 만든다.
+    폴리곤 수가 많은 것이 하이폴이 된다.
+    """
+    pairs: list[tuple[Object, Object]] = []
+    for collection in collections:
+        mesh_objects = [obj for obj in collection.objects if obj.type == "MESH"]
+        if len(mesh_objects) == 2:
+            pairs.append(sort_high_low(mesh_objects[0], mesh_objects[1]))
+    return pairs
+
+
+def remove_bake_images(low_object: Object, bake_types: list[str], width: int, height: int, cage_extrusion: float,
+                       max_ray_distance: float) -> int:
+    """quick_bake_set()이 로우폴에 만든 베이크 이미지와 텍스쳐 노드들을 지운다. 지운 이미지 수를 리턴한다.
+    파일로 저장한 뒤에는 필요 없으므로, 여러 쌍을 굽는 동안 이미지 버퍼가 쌓이지 않도록 쌍마다 지운다.
+    """
+    for material in get_materials_from_mesh_object(low_object):
+        if material.node_tree is None:
+            continue
+        nodes = material.node_tree.nodes
+        for bake_type in bake_types:
+            node = nodes.get(get_bake_texture_node_name(low_object, bake_type))
+            if node:
+                nodes.remove(node)
+    count: int = 0
+    for bake_type in bake_types:
+        image: Image | None = get_image(get_bake_image_name(low_object, bake_type, width, height, cage_extrusion,
+                                                            max_ray_distance))
+        if image:
+            bpy.data.images.remove(image)
+            count += 1
+    return count
+
+
+def _load_bake_progress(path: str) -> dict:
+    if not path or not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _save_bake_progress(path: str, progress: dict):
+    # 중간에 끊겨도 진행 파일이 깨지지 않게 임시 파일에 쓴 뒤 교체한다.
+    temp_path: str = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(progress, file, ensure_ascii=False, indent=4)
+    os.replace(temp_path, path)
+
+
+def bake_pairs(
+        pairs: list[tuple[Object, Object]],
+        bake_types: list[str],
+        directory: str,
+        width: int = 2048,
+        height: int = 2048,
+        cage_extrusion: float = 0.15,
+        max_ray_distance: float = 0.3,
+        margin: int = 16,
+        file_format: str = "PNG",
+        progress_path: str | None = None,
+        stop_on_error: bool = False,
+        device: str = "GPU",
+        samples: int = 0,
+        threads: int = 0,
+        tile_size: int = 0,
+        cache: FileCache | None = None,
+        bit_depth: int = 8,
+) -> list[BakePairResult]:
+    """여러 (하이폴, 로우폴) 쌍을 차례로 quick_bake_set()으로 굽고 directory에 저장한다.
+
+    progress_path가 주어지면 쌍마다 끝날 때 진행 상황(JSON)을 기록하고, 다시 실행하면 같은 .blend 파일에서 같은 파라미터로
+    이미 끝났고 파일이 남아있는 쌍은 건너뛴다. 쌍마다 걸린 시간과 남은 예상 시간을 출력한다.
+    구운 이미지는 파일로 저장한 뒤 쌍마다 bpy.data에서 지운다.
+    """
+    func_id: str = bake_pairs.__name__
+    os.makedirs(directory, exist_ok=True)
+    progress: dict = _load_bake_progress(progress_path)
+    done: dict = progress.setdefault("done", {})
+    # 파라미터가 바뀌면 이전 결과를 재사용하지 않는다.
+    params: dict = {"bake_types": list(bake_types), "width": width, "height": height, "cage_extrusion": cage_extrusion,
+                    "max_ray_distance": max_ray_distance, "margin": margin, "file_format": file_format, "samples": samples,
+                    "tile_size": tile_size, "bit_depth": bit_depth}
+    # 다른 .blend 파일의 같은 이름의 오브젝트를 이미 구운 것으로 보지 않도록 원본 파일도 기록한다.
+    blend_path: str = bpy.data.filepath
+    results: list[BakePairResult] = []
+    baked_elapsed: list[float] = []
+    start_time: float = time.perf_counter()
+    for i, (high, low) in enumerate(pairs):
+        record: dict | None = done.get(low.name)
+        if record and record.get("high") == high.name and record.get("blend") == blend_path and record.get("params") == params and all(os.path.isfile(path) for path in record["files"]):
+            print(f"{func_id}: [{i + 1}/{len(pairs)}] Skip {high.name} > {low.name} (done)")
+            results.append(BakePairResult(high.name, low.name, True, 0.0, None, record["files"], True))
+            continue
+
+        print(f"{func_id}: [{i + 1}/{len(pairs)}] Bake {high.name} > {low.name}")
+        pair_start_time: float = time.perf_counter()
+        error: str | None = None
+        files: list[str] = []
+        try:
+            baked = quick_bake_set(bake_types, high, low, width, height, cage_extrusion, max_ray_distance, margin,
+                                   directory, file_format, device, samples, threads, tile_size, cache, bit_depth)
+            files = [filepath for _, filepath in baked]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            remove_bake_images(low, bake_types, width, height, cage_extrusion, max_ray_distance)
+        elapsed: float = time.perf_counter() - pair_start_time
+        results.append(BakePairResult(high.name, low.name, error is None, elapsed, error, files, False))
+
+        baked_elapsed.append(elapsed)
+        remaining: int = len(pairs) - i - 1
+        eta: float = sum(baked_elapsed) / len(baked_elapsed) * remaining
+        state: str = "Done" if error is None else f"Failed ({error})"
+        print(f"{func_id}: [{i + 1}/{len(pairs)}] {state} {low.name} ({elapsed:.2f}s, eta: {eta:.0f}s)")
+
+        if error is None and progress_path:
+            done[low.name] = {"high": high.name, "blend": blend_path, "params": params, "files": files,
+                              "elapsed": elapsed}
+            _save_bake_progress(progress_path, progress)
+        if error and stop_on_error:
+            break
+
+    succeeded: int = sum(1 for result in results if result.success)
+    skipped: int = sum(1 for result in results if result.skipped)
+    print(f"{func_id}: Finished ({succeeded}/{len(results)} succeeded, {skipped} skipped, {time.perf_counter() - start_time:.2f}s)")
+    return results
+
+
+def sort_high_low(a: Object, b: Object) -> tuple[Object, Object]:
+    """폴리곤 수가 많은 것이 하이폴이 되는 (하이폴, 로우폴) 튜플을 리턴한다.
+    """
+    if len(a.data.polygons) > len(b.data.polygons):
+        return (a, b)
+    return (b, a)
+
+
 def get_selected_high_low() -> tuple | None:
     """선택된 메쉬 오브젝트에서 하이폴, 로우폴 순서로 된 튜플을 리턴한다.
     """
@@ -132,17 +733,8 @@ def get_selected_high_low() -> tuple | None:
     elif len(mesh_objects) < 2:
         return None
 
-    high, low = None, None
-
     # 폴리곤 수 가 많은 것이 하이폴이 되고 나머지가 로우폴이 된다.
-    if len(mesh_objects[0].data.polygons) > len(mesh_objects[1].data.polygons):
-        high = mesh_objects[0]
-        low = mesh_objects[1]
-    else:
-        high = mesh_objects[1]
-        low = mesh_objects[0]
-
-    return (high, low)
+    return sort_high_low(mesh_objects[0], mesh_objects[1])
 
 
 class QuickBakeNormal(Operator):
@@ -151,11 +743,21 @@ class QuickBakeNormal(Operator):
     bl_idname = "object.quick_bake_normal"
     bl_label = "Quick Bake Normal"
 
-    width: IntProperty(name="Width", default=1024, min=64, max=8192)
-    height: IntProperty(name="Height", default=1024, min=64, max=8192)
+    width: IntProperty(name="Width", default=1024, min=64, max=16384)
+    height: IntProperty(name="Height", default=1024, min=64, max=16384)
+    tile_size: IntProperty(name="Tile Size", description="Bake in tiles of this size and save PNG directly (0: off)",
+                           default=0, min=0, max=8192)
+    bit_depth: EnumProperty(
+        name="Bit Depth",
+        description="PNG bit depth of tiled bakes",
+        items=[(str(bit_depth), f"{bit_depth}-bit", f"{bit_depth}-bit PNG") for bit_depth in BAKE_BIT_DEPTHS],
+        default="8",
+    )
     cage_extrusion: FloatProperty(name="Cage Extrusion", default=0.15, min=0.01)
     max_ray_distance: FloatProperty(name="Max Ray Distance Extrusion", default=0.3, min=0.01, max=128)
     margin: IntProperty(name="Margin (px)", default=16, min=1, max=64)
+    use_cache: BoolProperty(name="Use Cache", description="Reuse previous results for unchanged meshes and settings",
+                            default=False)
     filepath: StringProperty(
         name="File Path",
         description="Save filepath",
@@ -186,12 +788,28 @@ class QuickBakeNormal(Operator):
             self.report({"WARNING"}, "Filepath is empty")
             return {"CANCELLED"}
 
+        if self.tile_size <= 0 and max(self.width, self.height) > BAKE_MAX_IMAGE_SIZE:
+            self.report({"WARNING"}, f"Images larger than {BAKE_MAX_IMAGE_SIZE} need a tile size")
+            return {"CANCELLED"}
+
         # 선택한 오브젝트 중에서 하이폴과 로우폴 메쉬 오브젝트를 얻는다.
         high, low = get_selected_high_low()
 
         # 굽는다.
         bake_type = "NORMAL"
-        image: Image = quick_bake(
+        if self.tile_size > 0:
+            return self.execute_tiled(high, low, bake_type)
+
+        # 저장할 파일 경로를 정한다.
+        filepath: str = self.filepath
+
+        # 파일 경로가 디렉토리인 경우 파일명이 자동으로 지정된다.
+        if os.path.isdir(filepath):
+            image_name: str = get_bake_image_name(low, bake_type, self.width, self.height, self.cage_extrusion,
+                                                  self.max_ray_distance)
+            filepath = get_bake_filepath(filepath, image_name, self.file_format)
+
+        image: Image | None = quick_bake(
             bake_type=bake_type,
             high_object=high,
             low_object=low,
@@ -199,23 +817,231 @@ class QuickBakeNormal(Operator):
             height=self.height,
             cage_extrusion=self.cage_extrusion,
             max_ray_distance=self.max_ray_distance,
-            margin=self.margin
+            margin=self.margin,
+            cache=get_bake_cache() if self.use_cache else None,
+            png_filepath=filepath if self.file_format == "PNG" else None,
         )
 
+        # 캐시에서 파일로 바로 저장된 경우.
+        if image is None:
+            self.report({"INFO"}, f"{self.bl_label}: Image Generated from Cache ({filepath})")
+            return {"FINISHED"}
+
         if not image.has_data:
             self.report({"ERROR"}, f"{self.bl_label}: Image was not generated ({image.name})")
             return {"CANCELLED"}
 
-        # 옵션에 따라 파일을 저장한다.
-        filepath: str = self.filepath
-
-        # 파일 경로가 디렉토리인 경우 파일명이 자동으로 지정된다.
-        if os.path.isdir(filepath):
-            ext = file_format_to_ext(self.file_format)
-            # 경로를 정규화하고 POSIX 형태로 마무리.
-            filepath = os.path.normpath(os.path.join(filepath, f"{filepath}/{image.name}.{ext}")).replace("\\", "/")
         print(f"{self.bl_label}: Save an image file ({filepath})")
         export_image(image, filepath, self.file_format)
 
         self.report({"INFO"}, f"{self.bl_label}: Image Generated ({filepath})")
         return {"FINISHED"}
+
+    def execute_tiled(self, high: Object, low: Object, bake_type: str):
+        """이미지 블럭을 만들지 않고 타일 단위로 구워 PNG로 바로 저장한다.
+        """
+        if self.file_format != "PNG":
+            self.report({"WARNING"}, "Tiled bake supports PNG only")
+            return {"CANCELLED"}
+        filepath: str = self.filepath
+        if os.path.isdir(filepath):
+            image_name: str = get_bake_image_name(low, bake_type, self.width, self.height, self.cage_extrusion,
+                                                  self.max_ray_distance)
+            filepath = get_bake_filepath(filepath, image_name, self.file_format)
+        quick_bake_tiled(
+            bake_type=bake_type,
+            high_object=high,
+            low_object=low,
+            filepath=filepath,
+            width=self.width,
+            height=self.height,
+            tile_size=self.tile_size,
+            cage_extrusion=self.cage_extrusion,
+            max_ray_distance=self.max_ray_distance,
+            margin=self.margin,
+            bit_depth=int(self.bit_depth),
+            cache=get_bake_cache() if self.use_cache else None
+        )
+        self.report({"INFO"}, f"{self.bl_label}: Image Generated ({filepath})")
+        return {"FINISHED"}
+
+
+class QuickBakeSet(Operator):
+    """Highpoly의 메쉬를 Lowpoly에 여러 베이크 타입(Normal, AO, Position...)으로 한 번에 굽는다.
+    """
+    bl_idname = "object.quick_bake_set"
+    bl_label = "Quick Bake Set"
+
+    bake_types: EnumProperty(
+        name="Bake Types",
+        items=[(bake_type, bake_type.capitalize(), f"{bake_type.capitalize()} pass") for bake_type in BAKE_SET_TYPES],
+        options={"ENUM_FLAG"},
+        default={"NORMAL", "AO", "POSITION"},
+    )
+    width: IntProperty(name="Width", default=1024, min=64, max=16384)
+    height: IntProperty(name="Height", default=1024, min=64, max=16384)
+    tile_size: IntProperty(name="Tile Size", description="Bake in tiles of this size and save PNG directly (0: off)",
+                           default=0, min=0, max=8192)
+    bit_depth: EnumProperty(
+        name="Bit Depth",
+        description="PNG bit depth of tiled bakes",
+        items=[(str(bit_depth), f"{bit_depth}-bit", f"{bit_depth}-bit PNG") for bit_depth in BAKE_BIT_DEPTHS],
+        default="8",
+    )
+    cage_extrusion: FloatProperty(name="Cage Extrusion", default=0.15, min=0.01)
+    max_ray_distance: FloatProperty(name="Max Ray Distance Extrusion", default=0.3, min=0.01, max=128)
+    margin: IntProperty(name="Margin (px)", default=16, min=1, max=64)
+    use_cache: BoolProperty(name="Use Cache", description="Reuse previous results for unchanged meshes and settings",
+                            default=False)
+    directory: StringProperty(
+        name="Directory",
+        description="Save directory",
+        default="",
+        subtype="DIR_PATH",
+    )
+    file_format: EnumProperty(
+        name="File Format",
+        items=[
+            ("PNG", "PNG", "PNG image format"),
+            ("JPEG", "JPEG", "JPG image format"),
+            ("TARGA", "TARGA", "TGA image format"),
+            ("TIFF", "TIFF", "TIF image format"),
+            ("WEBP", "WEBP", "WEBP image format"),
+        ],
+        default="PNG"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return True if is_object_mode() and get_selected_high_low() else False
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        if not self.directory or not os.path.isdir(self.directory):
+            self.report({"WARNING"}, "Directory is empty or does not exist")
+            return {"CANCELLED"}
+        if len(self.bake_types) == 0:
+            self.report({"WARNING"}, "No bake types")
+            return {"CANCELLED"}
+        if self.tile_size <= 0 and max(self.width, self.height) > BAKE_MAX_IMAGE_SIZE:
+            self.report({"WARNING"}, f"Images larger than {BAKE_MAX_IMAGE_SIZE} need a tile size")
+            return {"CANCELLED"}
+
+        high, low = get_selected_high_low()
+        # ENUM_FLAG는 set이므로 목록 순서대로 굽는다.
+        bake_types: list[str] = [bake_type for bake_type in BAKE_SET_TYPES if bake_type in self.bake_types]
+        try:
+            results = quick_bake_set(
+                bake_types=bake_types,
+                high_object=high,
+                low_object=low,
+                width=self.width,
+                height=self.height,
+                cage_extrusion=self.cage_extrusion,
+                max_ray_distance=self.max_ray_distance,
+                margin=self.margin,
+                directory=self.directory,
+                file_format=self.file_format,
+                tile_size=self.tile_size,
+                bit_depth=int(self.bit_depth),
+                cache=get_bake_cache() if self.use_cache else None,
+            )
+        except Exception as e:
+            self.report({"ERROR"}, f"{self.bl_label}: {e}")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"{self.bl_label}: {len(results)} Images Generated ({self.directory})")
+        return {"FINISHED"}
+
+
+class BatchQuickBake(Operator):
+    """이름 규칙(*_high, *_low)이나 컬렉션으로 짝지은 여러 하이폴/로우폴 쌍을 차례로 굽는다.
+    선택한 오브젝트가 없으면 씬의 모든 메쉬 오브젝트를 대상으로 한다.
+    """
+    bl_idname = "object.batch_quick_bake"
+    bl_label = "Batch Quick Bake"
+
+    pairing: EnumProperty(
+        name="Pairing",
+        items=[
+            ("NAME", "Name", f"Pair objects named *{BAKE_HIGH_SUFFIX} and *{BAKE_LOW_SUFFIX}"),
+            ("COLLECTION", "Collection", "Pair the two mesh objects in each collection"),
+        ],
+        default="NAME",
+    )
+    bake_types: EnumProperty(
+        name="Bake Types",
+        items=[(bake_type, bake_type.capitalize(), f"{bake_type.capitalize()} pass") for bake_type in BAKE_SET_TYPES],
+        options={"ENUM_FLAG"},
+        default={"NORMAL"},
+    )
+    width: IntProperty(name="Width", default=1024, min=64, max=16384)
+    height: IntProperty(name="Height", default=1024, min=64, max=16384)
+    tile_size: IntProperty(name="Tile Size", description="Bake in tiles of this size and save PNG directly (0: off)",
+                           default=0, min=0, max=8192)
+    bit_depth: EnumProperty(
+        name="Bit Depth",
+        description="PNG bit depth of tiled bakes",
+        items=[(str(bit_depth), f"{bit_depth}-bit", f"{bit_depth}-bit PNG") for bit_depth in BAKE_BIT_DEPTHS],
+        default="8",
+    )
+    cage_extrusion: FloatProperty(name="Cage Extrusion", default=0.15, min=0.01)
+    max_ray_distance: FloatProperty(name="Max Ray Distance Extrusion", default=0.3, min=0.01, max=128)
+    margin: IntProperty(name="Margin (px)", default=16, min=1, max=64)
+    use_cache: BoolProperty(name="Use Cache", description="Reuse previous results for unchanged meshes and settings",
+                            default=False)
+    directory: StringProperty(
+        name="Directory",
+        description="Save directory",
+        default="",
+        subtype="DIR_PATH",
+    )
+    resume: BoolProperty(name="Resume", description="Skip pairs already baked in a previous run", default=True)
+
+    @classmethod
+    def poll(cls, context):
+        return is_object_mode()
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        if not self.directory or not os.path.isdir(self.directory):
+            self.report({"WARNING"}, "Directory is empty or does not exist")
+            return {"CANCELLED"}
+        if len(self.bake_types) == 0:
+            self.report({"WARNING"}, "No bake types")
+            return {"CANCELLED"}
+        if self.tile_size <= 0 and max(self.width, self.height) > BAKE_MAX_IMAGE_SIZE:
+            self.report({"WARNING"}, f"Images larger than {BAKE_MAX_IMAGE_SIZE} need a tile size")
+            return {"CANCELLED"}
+
+        objects: list[Object] = get_selected_objects_by_type("MESH") or [
+            obj for obj in context.scene.objects if obj.type == "MESH"]
+        if self.pairing == "NAME":
+            pairs = get_bake_pairs_by_name(objects)
+        else:
+            collections: list[Collection] = list(dict.fromkeys(
+                collection for obj in objects for collection in obj.users_collection))
+            pairs = get_bake_pairs_by_collection(collections)
+        if len(pairs) == 0:
+            self.report({"WARNING"}, "No high/low pairs")
+            return {"CANCELLED"}
+
+        progress_path: str = os.path.join(self.directory, BAKE_PROGRESS_FILENAME)
+        if not self.resume and os.path.isfile(progress_path):
+            os.remove(progress_path)
+        bake_types: list[str] = [bake_type for bake_type in BAKE_SET_TYPES if bake_type in self.bake_types]
+        results = bake_pairs(pairs, bake_types, self.directory, self.width, self.height, self.cage_extrusion,
+                             self.max_ray_distance, self.margin, progress_path=progress_path,
+                             tile_size=self.tile_size, bit_depth=int(self.bit_depth),
+                             cache=get_bake_cache() if self.use_cache else None)
+
+        failed: int = sum(1 for result in results if not result.success)
+        if failed > 0:
+            self.report({"WARNING"}, f"{self.bl_label}: {failed}/{len(results)} pairs failed")
+        else:
+            self.report({"INFO"}, f"{self.bl_label}: {len(results)} pairs baked ({self.directory})")
+        return {"FINISHED"}
@@ -1,25 +1,122 @@
 from abc import ABC, abstractmethod
 
 import bpy
-from bpy.props import EnumProperty, IntProperty, FloatProperty
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.props import BoolProperty, EnumProperty, IntProperty, FloatProperty
 from bpy.types import Object, Operator, LatticeModifier
-
-from ..functions.context import is_object_mode, is_editmesh_mode, get_selected_objects
-from ..functions.mesh import remove_vertex_group
-from ..functions.modifier import apply_modifier, remove_modifier, get_modifier_by_name
+from mathutils import Euler, Matrix
+
+from ..functions.context import (
+    is_object_mode, is_editmesh_mode, get_selected_objects,
+    set_object_mode, set_edit_mode, deselect_all, select_objects, set_active_object,
+)
+from ..functions.mesh import remove_vertex_group, get_vertex_positions, get_evaluated_vertex_positions
+from ..functions.modifier import (
+    apply_modifier, remove_modifier, get_modifier_by_name,
+    apply_modifier_batch, remove_modifier_batch,
+)
 from ..functions.obj import delete_object
 
 LATTICE_MODIFIER_NAME = "SimpleLattice"
 
 
+# LatticeObject -> QuickLattice 모디파이어로 참조하는 오브젝트들의 역색인.
+# 이름 변경이나 Undo로 인한 재할당에도 바뀌지 않는 session_uid를 키로 사용하고,
+# depsgraph 갱신 때 갱신된 오브젝트의 항목만 고친다. 오브젝트 수가 바뀌면(추가/삭제) 다음 조회 때 전체를 다시 만든다.
+_lattice_index: dict | None = None
+
+
+def _find_quick_lattice_modifier(obj: Object) -> LatticeModifier | None:
+    for modifier in obj.modifiers:
+        if modifier.type == "LATTICE" and modifier.name == LATTICE_MODIFIER_NAME:
+            return modifier
+    return None
+
+
+def _update_lattice_index_object(index: dict, obj: Object):
+    """한 오브젝트의 역색인 항목을 모디파이어 상태에 맞게 고친다.
+    """
+    uid: int = obj.session_uid
+    index["names"][uid] = obj.name
+    if uid in index["lattice_of"]:
+        old_lattice_uid: int | None = index["lattice_of"].pop(uid)
+        if old_lattice_uid is not None:
+            index["users"].get(old_lattice_uid, set()).discard(uid)
+    modifier = _find_quick_lattice_modifier(obj) if obj.type == "MESH" else None
+    if modifier is None:
+        return
+    lattice_object = modifier.object
+    if lattice_object is None:
+        index["lattice_of"][uid] = None
+        return
+    lattice_uid: int = lattice_object.session_uid
+    index["names"][lattice_uid] = lattice_object.name
+    index["lattice_of"][uid] = lattice_uid
+    index["users"].setdefault(lattice_uid, set()).add(uid)
+
+
+def _build_lattice_index() -> dict:
+    index: dict = {"users": {}, "lattice_of": {}, "names": {}, "object_count": len(bpy.data.objects)}
+    for obj in bpy.data.objects:
+        _update_lattice_index_object(index, obj)
+    return index
+
+
+def _get_lattice_index() -> dict:
+    global _lattice_index
+    if _lattice_index is None or _lattice_index["object_count"] != len(bpy.data.objects):
+        _lattice_index = _build_lattice_index()
+    return _lattice_index
+
+
+def _refresh_lattice_index(obj: Object):
+    """오퍼레이터 안에서 모디파이어를 바꾼 직후 depsgraph 갱신을 기다리지 않고 역색인에 반영한다.
+    """
+    if _lattice_index is not None:
+        _update_lattice_index_object(_lattice_index, obj)
+
+
+def _invalidate_lattice_index():
+    global _lattice_index
+    _lattice_index = None
+
+
+@persistent
+def _on_lattice_index_depsgraph_update(scene, depsgraph):
+    if _lattice_index is None:
+        return
+    if _lattice_index["object_count"] != len(bpy.data.objects):
+        _invalidate_lattice_index()
+        return
+    for update in depsgraph.updates:
+        # 트랜스폼만 바뀐 갱신은 모디파이어와 무관하므로 건너뛴다.
+        if isinstance(update.id, Object) and not (update.is_updated_transform and not update.is_updated_geometry):
+            _update_lattice_index_object(_lattice_index, update.id.original)
+
+
+@persistent
+def _on_lattice_index_reset(*args):
+    _invalidate_lattice_index()
+
+
 def _get_related_objects_from_lattice_object(lattice_object: Object) -> list[Object]:
     """LatticeObject와 연결된 MeshObject들을 리턴한다.
     """
-    results: list[Object] = []
-    for obj in bpy.data.objects:
-        for modifier in obj.modifiers:
-            if modifier.type == "LATTICE" and modifier.object == lattice_object and modifier.name == LATTICE_MODIFIER_NAME:
+    for _ in range(2):
+        index: dict = _get_lattice_index()
+        results: list[Object] = []
+        for uid in index["users"].get(lattice_object.session_uid, ()):
+            obj = bpy.data.objects.get(index["names"].get(uid, ""))
+            # 이름이 바뀐 뒤 아직 갱신되지 않은 항목이 있으면 역색인을 다시 만들어서 다시 찾는다.
+            if obj is None or obj.session_uid != uid:
+                _invalidate_lattice_index()
+                break
+            modifier = _find_quick_lattice_modifier(obj)
+            if modifier and modifier.object == lattice_object:
                 results.append(obj)
+        else:
+            return results
     return results
 
 
@@ -42,22 +139,13 @@ def _is_lattice_object(obj: Object) -> bool:
 def _is_lattice_assigned_mesh_object(obj: Object) -> bool:
     """Lattice 모디파이어를 사용 중인가?
     """
-    if obj.type == "MESH":
-        for modifier in obj.modifiers:
-            if modifier.type == "LATTICE" and modifier.name == LATTICE_MODIFIER_NAME:
-                return True
-    return False
+    return True if obj.type == "MESH" and obj.session_uid in _get_lattice_index()["lattice_of"] else False
 
 
 def _get_lattice_object_user_count(lattice_object: Object) -> int:
     """이 Lattice오브젝트를 모디파이어에서 참조하는 다른 오브젝트들의 수를 리턴한다.
     """
-    count: int = 0
-    for obj in bpy.data.objects:
-        for modifier in obj.modifiers:
-            if modifier.type == "LATTICE" and modifier.object == lattice_object and modifier.name == LATTICE_MODIFIER_NAME:
-                count += 1
-    return count
+    return len(_get_related_objects_from_lattice_object(lattice_object))
 
 
 def apply_quick_lattice_modifier_decorator(func):
@@ -88,9 +176,113 @@ def _remove_quick_lattice_modifier(obj: Object):
     remove_modifier(obj, LATTICE_MODIFIER_NAME)
 
 
-class CreateQuickLattice(Operator):
-    """QuickLattice
+def _get_quick_lattice_vertex_groups(objects: list[Object]) -> dict[Object, str]:
+    """모디파이어를 처리하기 전에 각 오브젝트의 Lattice 모디파이어가 사용하는 VertexGroup 이름을 모아둔다.
+    """
+    results: dict[Object, str] = {}
+    for obj in objects:
+        modifier: LatticeModifier = get_modifier_by_name(obj, LATTICE_MODIFIER_NAME)
+        if modifier and modifier.vertex_group != "":
+            results[obj] = modifier.vertex_group
+    return results
+
+
+def _apply_quick_lattice_modifiers(objects: list[Object]) -> list[Object]:
+    """여러 MeshObject의 Lattice모디파이어를 한 번의 depsgraph 평가로 적용시킨다.
+    일괄 적용할 수 없는 오브젝트(ShapeKey, 공유 메시 등)는 오퍼레이터로 하나씩 적용한다. 오퍼레이터로 처리한 오브젝트들을 리턴한다.
+    """
+    vertex_groups = _get_quick_lattice_vertex_groups(objects)
+    fallback_objects = apply_modifier_batch(objects, LATTICE_MODIFIER_NAME)
+    for obj in objects:
+        if obj in fallback_objects:
+            _apply_quick_lattice_modifier(obj)
+        elif obj in vertex_groups:
+            remove_vertex_group(obj, vertex_groups[obj])
+    return fallback_objects
+
+
+def _remove_quick_lattice_modifiers(objects: list[Object]):
+    """여러 MeshObject의 Lattice모디파이어를 적용하지 않고 한 번에 제거한다.
+    """
+    vertex_groups = _get_quick_lattice_vertex_groups(objects)
+    remove_modifier_batch(objects, LATTICE_MODIFIER_NAME)
+    for obj, vg_name in vertex_groups.items():
+        remove_vertex_group(obj, vg_name)
+
+
+def _get_orientation_axes(points: np.ndarray, orientation: str, reference: Object | None) -> np.ndarray:
+    """Lattice의 축(3x3 회전 행렬, 열이 각 축)을 리턴한다.
+    NORMAL은 점들의 공분산 행렬 고유벡터(PCA)를 분산이 큰 순서로 X, Y, Z 축으로 사용한다.
+    """
+    match orientation:
+        case "LOCAL" if reference is not None:
+            axes = np.array(reference.matrix_world.to_3x3().normalized(), dtype=np.float64)
+        case "CURSOR":
+            axes = np.array(bpy.context.scene.cursor.matrix.to_3x3().normalized(), dtype=np.float64)
+        case "NORMAL" if len(points) >= 3:
+            centered = points - points.mean(axis=0)
+            eigenvalues, eigenvectors = np.linalg.eigh(centered.T @ centered)
+            axes = eigenvectors[:, np.argsort(eigenvalues)[::-1]]
+            # 고유벡터의 부호는 임의이므로 가장 큰 성분이 양수가 되게 맞추고, Z축은 오른손 좌표계가 되게 다시 구한다.
+            for i in range(2):
+                if axes[np.argmax(np.abs(axes[:, i])), i] < 0:
+                    axes[:, i] = -axes[:, i]
+            axes[:, 2] = np.cross(axes[:, 0], axes[:, 1])
+        case _:
+            axes = np.identity(3)
+    return axes
+
+
+def _fit_lattice_matrix(points: np.ndarray, axes: np.ndarray) -> Matrix:
+    """축 방향으로 점들을 감싸는 박스(OBB)에 맞는 Lattice의 월드 행렬을 리턴한다.
+    Lattice 포인트는 로컬 -0.5 ~ 0.5 범위에 있으므로 박스 크기를 그대로 스케일로 쓴다.
+    """
+    local = points @ axes
+    minimum, maximum = local.min(axis=0), local.max(axis=0)
+    size = maximum - minimum
+    # 평평한 선택 영역에서 두께가 0이 되지 않게 한다.
+    size = np.maximum(size, max(size.max() * 0.01, 1e-4))
+    matrix = np.identity(4)
+    matrix[:3, :3] = axes * size
+    matrix[:3, 3] = axes @ ((minimum + maximum) * 0.5)
+    return Matrix(matrix.tolist())
+
+
+def _get_selected_vertex_indices(obj: Object) -> np.ndarray:
+    vertices = obj.data.vertices
+    selection = np.empty(len(vertices), dtype=bool)
+    vertices.foreach_get("select", selection)
+    return np.flatnonzero(selection)
+
+
+def create_lattice(name: str, matrix: Matrix, resolution: tuple[int, int, int],
+                   interpolation: str = "KEY_LINEAR") -> Object:
+    """LatticeObject를 데이터 API로 만들어 현재 Collection에 넣는다.
+    """
+    lattice = bpy.data.lattices.new(name)
+    lattice.points_u, lattice.points_v, lattice.points_w = resolution
+    lattice.interpolation_type_u = lattice.interpolation_type_v = lattice.interpolation_type_w = interpolation
+    lattice_object = bpy.data.objects.new(name, lattice)
+    lattice_object.matrix_world = matrix
+    bpy.context.collection.objects.link(lattice_object)
+    return lattice_object
+
+
+def assign_quick_lattice(obj: Object, lattice_object: Object, vertex_indices: np.ndarray | None = None) -> LatticeModifier:
+    """MeshObject에 QuickLattice 모디파이어를 추가한다.
+    vertex_indices가 주어지면 해당 버텍스들만 영향을 받도록 VertexGroup을 만들어 지정한다.
+    """
+    modifier: LatticeModifier = obj.modifiers.new(name=LATTICE_MODIFIER_NAME, type="LATTICE")
+    modifier.object = lattice_object
+    if vertex_indices is not None:
+        vertex_group = obj.vertex_groups.new(name=LATTICE_MODIFIER_NAME)
+        vertex_group.add(vertex_indices.tolist(), 1.0, "REPLACE")
+        modifier.vertex_group = vertex_group.name
+    return modifier
 
+
+class CreateQuickLattice(Operator):
+    """선택된 MeshObject들 또는 에디트 모드에서 선택된 버텍스들을 감싸는 Lattice를 만들고 Lattice 모디파이어를 연결한다.
     """
     bl_idname = "object.create_quick_lattice"
     bl_label = "Quick Lattice"
@@ -112,6 +304,7 @@ class CreateQuickLattice(Operator):
     rotation_x: FloatProperty(name="X", subtype="ANGLE", default=0.0, step=100.0, precision=4, options={"SKIP_SAVE"})
     rotation_y: FloatProperty(name="Y", subtype="ANGLE", default=0.0, step=100.0, precision=4, options={"SKIP_SAVE"})
     rotation_z: FloatProperty(name="Z", subtype="ANGLE", default=0.0, step=100.0, precision=4, options={"SKIP_SAVE"})
+    per_object: BoolProperty(name="Per Object", description="Create a lattice for each object", default=False)
 
     @classmethod
     def poll(cls, context):
@@ -124,20 +317,58 @@ class CreateQuickLattice(Operator):
         return True if (is_object_mode() or is_editmesh_mode()) and len(selected_mesh_objects) > 0 and len(
             lattice_related_objects) <= 0 else False
 
+    def _create(self, targets: list[tuple[Object, np.ndarray | None]], reference: Object | None) -> Object:
+        """대상 MeshObject들(버텍스 선택이 있으면 해당 버텍스만)을 감싸는 Lattice를 만들고 모디파이어를 연결한다.
+        오브젝트 전체를 감쌀 때는 보이는 모양을 감싸도록 모디파이어가 적용된 평가 메시로 맞춘다.
+        선택된 버텍스는 평가 메시의 버텍스와 대응되지 않으므로 원본 메시의 좌표로 맞춘다.
+        """
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        points = np.concatenate([
+            get_vertex_positions(obj)[indices] if indices is not None else get_evaluated_vertex_positions(obj, depsgraph)
+            for obj, indices in targets
+        ]).astype(np.float64)
+        axes = _get_orientation_axes(points, self.orientation, reference)
+        rotation = np.array(Euler((self.rotation_x, self.rotation_y, self.rotation_z)).to_matrix(), dtype=np.float64)
+        axes = axes @ rotation
+        lattice_object = create_lattice(f"{targets[0][0].name}_{LATTICE_MODIFIER_NAME}",
+                                        _fit_lattice_matrix(points, axes),
+                                        (self.resolution_u, self.resolution_v, self.resolution_w))
+        for obj, indices in targets:
+            assign_quick_lattice(obj, lattice_object, indices)
+        return lattice_object
+
     def execute(self, context):
-        # TODO: 지금은 SimpleQuickLattice를 사용해서 생성하지만 추후에는 자체 오퍼레이터로 해결할 수 있어야 함.
-        try:
-            bpy.ops.object.op_lattice_create(
-                orientation=self.orientation,
-                ignore_mods=False,
-                resolution_u=self.resolution_u, resolution_v=self.resolution_v, resolution_w=self.resolution_w,
-                interpolation="KEY_LINEAR",
-                scale=1, tweak_angles=False,
-                rot_x=self.rotation_x, rot_y=self.rotation_y, rot_z=self.rotation_z
-            )
-        except:
-            self.report({"ERROR"}, f"SimpleQuickLattice Required (https://github.com/BenjaminSauder/SimpleLattice)")
+        edit_mode: bool = is_editmesh_mode()
+        mesh_objects = [obj for obj in get_selected_objects() if obj.type == "MESH"]
+        reference = context.active_object if context.active_object in mesh_objects else mesh_objects[0]
+
+        # 에디트 모드에서는 선택된 버텍스만 대상으로 한다. 선택 정보를 메시에 반영하고 VertexGroup을 추가하기 위해 오브젝트 모드로 바꾼다.
+        targets: list[tuple[Object, np.ndarray | None]] = []
+        if edit_mode:
+            set_object_mode()
+            for obj in mesh_objects:
+                indices = _get_selected_vertex_indices(obj)
+                if len(indices) > 0:
+                    targets.append((obj, indices))
+        else:
+            targets = [(obj, None) for obj in mesh_objects if len(obj.data.vertices) > 0]
+        if len(targets) == 0:
+            if edit_mode:
+                set_edit_mode()
+            self.report({"ERROR"}, "No vertices to fit")
             return {"CANCELLED"}
+
+        if self.per_object:
+            lattice_objects = [self._create([target], target[0]) for target in targets]
+        else:
+            lattice_objects = [self._create(targets, reference)]
+
+        deselect_all()
+        select_objects(lattice_objects)
+        set_active_object(lattice_objects[-1])
+        if len(lattice_objects) == 1:
+            set_edit_mode()
+        self.report({"INFO"}, f"Lattice created ({len(lattice_objects)} lattices, {len(targets)} objects)")
         return {"FINISHED"}
 
 
@@ -149,6 +380,12 @@ class ModifyQuickLattice(Operator):
     def modify(self, obj):
         raise NotImplementedError
 
+    def modify_batch(self, objects: list[Object]):
+        """여러 오브젝트를 한 번에 처리한다. 일괄 처리 경로가 있는 하위 클래스는 재정의한다.
+        """
+        for obj in objects:
+            self.modify(obj)
+
     @classmethod
     def poll(cls, context):
         """오브젝트 모드여야 하며, 선택된 오브젝트 중 한 개 이상의 Lattice관련 오브젝트가 있어야 함.
@@ -176,9 +413,10 @@ class ModifyQuickLattice(Operator):
         lattice_objects = set(lattice_objects_a) | set(lattice_objects_b)
 
         # Mesh오브젝트들의 Modifier를 적용Apply 또는 제거Remove 한다.
-        objects = set(objects_from_selected_lattice_objects) | set(mesh_objects_from_selection)
+        objects = list(set(objects_from_selected_lattice_objects) | set(mesh_objects_from_selection))
+        self.modify_batch(objects)
         for obj in objects:
-            self.modify(obj)
+            _refresh_lattice_index(obj)
 
         # 불필요해진 LatticeControlObject들을 제거한다.
         unused_lattice_objects = [obj for obj in lattice_objects if _get_lattice_object_user_count(obj) <= 0]
@@ -198,6 +436,11 @@ class ApplyQuickLattice(ModifyQuickLattice):
     def modify(self, obj):
         _apply_quick_lattice_modifier(obj)
 
+    def modify_batch(self, objects: list[Object]):
+        fallback_objects = _apply_quick_lattice_modifiers(objects)
+        if fallback_objects:
+            self.report({"INFO"}, f"Applied with operator ({len(fallback_objects)} of {len(objects)} objects)")
+
 
 class RemoveQuickLattice(ModifyQuickLattice):
     """선택된 오브젝트와 관련된 LatticeModifier를 제거하고 정리한다.
@@ -208,3 +451,26 @@ class RemoveQuickLattice(ModifyQuickLattice):
 
     def modify(self, obj):
         _remove_quick_lattice_modifier(obj)
+
+    def modify_batch(self, objects: list[Object]):
+        _remove_quick_lattice_modifiers(objects)
+
+
+def register():
+    handlers = bpy.app.handlers
+    if _on_lattice_index_depsgraph_update not in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.append(_on_lattice_index_depsgraph_update)
+    for handler_list in (handlers.load_post, handlers.undo_post, handlers.redo_post):
+        if _on_lattice_index_reset not in handler_list:
+            handler_list.append(_on_lattice_index_reset)
+    _invalidate_lattice_index()
+
+
+def unregister():
+    handlers = bpy.app.handlers
+    if _on_lattice_index_depsgraph_update in handlers.depsgraph_update_post:
+        handlers.depsgraph_update_post.remove(_on_lattice_index_depsgraph_update)
+    for handler_list in (handlers.load_post, handlers.undo_post, handlers.redo_post):
+        if _on_lattice_index_reset in handler_list:
+            handler_list.remove(_on_lattice_index_reset)
+    _invalidate_lattice_index()
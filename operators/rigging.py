@@ -1,17 +1,22 @@
 import bpy
-from bpy.props import BoolProperty, StringProperty
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
 from bpy.types import Object, Operator, Collection, Armature
 
 from ..functions.context import (
     get_selected_objects, get_selected_object_by_type, get_selected_objects_by_type,
     select_objects, deselect_all,
     set_active_object,
-    is_object_mode,
+    is_object_mode, is_mode,
 )
 from ..functions.rigging import (
     is_rig_attached, detach_rigmesh, attach_rigmesh,
     remove_armature_modifiers, remove_vertex_groups,
     save_object_vertex_groups, load_object_vertex_groups,
+    save_vertex_groups_batch, load_vertex_groups_batch,
+    save_vertex_group_snapshot, load_vertex_group_snapshot, get_vertex_group_snapshots,
+    print_vertex_groups,
+    clean_vertex_group_weights,
+    get_armature_objects, get_armature_users,
     has_vertex_groups
 )
 
@@ -92,22 +97,24 @@ class RemoveGeneratedRig(Operator):
                 has_wgts = True
 
         # RIG-로 시작하는 Armature가 있다면 True
-        armatures: list[Armature] = [obj for obj in bpy.data.objects if obj.type == "ARMATURE"]
-        for armature in armatures:
+        for armature in get_armature_objects():
             if armature.name.startswith("RIG-"):
                 has_rig_armature = True
+                break
 
         return has_wgts or has_rig_armature
 
     def _remove_rig_armature(self, armature: Armature):
         """RIG-로 시작하는 Armature를 제거한다.
-        동시에 Armature에 Parent되어 있던 Mesh Object들을 Unparent하고
+        동시에 Armature에 Parent되어 있거나 Armature 모디파이어로 연결되어 있던 Mesh Object들을 Unparent하고
         Mesh Object에 남겨진 ArmatureModifier와 VertexGroup등을 옵션에 따라 제거한다.
         """
         mesh_objects: list[Object] = [obj for obj in armature.children if obj.type == "MESH"]
+        mesh_objects += [obj for obj in get_armature_users(armature) if obj not in mesh_objects]
         for obj in mesh_objects:
             # RIG-Armature에 Parent되어있던 Mesh들을 Unparent한다.
-            obj.parent = None
+            if obj.parent == armature:
+                obj.parent = None
 
             # 필요시 Armature Modifier를 제거한다.
             # 참고로 RIG-Armature가 제거되면 이 Modifier의 object 프로퍼티는 Null이 된 상태로 유지된다.
@@ -128,8 +135,7 @@ class RemoveGeneratedRig(Operator):
 
     def execute(self, context):
         # RIG-로 시작하는 Armature를 제거한다.
-        armatures: list[Armature] = [obj for obj in bpy.data.objects if obj.type == "ARMATURE"]
-        for armature in armatures:
+        for armature in get_armature_objects():
             if armature.name.startswith("RIG-"):
                 self._remove_rig_armature(armature)
 
@@ -223,6 +229,7 @@ class AutoSkin(Operator):
 
 class SaveObjectVertexGroups(Operator):
     """현재 선택된 오브젝트의 VertexGroup들의 정보를 주어진 경로에 저장한다.
+    확장자가 .obw이면 바이너리 포맷으로, 그 외에는 json으로 저장한다.
     """
     bl_idname = "object.save_object_vertex_groups"
     bl_label = "Save Object Vertex Groups"
@@ -230,7 +237,7 @@ class SaveObjectVertexGroups(Operator):
 
     # 💡 filter_glob 이라는 프로퍼티를 정의해두면 window_manager.fileselect_add()에서 확장자 필터링으로 사용된다.
     filter_glob: bpy.props.StringProperty(
-        default="*.json",
+        default="*.json;*.obw",
         options={"HIDDEN"}
     )
 
@@ -240,6 +247,16 @@ class SaveObjectVertexGroups(Operator):
         description="Save filepath",
         subtype="FILE_PATH"
     )
+    half: BoolProperty(
+        name="Half Precision",
+        description="Store weights as float16 in .obw files",
+        default=False
+    )
+    include_positions: BoolProperty(
+        name="Include Positions",
+        description="Store world space vertex positions to allow loading by position",
+        default=False
+    )
 
     @classmethod
     def poll(cls, context):
@@ -259,7 +276,8 @@ class SaveObjectVertexGroups(Operator):
             return {"CANCELLED"}
 
         obj = bpy.context.active_object
-        if save_object_vertex_groups(obj=obj, path=self.filepath):
+        if save_object_vertex_groups(obj=obj, path=self.filepath, half=self.half,
+                                     include_positions=self.include_positions):
             self.report({"INFO"}, f"File saved (path: {self.filepath})")
             return {"FINISHED"}
         else:
@@ -277,7 +295,7 @@ class LoadObjectVertexGroups(Operator):
 
     # 💡 filter_glob 이라는 프로퍼티를 정의해두면 window_manager.fileselect_add()에서 확장자 필터링으로 사용된다.
     filter_glob: bpy.props.StringProperty(
-        default="*.json",
+        default="*.json;*.obw",
         options={"HIDDEN"}
     )
 
@@ -287,6 +305,36 @@ class LoadObjectVertexGroups(Operator):
         description="Load filepath",
         subtype="FILE_PATH"
     )
+    batched: BoolProperty(
+        name="Batched",
+        description="Group vertices with the same weight into a single add call. "
+                    "With continuous weights this only helps when quantizing",
+        default=True
+    )
+    # 연속적인 웨이트는 값이 거의 겹치지 않아 양자화하지 않으면 묶어도 add() 호출 수가 거의 줄지 않는다.
+    use_quantize: BoolProperty(
+        name="Quantize Weights",
+        description="Round weights before grouping to reduce add calls",
+        default=True
+    )
+    quantize_decimals: IntProperty(
+        name="Decimals",
+        description="Decimal places kept when quantizing weights",
+        default=3, min=1, max=6
+    )
+    match_by: EnumProperty(
+        name="Match By",
+        items=(
+            ("INDEX", "Index", "Match vertices by index"),
+            ("POSITION", "Position", "Match vertices by the nearest saved position (requires saved positions)"),
+        ),
+        default="INDEX"
+    )
+    neighbors: IntProperty(
+        name="Neighbors",
+        description="Number of nearest saved vertices interpolated when matching by position",
+        default=1, min=1, max=8
+    )
 
     @classmethod
     def poll(cls, context):
@@ -306,9 +354,298 @@ class LoadObjectVertexGroups(Operator):
             return {"CANCELLED"}
 
         obj = bpy.context.active_object
-        if load_object_vertex_groups(path=self.filepath, obj=obj):
-            self.report({"INFO"}, f"File loaded (path: {self.filepath}")
+        try:
+            stats = load_object_vertex_groups(path=self.filepath, obj=obj, batched=self.batched,
+                                              weight_decimals=self.quantize_decimals if self.use_quantize else None,
+                                              match_by=self.match_by, neighbors=self.neighbors)
+        except Exception as e:
+            self.report({"ERROR"}, f"Load failed (path: {self.filepath}, {e})")
+            return {"CANCELLED"}
+        if stats:
+            self.report({"INFO"}, f"File loaded (path: {self.filepath}, groups: {stats.group_count}, "
+                                  f"entries: {stats.entry_count}, add calls: {stats.add_calls}, "
+                                  f"elapsed: {stats.elapsed:.3f}s)")
             return {"FINISHED"}
         else:
             self.report({"ERROR"}, f"Load failed (path: {self.filepath})")
             return {"CANCELLED"}
+
+
+class SaveSelectedVertexGroups(Operator):
+    """선택된 MeshObject들의 VertexGroup들을 주어진 디렉토리에 오브젝트별 파일로 일괄 저장한다.
+    """
+    bl_idname = "object.save_selected_vertex_groups"
+    bl_label = "Save Selected Vertex Groups"
+    bl_options = {"REGISTER"}
+
+    # ⚠️ 이름이 directory 이어야만 context.window_manager.fileselect_add()에 의해 값이 잘 저장된다.
+    directory: StringProperty(
+        name="Directory",
+        description="Save directory",
+        subtype="DIR_PATH"
+    )
+    file_format: EnumProperty(
+        name="File Format",
+        items=(
+            ("OBW", "OBW", "Binary weight format"),
+            ("JSON", "JSON", "JSON weight format"),
+        ),
+        default="OBW"
+    )
+    half: BoolProperty(
+        name="Half Precision",
+        description="Store weights as float16 in .obw files",
+        default=False
+    )
+    compress: BoolProperty(
+        name="Compress",
+        description="Compress .obw files with zlib",
+        default=True
+    )
+    include_positions: BoolProperty(
+        name="Include Positions",
+        description="Store world space vertex positions to allow loading by position",
+        default=False
+    )
+    max_workers: IntProperty(
+        name="Threads",
+        description="Number of writer threads (0: automatic)",
+        default=0, min=0, max=64
+    )
+
+    @classmethod
+    def poll(cls, context):
+        mesh_objects = [obj for obj in get_selected_objects_by_type("MESH") if has_vertex_groups(obj)]
+        return True if is_object_mode() and len(mesh_objects) > 0 else False
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        if not self.directory:
+            self.report({"ERROR"}, f"Invalid directory (directory: {self.directory})")
+            return {"CANCELLED"}
+
+        mesh_objects = [obj for obj in get_selected_objects_by_type("MESH") if has_vertex_groups(obj)]
+        try:
+            results = save_vertex_groups_batch(mesh_objects, self.directory, binary=self.file_format == "OBW",
+                                               half=self.half, compress=self.compress,
+                                               include_positions=self.include_positions,
+                                               max_workers=self.max_workers or None)
+        except Exception as e:
+            self.report({"ERROR"}, f"Save failed ({e})")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"{len(results)} files saved (directory: {self.directory})")
+        return {"FINISHED"}
+
+
+class LoadSelectedVertexGroups(Operator):
+    """주어진 디렉토리에 오브젝트별로 저장된 VertexGroup 파일들을 선택된 MeshObject들에 일괄 로드한다.
+    기존 VertexGroup들의 정보는 덮어쓰기 된다.
+    """
+    bl_idname = "object.load_selected_vertex_groups"
+    bl_label = "Load Selected Vertex Groups"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # ⚠️ 이름이 directory 이어야만 context.window_manager.fileselect_add()에 의해 값이 잘 저장된다.
+    directory: StringProperty(
+        name="Directory",
+        description="Load directory",
+        subtype="DIR_PATH"
+    )
+    max_workers: IntProperty(
+        name="Threads",
+        description="Number of parser threads (0: automatic)",
+        default=0, min=0, max=64
+    )
+    use_quantize: BoolProperty(
+        name="Quantize Weights",
+        description="Round weights before grouping to reduce add calls",
+        default=True
+    )
+    quantize_decimals: IntProperty(
+        name="Decimals",
+        description="Decimal places kept when quantizing weights",
+        default=3, min=1, max=6
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return True if is_object_mode() and len(get_selected_objects_by_type("MESH")) > 0 else False
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        if not self.directory:
+            self.report({"ERROR"}, f"Invalid directory (directory: {self.directory})")
+            return {"CANCELLED"}
+
+        mesh_objects = get_selected_objects_by_type("MESH")
+        results = load_vertex_groups_batch(mesh_objects, self.directory,
+                                           weight_decimals=self.quantize_decimals if self.use_quantize else None,
+                                           max_workers=self.max_workers or None)
+        self.report({"INFO"}, f"{len(results)}/{len(mesh_objects)} files loaded (directory: {self.directory})")
+        return {"FINISHED"}
+
+
+class SaveVertexGroupSnapshot(Operator):
+    """현재 선택된 오브젝트의 VertexGroup들을 증분 스냅샷(체크포인트)으로 저장한다.
+    이전 스냅샷 이후로 바뀐 그룹만 새로 저장된다.
+    """
+    bl_idname = "object.save_vertex_group_snapshot"
+    bl_label = "Save Vertex Group Snapshot"
+    bl_options = {"REGISTER"}
+
+    directory: StringProperty(
+        name="Directory",
+        description="Snapshot directory (// is relative to the blend file)",
+        default="//weight_snapshots/",
+        subtype="DIR_PATH"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = bpy.context.active_object
+        return True if is_object_mode() and obj and obj.type == "MESH" and has_vertex_groups(obj) else False
+
+    def execute(self, context):
+        if self.directory.startswith("//") and not bpy.data.filepath:
+            self.report({"ERROR"}, f"Save the blend file first to use a relative directory ({self.directory})")
+            return {"CANCELLED"}
+
+        obj = bpy.context.active_object
+        stats = save_vertex_group_snapshot(obj, bpy.path.abspath(self.directory))
+        self.report({"INFO"}, f"Snapshot saved (path: {stats.manifest_path}, written: {stats.written}, "
+                              f"reused: {stats.reused})")
+        return {"FINISHED"}
+
+
+class LoadVertexGroupSnapshot(Operator):
+    """저장된 VertexGroup 스냅샷(체크포인트)으로 현재 선택된 오브젝트의 VertexGroup들을 복원한다.
+    """
+    bl_idname = "object.load_vertex_group_snapshot"
+    bl_label = "Load Vertex Group Snapshot"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # 💡 filter_glob 이라는 프로퍼티를 정의해두면 window_manager.fileselect_add()에서 확장자 필터링으로 사용된다.
+    filter_glob: bpy.props.StringProperty(
+        default="*.snapshot.json",
+        options={"HIDDEN"}
+    )
+
+    # ⚠️ 이름이 filepath 이어야만 context.window_manager.fileselect_add()에 의해 값이 잘 저장된다.
+    filepath: StringProperty(
+        name="Filepath",
+        description="Snapshot manifest filepath",
+        subtype="FILE_PATH"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = bpy.context.active_object
+        return True if is_object_mode() and obj and obj.type == "MESH" else False
+
+    def invoke(self, context, event):
+        # 기본 스냅샷 디렉토리에 이 오브젝트의 스냅샷이 있으면 가장 최근 것을 미리 선택해둔다.
+        if bpy.data.filepath:
+            snapshots = get_vertex_group_snapshots(bpy.path.abspath("//weight_snapshots/"), context.active_object)
+            if snapshots:
+                self.filepath = snapshots[-1]
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        if not self.filepath:
+            self.report({"ERROR"}, f"Invalid path (path: {self.filepath})")
+            return {"CANCELLED"}
+
+        obj = bpy.context.active_object
+        stats = load_vertex_group_snapshot(self.filepath, obj)
+        if stats:
+            self.report({"INFO"}, f"Snapshot loaded (path: {self.filepath}, groups: {stats.group_count})")
+            return {"FINISHED"}
+        else:
+            self.report({"ERROR"}, f"Load failed (path: {self.filepath})")
+            return {"CANCELLED"}
+
+
+class PrintVertexGroupStats(Operator):
+    """선택된 MeshObject들의 VertexGroup 통계(그룹별 할당 수, 웨이트 범위, 히스토그램, 정규화되지 않은 버텍스 수)를
+    콘솔에 출력한다.
+    """
+    bl_idname = "object.print_vertex_group_stats"
+    bl_label = "Print Vertex Group Stats"
+
+    verbose: BoolProperty(
+        name="Verbose",
+        description="Print every vertex weight",
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context):
+        mesh_objects = [obj for obj in get_selected_objects_by_type("MESH") if has_vertex_groups(obj)]
+        return True if is_object_mode() and len(mesh_objects) > 0 else False
+
+    def execute(self, context):
+        mesh_objects = [obj for obj in get_selected_objects_by_type("MESH") if has_vertex_groups(obj)]
+        for obj in mesh_objects:
+            print_vertex_groups(obj, verbose=self.verbose)
+        self.report({"INFO"}, f"Printed vertex group stats ({len(mesh_objects)} objects)")
+        return {"FINISHED"}
+
+
+class LimitNormalizeVertexGroups(Operator):
+    """선택된 MeshObject들의 웨이트에 버텍스당 최대 영향 그룹 수 제한, 작은 웨이트 제거, 정규화를 적용한다.
+    """
+    bl_idname = "object.limit_normalize_vertex_groups"
+    bl_label = "Limit & Normalize Vertex Groups"
+    bl_options = {"REGISTER", "UNDO"}
+
+    max_influences: IntProperty(
+        name="Max Influences",
+        description="Maximum number of groups per vertex (0: unlimited)",
+        default=4,
+        min=0,
+        max=32
+    )
+    prune_threshold: FloatProperty(
+        name="Prune Threshold",
+        description="Remove weights below this value (the largest weight of a vertex is always kept)",
+        default=0.01,
+        min=0.0,
+        max=1.0
+    )
+    normalize: BoolProperty(
+        name="Normalize",
+        description="Make the remaining weights of each vertex sum to 1",
+        default=True
+    )
+    deform_only: BoolProperty(
+        name="Deform Bones Only",
+        description="Only affect groups of deforming bones in the armature modifier",
+        default=True
+    )
+
+    @classmethod
+    def poll(cls, context):
+        mesh_objects = [obj for obj in get_selected_objects_by_type("MESH") if has_vertex_groups(obj)]
+        return True if (is_object_mode() or is_mode("PAINT_WEIGHT")) and len(mesh_objects) > 0 else False
+
+    def execute(self, context):
+        mesh_objects = [obj for obj in get_selected_objects_by_type("MESH") if has_vertex_groups(obj)]
+        changed_vertex_count: int = 0
+        for obj in mesh_objects:
+            stats = clean_vertex_group_weights(obj,
+                                               max_influences=self.max_influences,
+                                               prune_threshold=self.prune_threshold,
+                                               normalize=self.normalize,
+                                               deform_only=self.deform_only)
+            changed_vertex_count += stats.changed_vertex_count
+            obj.data.update()
+        self.report({"INFO"}, f"Weights cleaned (objects: {len(mesh_objects)}, "
+                              f"changed vertices: {changed_vertex_count})")
+        return {"FINISHED"}
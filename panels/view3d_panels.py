@@ -9,7 +9,7 @@ from ..functions.gpencil import is_current_grease_pencil_brush_name, is_grease_p
 from ..functions.ui import create_gridflow_at_layout
 from ..operators.align import AlignAxisAverageOperator, AlignAxisMinMaxOperator
 from ..operators.armature import ToggleWeightPaintMode
-from ..operators.bake import QuickBakeNormal
+from ..operators.bake import QuickBakeNormal, QuickBakeSet, BatchQuickBake
 from ..operators.gpencil import SetStrokePlacement, SetBrushAndMaterial
 from ..operators.material import (
     ClearUnusedMaterials, CopyMaterial, PasteMaterial, CreateAndAssignMaterial,
@@ -22,7 +22,10 @@ from ..operators.rigging import (
     GenerateRigFromArmature, RemoveGeneratedRig,
     AutoSkin,
     DetachRigMesh, AttachRigMesh,
-    SaveObjectVertexGroups, LoadObjectVertexGroups
+    SaveObjectVertexGroups, LoadObjectVertexGroups,
+    SaveSelectedVertexGroups, LoadSelectedVertexGroups,
+    SaveVertexGroupSnapshot, LoadVertexGroupSnapshot,
+    PrintVertexGroupStats, LimitNormalizeVertexGroups
 )
 from ..operators.scene import FixDataNames, PrintAllHierarchy
 from ..operators.obj import DeleteProperties, ExportProperties, ImportProperties
@@ -402,7 +405,7 @@ class Riggingpanel(View3DSidePanelBase, Panel):
         weight_paint_grid = create_gridflow_at_layout(self.layout, columns=2, header_text="Weight Paint")
         weight_paint_grid.operator_context = "EXEC_DEFAULT"  # Save, Load시 invoke 메서드를 호출시키지 않기 위해
         weight_paint_grid.operator(ToggleWeightPaintMode.bl_idname, text="Edit Weight Mode")
-        weight_paint_grid.label()
+        weight_paint_grid.operator(LimitNormalizeVertexGroups.bl_idname, text="Limit & Normalize")
         clean_vg = weight_paint_grid.operator("object.vertex_group_clean", text="Cleanup")
         clean_vg.group_select_mode = "ACTIVE"
         clean_vg.limit = 0.05
@@ -412,6 +415,11 @@ class Riggingpanel(View3DSidePanelBase, Panel):
         vertex_group_grid.operator_context = "INVOKE_DEFAULT"  # 개별 Operator에서는 operator_context를 사용할 수 없었음.
         vertex_group_grid.operator(SaveObjectVertexGroups.bl_idname, text="Save")
         vertex_group_grid.operator(LoadObjectVertexGroups.bl_idname, text="Load")
+        vertex_group_grid.operator(SaveSelectedVertexGroups.bl_idname, text="Save All")
+        vertex_group_grid.operator(LoadSelectedVertexGroups.bl_idname, text="Load All")
+        vertex_group_grid.operator(SaveVertexGroupSnapshot.bl_idname, text="Checkpoint")
+        vertex_group_grid.operator(LoadVertexGroupSnapshot.bl_idname, text="Restore")
+        vertex_group_grid.operator(PrintVertexGroupStats.bl_idname, text="Stats")
 
 
 class NormalPanel(View3DSidePanelBase, Panel):
@@ -429,6 +437,8 @@ class NormalPanel(View3DSidePanelBase, Panel):
         # grid_flow의 컨텍스트를 INVOKE_DEFAULT로 설정해야 한다.
         bake_grid.operator_context = "INVOKE_DEFAULT"
         bake_grid.operator(QuickBakeNormal.bl_idname, text="Bake Normal")
+        bake_grid.operator(QuickBakeSet.bl_idname, text="Bake Set")
+        bake_grid.operator(BatchQuickBake.bl_idname, text="Batch Bake")
 
 
 class UVPanel(View3DSidePanelBase, Panel):
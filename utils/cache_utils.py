@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+HASH_CHUNK_SIZE: int = 1 << 20
+_file_hashes: dict[tuple[str, int, int], str] = {}
+
+
+def hash_file(path: str) -> str:
+    """파일 내용의 SHA-256 해시를 리턴한다.
+    같은 프로세스 안에서는 (경로, 크기, 수정 시각)이 같으면 다시 읽지 않는다.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    memo_key = (path, stat.st_size, stat.st_mtime_ns)
+    if memo_key in _file_hashes:
+        return _file_hashes[memo_key]
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    result: str = digest.hexdigest()
+    _file_hashes[memo_key] = result
+    return result
+
+
+def make_cache_key(parts: dict) -> str:
+    """키 구성 요소(dict)를 정렬된 JSON으로 만들어 SHA-256 해시를 리턴한다.
+    """
+    text: str = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FileCache:
+    """콘텐츠 해시 키로 출력 파일을 보관하는 디스크 캐시.
+
+    항목은 root/<키 앞 2글자>/<키><확장자>에 저장된다. 조회에 성공하면 수정 시각을 갱신하고,
+    저장 후 전체 크기가 max_size를 넘으면 수정 시각이 오래된 항목부터 지운다(LRU).
+    """
+
+    def __init__(self, root: str, max_size: int = 10 * 1024 ** 3):
+        self.root = os.path.abspath(root)
+        self.max_size = max_size
+
+    def _get_entry_path(self, key: str, ext: str) -> str:
+        return os.path.join(self.root, key[:2], key + ext)
+
+    def get(self, key: str, dest_path: str, link: bool = False) -> bool:
+        """캐시 항목을 dest_path로 복사(link가 True이면 하드링크)한다. 항목이 없으면 False를 리턴한다.
+        """
+        entry_path = self._get_entry_path(key, os.path.splitext(dest_path)[1])
+        if not os.path.isfile(entry_path):
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        # 하드링크된 이전 출력에 덮어쓰면 캐시 항목까지 바뀌므로 먼저 지운다.
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        linked: bool = False
+        if link:
+            try:
+                os.link(entry_path, dest_path)
+                linked = True
+            except OSError:
+                pass
+        if not linked:
+            shutil.copyfile(entry_path, dest_path)
+        os.utime(entry_path)
+        return True
+
+    def get_path(self, key: str, ext: str) -> str | None:
+        """캐시 항목의 경로를 리턴하고 사용 시각을 갱신한다. 복사 없이 직접 읽을 때 사용한다. 항목이 없으면 None을 리턴한다.
+        """
+        entry_path = self._get_entry_path(key, ext)
+        if not os.path.isfile(entry_path):
+            return None
+        os.utime(entry_path)
+        return entry_path
+
+    def put(self, key: str, src_path: str) -> str:
+        """파일을 캐시에 복사해 넣고 항목 경로를 리턴한다. 다른 프로세스와 겹치지 않게 임시 파일로 쓴 뒤 교체한다.
+        """
+        entry_path = self._get_entry_path(key, os.path.splitext(src_path)[1])
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        temp_path = f"{entry_path}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(src_path, temp_path)
+        os.replace(temp_path, entry_path)
+        self.evict()
+        return entry_path
+
+    def get_entries(self) -> list[tuple[str, int, float]]:
+        """(경로, 크기, 수정 시각) 목록을 리턴한다. 쓰는 중인 임시 파일은 제외한다.
+        """
+        entries: list[tuple[str, int, float]] = []
+        if not os.path.isdir(self.root):
+            return entries
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get_size(self) -> int:
+        return sum(size for _, size, _ in self.get_entries())
+
+    def evict(self) -> int:
+        """전체 크기가 max_size 이하가 될 때까지 오래 사용하지 않은 항목부터 지운다. 지운 항목 수를 리턴한다.
+        """
+        entries = sorted(self.get_entries(), key=lambda entry: entry[2])
+        total: int = sum(size for _, size, _ in entries)
+        count: int = 0
+        for path, size, _ in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            count += 1
+        return count
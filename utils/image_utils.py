@@ -0,0 +1,92 @@
+import struct
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE: bytes = b"\x89PNG\r\n\x1a\n"
+PNG_COLOR_TYPES: dict[int, int] = {1: 0, 2: 4, 3: 2, 4: 6}  # 채널 수 => PNG 컬러 타입 (Gray, GrayAlpha, RGB, RGBA)
+
+
+def float_to_uint(pixels: np.ndarray, bit_depth: int = 8) -> np.ndarray:
+    """0~1 범위의 float 픽셀을 8/16비트 정수로 변환한다. 범위를 벗어나는 값은 잘라낸다.
+    """
+    max_value: int = (1 << bit_depth) - 1
+    dtype = np.uint8 if bit_depth == 8 else np.uint16
+    return (np.clip(pixels, 0.0, 1.0) * max_value + 0.5).astype(dtype)
+
+
+class PngWriter:
+    """PNG 파일을 위에서 아래로 몇 줄씩 나눠 쓴다.
+    압축은 zlib 스트림으로 이어서 하므로 전체 이미지를 메모리에 올리지 않아도 된다.
+    zlib은 압축하는 동안 GIL을 놓기 때문에 백그라운드 스레드에서 사용해도 다른 작업을 막지 않는다.
+    """
+
+    def __init__(self, filepath: str, width: int, height: int, channels: int = 4, bit_depth: int = 8,
+                 compress_level: int = 6):
+        if channels not in PNG_COLOR_TYPES:
+            raise Exception(f"Invalid channel count ({channels})")
+        if bit_depth not in (8, 16):
+            raise Exception(f"Invalid bit depth ({bit_depth})")
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.bit_depth = bit_depth
+        self.rows_written: int = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._file = open(filepath, "wb")
+        self._file.write(PNG_SIGNATURE)
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bit_depth, PNG_COLOR_TYPES[channels], 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
+
+    def write_rows(self, rows: np.ndarray):
+        """(줄 수, width, channels) 모양의 uint8/uint16 배열을 위쪽 줄부터 순서대로 쓴다.
+        """
+        rows = rows.reshape(-1, self.width * self.channels)
+        if self.rows_written + len(rows) > self.height:
+            raise Exception(f"Too many rows ({self.rows_written + len(rows)} > {self.height})")
+        # PNG는 16비트 값을 빅 엔디언으로 저장한다.
+        rows = rows.astype(">u2" if self.bit_depth == 16 else np.uint8, copy=False)
+        # 각 줄 앞에 필터 타입 0(None) 바이트를 붙인다.
+        scanlines = np.zeros((len(rows), 1 + rows.shape[1] * rows.itemsize), dtype=np.uint8)
+        scanlines[:, 1:] = rows.view(np.uint8).reshape(len(rows), -1)
+        data: bytes = self._compressor.compress(scanlines.tobytes())
+        if data:
+            self._write_chunk(b"IDAT", data)
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.rows_written != self.height:
+            self._file.close()
+            raise Exception(f"Missing rows ({self.rows_written} < {self.height})")
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self._file.close()
+
+
+def write_png(filepath: str, pixels: np.ndarray, bit_depth: int = 8, compress_level: int = 6):
+    """(height, width, channels) 모양의 픽셀 배열을 PNG로 쓴다.
+    float 배열은 0~1 범위로 보고 bit_depth에 맞게 변환한다. 첫 번째 줄이 이미지의 위쪽이다.
+    """
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    if pixels.dtype.kind == "f":
+        pixels = float_to_uint(pixels, bit_depth)
+    height, width, channels = pixels.shape
+    with PngWriter(filepath, width, height, channels, bit_depth, compress_level) as writer:
+        writer.write_rows(pixels)
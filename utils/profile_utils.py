@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+def get_rss() -> int | None:
+    """현재 프로세스의 지금 상주 메모리(바이트)를 리턴한다. 알 수 없으면 None을 리턴한다.
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+def get_peak_rss() -> int | None:
+    """프로세스가 시작된 뒤의 최대 상주 메모리(바이트)를 리턴한다. 알 수 없으면 None을 리턴한다.
+    줄어들지 않는 값이므로 단계별 메모리는 get_rss()로 재고, 이 값은 프로세스 전체의 최대치로만 사용한다.
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위이다.
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        memory_info = psutil.Process().memory_info()
+        return getattr(memory_info, "peak_wset", memory_info.rss)
+    except ImportError:
+        return None
+
+
+def get_mesh_counts(objects) -> dict[str, int]:
+    """MeshObject들의 버텍스/면 수 합계를 리턴한다.
+    """
+    meshes = [obj.data for obj in objects if obj.type == "MESH"]
+    return {
+        "vertices": sum(len(mesh.vertices) for mesh in meshes),
+        "faces": sum(len(mesh.polygons) for mesh in meshes),
+    }
+
+
+class StageProfiler:
+    """단계별 실행 시간(wall, CPU), 메모리, 출력 버텍스/면 수를 기록한다.
+    메모리는 단계가 끝날 때의 상주 메모리(rss)와 단계 동안의 변화량(rss_delta), 그리고 그 시점까지의
+    프로세스 최대 상주 메모리(process_peak_rss)와 이 단계에서 늘어난 양(process_peak_rss_delta)이다.
+
+    with profiler.stage("Export", label=path) as record: 형태로 사용하고,
+    단계 안에서 record["vertices"] 처럼 값을 넣으면 함께 기록된다.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None):
+        self.logger = logger
+        self.records: list[dict] = []
+
+    @contextmanager
+    def stage(self, name: str, label: str | None = None):
+        record: dict = {"stage": name, "label": label}
+        start_wall: float = time.perf_counter()
+        start_cpu: float = time.process_time()
+        start_rss = get_rss()
+        start_peak_rss = get_peak_rss()
+        try:
+            yield record
+        finally:
+            record["wall"] = time.perf_counter() - start_wall
+            record["cpu"] = time.process_time() - start_cpu
+            rss = get_rss()
+            record["rss"] = rss
+            record["rss_delta"] = rss - start_rss if rss is not None and start_rss is not None else None
+            peak_rss = get_peak_rss()
+            record["process_peak_rss"] = peak_rss
+            record["process_peak_rss_delta"] = peak_rss - start_peak_rss if peak_rss is not None and start_peak_rss is not None else None
+            self.records.append(record)
+
+    def format_table(self) -> list[str]:
+        """단계별 기록을 표 형태의 문자열 줄들로 만든다.
+        """
+        lines: list[str] = [f"{'Stage':<28} {'Wall(s)':>9} {'CPU(s)':>9} {'RSS(MB)':>9} {'+RSS(MB)':>9} {'+ProcPeak(MB)':>13} {'Verts':>10} {'Faces':>10}  Label"]
+        for record in self.records:
+            lines.append(
+                f"{record['stage']:<28} {record['wall']:>9.3f} {record['cpu']:>9.3f} "
+                f"{_format_megabytes(record['rss']):>9} {_format_megabytes(record['rss_delta']):>9} "
+                f"{_format_megabytes(record['process_peak_rss_delta']):>13} "
+                f"{_format_count(record.get('vertices')):>10} {_format_count(record.get('faces')):>10}  {record['label'] or ''}"
+            )
+        total_wall: float = sum(record["wall"] for record in self.records)
+        total_cpu: float = sum(record["cpu"] for record in self.records)
+        lines.append(f"{'Total':<28} {total_wall:>9.3f} {total_cpu:>9.3f}")
+        if self.records and self.records[-1]["process_peak_rss"] is not None:
+            lines.append(f"Process Peak RSS: {_format_megabytes(self.records[-1]['process_peak_rss'])}MB")
+        return lines
+
+    def log_summary(self):
+        if self.logger is None:
+            return
+        self.logger.info("Profile Summary:")
+        for line in self.format_table():
+            self.logger.info(f"\t{line}")
+
+    def write_json_lines(self, path: str):
+        """단계마다 JSON 한 줄씩 파일에 추가한다.
+        """
+        with open(path, "a", encoding="utf-8") as file:
+            for record in self.records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _format_megabytes(value: int | None) -> str:
+    return "-" if value is None else f"{value / (1024 ** 2):.1f}"
+
+
+def _format_count(value: int | None) -> str:
+    return "-" if value is None else str(value)
@@ -52,6 +52,8 @@ def baketype_to_symbol(baketype: str) -> str:
     symbols = {
         "Normal": "N",
         "AmbientOcclusion": "AO",
+        "Ao": "AO",
+        "Position": "P",
         "ZDepth": "Z"
     }
     return symbols.get(baketype, baketype)
@@ -60,4 +62,5 @@ def baketype_to_symbol(baketype: str) -> str:
 assert (baketype_to_symbol("Normal") == "N")
 assert (baketype_to_symbol("AmbientOcclusion") == "AO")
 assert (baketype_to_symbol("ZDepth") == "Z")
+assert (baketype_to_symbol("Ao") == "AO")
 assert (baketype_to_symbol("BaseColor") == "BaseColor")  # 특별히 지정된 경우를 제외하고는 입력 그대로 리턴